@@ -0,0 +1,80 @@
+"""Filter + rank benchmark for the catalog mirror.
+
+    python benchmarks/catalog_index_bench.py [--rows 1000000] [--runs 50]
+
+Builds a synthetic catalog, then times CatalogIndex (numpy masks + argpartition)
+against the plain Python filter CatalogService falls back to without numpy.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.catalog_index import CatalogIndex
+from services.catalog_service import CatalogService, CATALOG_COLUMNS
+from config.constants import LANGUAGE_MAP
+
+def synthetic_rows(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    languages = list(LANGUAGE_MAP.values())
+    genres = [28, 12, 16, 35, 80, 99, 18, 10751, 14, 36, 27, 10402, 9648, 10749, 878, 53, 10752, 37]
+    start = date(1990, 1, 1).toordinal()
+    days = date(2026, 12, 31).toordinal() - start
+    dates = [date.fromordinal(start + offset).isoformat() for offset in range(days)]
+
+    rows = []
+    for content_id in range(1, count + 1):
+        record = {
+            "id": content_id,
+            "title": f"Title {content_id}",
+            "poster_path": None,
+            "vote_average": round(rng.uniform(1, 10), 1),
+            "vote_count": rng.randint(0, 5000),
+            "popularity": round(rng.expovariate(0.05), 3),
+            "original_language": rng.choice(languages),
+            "genre_ids": rng.sample(genres, rng.randint(1, 3)),
+            "release_date": rng.choice(dates),
+            "last_air_date": "",
+            "overview": "",
+            "ott": rng.random() < 0.3
+        }
+        rows.append([record[column] for column in CATALOG_COLUMNS])
+    return rows
+
+def time_runs(label: str, runs: int, fn):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"{label:<10} median {timings[len(timings) // 2]:8.2f} ms   p95 {timings[int(len(timings) * 0.95)]:8.2f} ms   ({len(result)} results)")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--top", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows} synthetic titles...")
+    rows = synthetic_rows(args.rows)
+
+    started = time.perf_counter()
+    index = CatalogIndex(rows, 'movie', CATALOG_COLUMNS)
+    print(f"Index built in {time.perf_counter() - started:.2f}s")
+
+    today = date(2026, 10, 1)
+    query = ('hi', 28, (today - timedelta(days=365)).isoformat(), today.isoformat(), 50, True)
+
+    indexed = time_runs("numpy", args.runs, lambda: index.query(*query, limit=args.top))
+    python = time_runs("python", max(1, args.runs // 10),
+                       lambda: CatalogService._query_rows(rows, 'movie', *query)[:args.top])
+
+    same = [row[0] for row in indexed] == [row[0] for row in python]
+    print(f"Results identical: {same}")
@@ -0,0 +1,98 @@
+"""Response encoding benchmark: FastAPI's default path vs FastJSONResponse.
+
+    python benchmarks/json_response_bench.py [--runs 2000]
+
+The default path is what a route returning a dict goes through:
+jsonable_encoder over the payload, then JSONResponse (stdlib json).
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from models.content_record import ContentRecord
+from utils.responses import FastJSONResponse, orjson
+
+def discover_payload(items: int = 25) -> dict:
+    content = []
+    for index in range(items):
+        record = ContentRecord.from_tmdb({
+            "id": 1000 + index,
+            "title": f"Movie {index}",
+            "poster_path": f"/poster{index}.jpg",
+            "vote_average": 7.2,
+            "release_date": "2026-03-14",
+            "overview": "A long enough overview to look like a real TMDB synopsis. " * 4,
+            "genre_ids": [28, 12, 53],
+            "original_language": "hi",
+            "popularity": 123.4,
+            "vote_count": 845
+        }, 'movie', ott_prefiltered=True)
+        record["streaming"] = {
+            "available_on": [
+                {"name": "Netflix", "logo": "/netflix.jpg", "color": "#E50914"},
+                {"name": "Prime Video", "logo": "/prime.jpg", "color": "#00A8E1"}
+            ],
+            "rent": [],
+            "buy": []
+        }
+        content.append(record)
+
+    return {
+        "content": content,
+        "total": items,
+        "detected": {"genre": "action", "language": "hindi", "content_type": "movie", "release_period": "6months"},
+        "debug": {"language_code": "hi", "movie_genre_id": 28, "tv_genre_id": 10759,
+                  "date_range": ["2026-04-01", "2026-10-01"], "explicit_params": True,
+                  "content_breakdown": {"movies": items, "tv_shows": 0}}
+    }
+
+def profile_payload(interactions: int = 200) -> dict:
+    now = datetime(2026, 10, 1)
+    history = [{
+        "user_id": "user-1",
+        "content_id": 5000 + index,
+        "content_type": "movie" if index % 3 else "tv",
+        "title": f"Title {index}",
+        "action": ("liked", "watchlisted", "watched")[index % 3],
+        "rating": 8.0,
+        "genres": ["action", "thriller"],
+        "language": "hindi",
+        "actors": ["Actor A", "Actor B"],
+        "directors": ["Director C"],
+        "timestamp": (now - timedelta(hours=index)).isoformat()
+    } for index in range(interactions)]
+
+    return {
+        "profile": {"user_id": "user-1", "preferred_genres": ["action", "thriller"],
+                    "preferred_languages": ["hindi"], "total_liked": interactions // 3},
+        "stats": {"total_interactions": interactions, "genre_distribution": {"action": 60, "thriller": 60}},
+        "recent_activity": history[-10:],
+        "liked_content": history
+    }
+
+def bench(label: str, runs: int, fn) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    per_call = (time.perf_counter() - started) / runs * 1e6
+    print(f"  {label:<22} {per_call:9.1f} µs")
+    return per_call
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+    for name, payload in (("discover, 25 items", discover_payload()), ("profile, 200 interactions", profile_payload())):
+        print(name)
+        default = bench("jsonable_encoder+json", args.runs, lambda: JSONResponse(jsonable_encoder(payload)).body)
+        fast = bench("FastJSONResponse", args.runs, lambda: FastJSONResponse(payload).body)
+        print(f"  speedup {default / fast:.1f}x")
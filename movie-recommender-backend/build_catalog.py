@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+
+from services.http_client import HTTPClientManager
+from services.catalog_ingest import CatalogIngestor
+
+async def main(args):
+    await HTTPClientManager.startup()
+    try:
+        export_files = {}
+        if args.export_movie:
+            export_files['movie'] = args.export_movie
+        if args.export_tv:
+            export_files['tv'] = args.export_tv
+
+        build_kwargs = {
+            "languages": args.languages.split(",") if args.languages else None,
+            "sweep_pages": args.pages,
+            "export_limit": args.export_limit
+        }
+        if export_files or args.no_download:
+            build_kwargs["export_files"] = export_files
+
+        await CatalogIngestor.rebuild(download_exports=not args.no_download, **build_kwargs)
+    finally:
+        await HTTPClientManager.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local TMDB catalog mirror")
+    parser.add_argument("--export-movie", help="Local movie_ids export file (skips the download)")
+    parser.add_argument("--export-tv", help="Local tv_series_ids export file (skips the download)")
+    parser.add_argument("--languages", help="Comma-separated language codes (default: all of LANGUAGE_MAP)")
+    parser.add_argument("--pages", type=int, help="Discover pages to sweep per language (0 to skip)")
+    parser.add_argument("--export-limit", type=int, help="Most popular export ids to look up")
+    parser.add_argument("--no-download", action="store_true", help="Do not download the daily exports")
+
+    print("📚 Building catalog mirror...")
+    asyncio.run(main(parser.parse_args()))
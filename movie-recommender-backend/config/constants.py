@@ -90,6 +90,21 @@ def get_genre_id(genre: str, content_type: str) -> int:
     else:  # movie or both
         return MOVIE_GENRE_MAP.get(genre_lower, 28)
 
+def get_genre_ids(genres, content_type: str) -> list:
+    """Genre IDs for one genre name or a list of them, deduplicated in order"""
+    if isinstance(genres, str):
+        genres = [genres]
+    genre_ids = []
+    for genre in genres:
+        genre_id = get_genre_id(genre, content_type)
+        if genre_id not in genre_ids:
+            genre_ids.append(genre_id)
+    return genre_ids
+
+def join_genre_ids(genre_ids: list) -> str:
+    """TMDB with_genres value matching ANY of the ids (pipe = OR)"""
+    return "|".join(str(genre_id) for genre_id in genre_ids)
+
 LANGUAGE_MAP = {
     'hindi': 'hi', 'english': 'en', 'tamil': 'ta', 'telugu': 'te',
     'malayalam': 'ml', 'kannada': 'kn', 'bengali': 'bn', 'marathi': 'mr',
@@ -115,12 +130,32 @@ INDIAN_OTT_PLATFORMS = {
     3: {"name": "Google Play", "logo": "google.png", "color": "#4285F4"},
 }
 
+# OTT-filtered discover: let TMDB restrict candidates to our platforms via
+# watch_region/with_watch_providers, so per-item provider lookups are only
+# needed for logos and names (served from cache, fetched on a miss). With
+# LAZY_PROVIDER_DETAILS (opt-in) misses are fetched in the background instead,
+# and cold responses carry no platform badges
+OTT_DISCOVER_CONFIG = {
+    'ENABLED': os.getenv('OTT_DISCOVER_ENABLED', 'True').lower() == 'true',
+    'WATCH_REGION': 'IN',
+    'MONETIZATION_TYPES': 'flatrate|rent',
+    'WITH_WATCH_PROVIDERS': '|'.join(str(provider_id) for provider_id in INDIAN_OTT_PLATFORMS),
+    'LAZY_PROVIDER_DETAILS': os.getenv('OTT_LAZY_PROVIDER_DETAILS', 'False').lower() == 'true'
+}
+
 # API Limits and Timeouts
 API_CONFIG = {
     'TIMEOUT': 30.0,
     'MAX_RESULTS_PER_TYPE': 20,
     'MAX_STREAMING_PLATFORMS': 4,
     'MAX_SEARCH_RESULTS': 15,
+    'TV_DETAILS_CONCURRENCY': int(os.getenv('TV_DETAILS_CONCURRENCY', 8)),
+    'MAX_DISCOVER_PAGES': int(os.getenv('MAX_DISCOVER_PAGES', 5)),
+    'PROVIDER_CONCURRENCY': int(os.getenv('TMDB_PROVIDER_CONCURRENCY', 10)),  # upstream /watch/providers fetches per batch
+    'SEARCH_BATCH_CONCURRENCY': int(os.getenv('SEARCH_BATCH_CONCURRENCY', 8)),  # TMDB searches in flight per /search/batch
+    'MAX_BATCH_QUERIES': int(os.getenv('MAX_BATCH_QUERIES', 50)),
+    # Sub-requests folded into /movie|tv/{id} via append_to_response (e.g. add 'credits')
+    'DETAILS_APPEND': [part for part in os.getenv('TMDB_DETAILS_APPEND', 'watch/providers').split(',') if part],
     'MIN_VOTE_COUNT': {
         'POPULAR': 10,
         'RECENT': 5,
@@ -128,6 +163,129 @@ API_CONFIG = {
     }
 }
 
+# Shared HTTP client pools (one application-scoped client per upstream)
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP_CLIENT_CONFIG = {
+    'tmdb': {
+        'TIMEOUT': API_CONFIG['TIMEOUT'],
+        'MAX_CONNECTIONS': int(os.getenv('TMDB_MAX_CONNECTIONS', 50)),
+        'MAX_KEEPALIVE_CONNECTIONS': int(os.getenv('TMDB_MAX_KEEPALIVE', 20)),
+        'KEEPALIVE_EXPIRY': float(os.getenv('TMDB_KEEPALIVE_EXPIRY', 30.0)),
+        'HTTP2': os.getenv('TMDB_HTTP2', 'False').lower() == 'true'
+    },
+    'ollama': {
+        'TIMEOUT': 30.0,
+        'MAX_CONNECTIONS': int(os.getenv('OLLAMA_MAX_CONNECTIONS', 10)),
+        'MAX_KEEPALIVE_CONNECTIONS': int(os.getenv('OLLAMA_MAX_KEEPALIVE', 5)),
+        'KEEPALIVE_EXPIRY': float(os.getenv('OLLAMA_KEEPALIVE_EXPIRY', 60.0)),
+        'HTTP2': False
+    }
+}
+
+# TMDB Response Cache (in-process TTL/LRU)
+# TTLs are in seconds and matched by the longest endpoint fragment
+CACHE_CONFIG = {
+    'ENABLED': os.getenv('TMDB_CACHE_ENABLED', 'True').lower() == 'true',
+    'MAX_ENTRIES': int(os.getenv('TMDB_CACHE_MAX_ENTRIES', 5000)),
+    'DEFAULT_TTL': 1800,
+    'TTL': {
+        '/discover/': 1800,
+        '/search/': 3600,
+        '/tv/on_the_air': 1800,
+        '/tv/airing_today': 1800,
+        '/tv/': 21600,
+        '/movie/': 21600,
+        '/watch/providers': int(os.getenv('TMDB_PROVIDER_CACHE_TTL', 172800)),
+    },
+    # Empty answers ("no providers anywhere yet") expire sooner than real ones
+    'NEGATIVE_TTL': {
+        '/watch/providers': int(os.getenv('TMDB_PROVIDER_NEGATIVE_TTL', 21600)),
+    },
+    'STALE_WHILE_REVALIDATE': 600,   # serve stale + refresh in background
+    'STALE_IF_ERROR': 86400          # serve stale when TMDB errors or times out
+}
+
+# Persistent TMDB cache tier (SQLite file in the user data directory)
+PERSISTENT_CACHE_CONFIG = {
+    'ENABLED': os.getenv('TMDB_PERSISTENT_CACHE_ENABLED', 'True').lower() == 'true',
+    'FILENAME': 'tmdb_cache.sqlite3',
+    'MAX_ENTRIES': int(os.getenv('TMDB_PERSISTENT_CACHE_MAX_ENTRIES', 20000)),
+    'SNAPSHOT_SIZE': 1000,  # hot in-memory entries flushed on shutdown / reloaded at startup
+    'FLUSH_INTERVAL': float(os.getenv('TMDB_PERSISTENT_CACHE_FLUSH_INTERVAL', 1.0))  # seconds between batched writes
+}
+
+# TMDB Rate Limiting (process-wide token bucket + AIMD concurrency)
+RATE_LIMIT_CONFIG = {
+    'RATE': float(os.getenv('TMDB_RATE_LIMIT', 40)),   # requests per second
+    'BURST': int(os.getenv('TMDB_RATE_BURST', 40)),
+    'MIN_CONCURRENCY': 4,
+    'MAX_CONCURRENCY': int(os.getenv('TMDB_MAX_CONCURRENCY', 40)),
+    'INITIAL_CONCURRENCY': 20,
+    'INCREASE_STEP': 1.0,       # additive increase per window of successes
+    'DECREASE_FACTOR': 0.5,     # multiplicative decrease on 429/timeouts
+    'MAX_RETRIES': 3,
+    'BACKOFF_BASE': 0.25,       # seconds, doubled per attempt and jittered
+    'BACKOFF_MAX': 4.0,
+    'REQUEST_DEADLINE': 10.0,   # per-request budget including retries
+    'MIN_ATTEMPT_TIME': 0.5     # no retry is started with less of the deadline left
+}
+
+# Local catalog mirror (built by build_catalog.py / background refresh)
+CATALOG_CONFIG = {
+    'ENABLED': os.getenv('CATALOG_MIRROR_ENABLED', 'True').lower() == 'true',
+    'PATH': os.getenv('CATALOG_MIRROR_PATH'),       # defaults to <data dir>/FILENAME
+    'FILENAME': 'catalog_mirror.json.gz',
+    'MAX_AGE_HOURS': float(os.getenv('CATALOG_MAX_AGE_HOURS', 36)),
+    'EXPORT_BASE_URL': 'http://files.tmdb.org/p/exports',
+    'SWEEP_PAGES': int(os.getenv('CATALOG_SWEEP_PAGES', 10)),   # discover pages per language and type
+    'EXPORT_DETAIL_LIMIT': int(os.getenv('CATALOG_EXPORT_DETAIL_LIMIT', 500)),  # most popular export ids to look up
+    'CONCURRENCY': 8,
+    'BACKGROUND_REFRESH': os.getenv('CATALOG_BACKGROUND_REFRESH', 'False').lower() == 'true',
+    'REFRESH_CHECK_INTERVAL': 3600
+}
+
+# Server-side result sets behind cursor pagination of /discover and /search
+RESULT_SET_CONFIG = {
+    'TTL': int(os.getenv('RESULT_SET_TTL', 600)),              # seconds a cursor stays valid after last use
+    'MAX_SETS': int(os.getenv('RESULT_SET_MAX_SETS', 500)),
+    'MAX_ITEMS': int(os.getenv('RESULT_SET_MAX_ITEMS', 20000)),  # items held across all sets (LRU eviction)
+    'PREFETCH': os.getenv('RESULT_SET_PREFETCH', 'True').lower() == 'true'
+}
+
+# Background re-runs of the most requested discover queries, shortly before their cache entries expire
+PREWARM_CONFIG = {
+    'ENABLED': os.getenv('PREWARM_ENABLED', 'True').lower() == 'true',
+    'INTERVAL': int(os.getenv('PREWARM_INTERVAL', 60)),              # seconds between cycles (keep below REFRESH_AHEAD)
+    'REFRESH_AHEAD': int(os.getenv('PREWARM_REFRESH_AHEAD', 300)),   # refresh entries expiring within this many seconds
+    'TOP_N': int(os.getenv('PREWARM_TOP_N', 10)),                    # hottest keys re-run per cycle
+    'UPSTREAM_BUDGET': int(os.getenv('PREWARM_UPSTREAM_BUDGET', 200)),  # TMDB requests per cycle
+    'HALF_LIFE': int(os.getenv('PREWARM_HALF_LIFE', 1800)),          # seconds for a key's request count to halve
+    'MIN_SCORE': 2.0,       # decayed request count a key needs to be prewarmed
+    'MAX_KEYS': 500,        # tracked keys; the coldest are dropped beyond this
+    # Always kept warm: (language code, content type, genre, release period) - the new-user fallback
+    'SEED_KEYS': [('hi', 'both', 'drama', '6months')]
+}
+
+# Typeahead title index behind /search/suggest
+SUGGEST_CONFIG = {
+    'ENABLED': os.getenv('SUGGEST_ENABLED', 'True').lower() == 'true',
+    'SEED_PATH': os.getenv('SUGGEST_SEED_PATH'),   # optional JSON lines file of titles to index at startup
+    'MAX_TITLES': int(os.getenv('SUGGEST_MAX_TITLES', 200000)),
+    'SCAN_LIMIT': 1000,     # index keys examined per lookup (bounds latency for 1-2 letter prefixes)
+    'DEFAULT_LIMIT': 8,
+    'MAX_LIMIT': 20
+}
+
+# Local fuzzy resolution of AI-suggested titles (trigram index over known titles)
+RESOLVER_CONFIG = {
+    'ENABLED': os.getenv('TITLE_RESOLVER_ENABLED', 'True').lower() == 'true',
+    'THRESHOLD': float(os.getenv('TITLE_RESOLVER_THRESHOLD', 0.6)),   # minimum trigram Jaccard similarity
+    'CANDIDATES': 20,        # best trigram-overlap candidates scored exactly
+    'MAX_POSTING': 20000,    # trigrams shared by more names than this are skipped when counting
+    'CATCH_UP_CHUNK': 500,   # names indexed per step (about 15 ms); bulk loads are indexed in the background
+    'CATCH_UP_INTERVAL': 1.0  # seconds between checks for new names when idle
+}
+
 # Date Range Configuration
 def get_date_range(release_period: str):
     """Calculate date range based on release period"""
@@ -160,8 +318,12 @@ MESSAGES = {
     'API_RUNNING': 'Movie Recommender API - Complete with Global Search',
     'HEALTH_OK': 'Complete OTT API with global search is working correctly',
     'SEARCH_TOO_SHORT': 'Query too short. Please enter at least 2 characters.',
+    'BATCH_TOO_LARGE': 'Too many queries in one batch.',
+    'CLIENT_DISCONNECTED': 'Client closed the request.',
+    'QUERY_SUPERSEDED': 'Superseded by a newer request from the same session.',
     'NO_CONTENT_FOUND': 'No OTT content found. Try different filters.',
-    'SEARCH_NO_RESULTS': 'No OTT content found for search. Try a different search term.'
+    'SEARCH_NO_RESULTS': 'No OTT content found for search. Try a different search term.',
+    'CURSOR_EXPIRED': 'These results have expired. Please run the request again without a cursor.'
 }
 
 # Content Processing Keywords
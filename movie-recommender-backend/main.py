@@ -1,11 +1,41 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from config.constants import SERVER_CONFIG, CORS_ORIGINS, MESSAGES
+from services.http_client import HTTPClientManager
+from services.tmdb_service import TMDBService
+from services.catalog_ingest import CatalogIngestor
+from services.result_set_service import ResultSetService
+from services.prewarm_service import PrewarmService
+from services.suggest_service import SuggestService
+from services.title_resolver import TitleResolver
+from services.cancellation_service import CancellationService
+from utils.responses import FastJSONResponse
+
+# --- Lifespan: shared upstream resources ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await HTTPClientManager.startup()
+    await TMDBService.startup_cache()
+    SuggestService.load_seed()
+    TitleResolver.start()
+    CatalogIngestor.start_background_refresh()
+    PrewarmService.start()
+    yield
+    await PrewarmService.stop()
+    await CatalogIngestor.stop_background_refresh()
+    await TitleResolver.stop()
+    await TMDBService.shutdown_cache()
+    await HTTPClientManager.shutdown()
 
 # --- FastAPI App ---
-app = FastAPI(title=SERVER_CONFIG.get('title', 'Movie Recommender API'))
+app = FastAPI(
+    title=SERVER_CONFIG.get('title', 'Movie Recommender API'),
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
 
 # --- CORS Configuration ---
 app.add_middleware(
@@ -45,6 +75,20 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": MESSAGES['HEALTH_OK']}
 
+@app.get("/stats")
+async def upstream_stats():
+    """Counters for tuning the upstream caching layers"""
+    return {
+        "tmdb_cache": TMDBService.cache.stats(),
+        "tmdb_singleflight": TMDBService.inflight.stats(),
+        "tmdb_rate_limiter": TMDBService.rate_limiter.stats(),
+        "result_sets": ResultSetService.stats(),
+        "prewarm": PrewarmService.stats(),
+        "suggest_index": SuggestService.stats(),
+        "title_resolver": TitleResolver.stats(),
+        "cancellation": CancellationService.stats()
+    }
+
 if __name__ == "__main__":
     uvicorn.run(
         app, 
@@ -0,0 +1,143 @@
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+from config.constants import IMAGE_CONFIG
+
+class ContentRecord:
+    """One movie/TV item as it flows through discover, search and recommendations.
+
+    A slotted object instead of a per-item dict: the low-cardinality strings
+    (content_type, language, year) are interned and the poster URL is only
+    built when it is read. It also behaves like a read/write mapping
+    (`item['title']`, `item.get(...)`, `dict(item)`), so existing callers and
+    FastAPI's encoder work unchanged; keys that are not fields (e.g. the
+    recommendation engine's scores) go into a small extras dict.
+    """
+    __slots__ = (
+        "id", "title", "poster_path", "rating", "year", "overview", "content_type",
+        "release_date", "last_air_date", "genre_ids", "original_language",
+        "popularity", "vote_count", "ott_prefiltered", "streaming", "_extras"
+    )
+
+    # Serialized key order; last_air_date and streaming are only emitted when set
+    FIELDS = (
+        "id", "title", "poster", "rating", "year", "overview", "content_type",
+        "release_date", "last_air_date", "genre_ids", "original_language",
+        "popularity", "vote_count", "streaming"
+    )
+    OPTIONAL_FIELDS = frozenset(("last_air_date", "streaming"))
+    # Readable and writable like fields, but never serialized
+    INTERNAL_FIELDS = frozenset(("ott_prefiltered",))
+
+    def __init__(self, id: int, title: str, content_type: str, poster_path: Optional[str] = None,
+                 rating: float = 0, release_date: str = '', overview: str = '',
+                 last_air_date: Optional[str] = None, genre_ids: Optional[List[int]] = None,
+                 original_language: str = 'en', popularity: float = 0, vote_count: int = 0,
+                 ott_prefiltered: bool = False, streaming: Optional[Dict] = None):
+        self.id = id
+        self.title = title
+        self.poster_path = poster_path
+        self.rating = rating
+        self.release_date = release_date or ''
+        self.year = sys.intern(self.release_date[:4])
+        self.overview = overview or ''
+        self.content_type = sys.intern(content_type)
+        self.last_air_date = last_air_date
+        self.genre_ids = genre_ids if genre_ids is not None else []
+        self.original_language = sys.intern(original_language or 'en')
+        self.popularity = popularity
+        self.vote_count = vote_count
+        self.ott_prefiltered = ott_prefiltered
+        self.streaming = streaming
+        self._extras = None
+
+    @classmethod
+    def from_tmdb(cls, result: Dict, content_type: str, ott_prefiltered: bool = False,
+                  last_air_date: Optional[str] = None) -> "ContentRecord":
+        """Build a record from a TMDB discover/search/details result"""
+        if content_type == 'movie':
+            title = result.get('title') or result.get('name', 'Unknown')
+            release_date = result.get('release_date', '')
+        else:
+            title = result.get('name') or result.get('title', 'Unknown')
+            release_date = result.get('first_air_date', '')
+
+        return cls(
+            id=result['id'],
+            title=title,
+            content_type=content_type,
+            poster_path=result.get('poster_path'),
+            rating=result.get('vote_average', 0),
+            release_date=release_date,
+            overview=result.get('overview', ''),
+            last_air_date=last_air_date,
+            genre_ids=result.get('genre_ids', []),
+            original_language=result.get('original_language', 'en'),
+            popularity=result.get('popularity', 0),
+            vote_count=result.get('vote_count', 0),
+            ott_prefiltered=ott_prefiltered
+        )
+
+    @property
+    def poster(self) -> Optional[str]:
+        return f"{IMAGE_CONFIG['TMDB_BASE_URL']}{self.poster_path}" if self.poster_path else None
+
+    # --- Mapping protocol ---
+    def keys(self) -> List[str]:
+        keys = [
+            name for name in self.FIELDS
+            if name not in self.OPTIONAL_FIELDS or getattr(self, name) is not None
+        ]
+        if self._extras:
+            keys.extend(self._extras)
+        return keys
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.INTERNAL_FIELDS:
+            return getattr(self, key)
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is None and key in self.OPTIONAL_FIELDS:
+                raise KeyError(key)
+            return value
+        if self._extras and key in self._extras:
+            return self._extras[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key == "poster":
+            # Derived from poster_path, so a write goes there instead of shadowing it in extras
+            base_url = IMAGE_CONFIG['TMDB_BASE_URL']
+            if value and not value.startswith(base_url):
+                raise ValueError(f"poster must be a {base_url} URL, got {value!r}")
+            self.poster_path = value[len(base_url):] if value else None
+        elif key in self.FIELDS or key in self.INTERNAL_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"ContentRecord({self.content_type} {self.id} {self.title!r})"
@@ -7,10 +7,20 @@ class DiscoverRequest(BaseModel):
     language: Optional[str] = None
     content_type: Optional[str] = None
     release_period: Optional[str] = None
+    genres: Optional[List[str]] = None  # several genres/languages at once, merged into one ranked list
+    languages: Optional[List[str]] = None
+    cursor: Optional[str] = None  # next_cursor from a previous response, for the following page
+    session_id: Optional[str] = None  # a newer request with the same session id cancels this one
 
 class SearchRequest(BaseModel):
     query: str
+    cursor: Optional[str] = None
+    session_id: Optional[str] = None
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
 
 class AIChatRequest(BaseModel):
     message: str
     conversation_history: Optional[List[Dict[str, str]]] = []
+    session_id: Optional[str] = None
@@ -1,188 +1,358 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 import asyncio
 from datetime import datetime
+from typing import Dict, List, Tuple
 from models.request_models import AIChatRequest
-from services.ollama_service import OllamaService
+from services.ollama_service import OllamaService, ChatStreamParser
 from services.simple_recommender import SimpleRecommender
+from services.streaming_service import StreamingService
+from services.title_resolver import TitleResolver
+from services.cancellation_service import CancellationService
 from routes.discovery import get_content_with_date_filtering
-from routes.search import global_search_with_ott_filtering
+from routes.search import batch_search_with_ott_filtering
 from config.constants import LANGUAGE_MAP
+from utils.responses import FastJSONResponse, SSE_HEADERS, sse_event
 
 router = APIRouter()
 
 @router.post("/ai-chat")
-async def ai_chat_recommendation(request: AIChatRequest):
-    """AI recommendations with proper content prioritization"""
-    try:
-        user_message = request.message.strip()
-        conversation_history = request.conversation_history or []
-        
-        print(f"🤖 AI Chat request: '{user_message}'")
-        
-        # Try AI first
-        ai_data = None
-        try:
-            print("🔄 Trying AI response...")
-            
-            ai_prompt = f"""User request: "{user_message}"
+async def ai_chat_recommendation(request: AIChatRequest, http_request: Request):
+    """AI recommendations; the LLM call and searches stop if the client leaves or the session sends a newer message"""
+    return await CancellationService.run(http_request, ai_chat_response(request), "ai_chat", request.session_id)
 
-Respond with EXACTLY this JSON format:
-{{
-    "response": "Your friendly response",
-    "search_criteria": {{
+def chat_criteria(ai_data: Dict) -> Tuple[str, str, str]:
+    """(genre, language, content_type) from an AI or rule-based analysis"""
+    search_criteria = ai_data.get('search_criteria', {})
+    return (
+        search_criteria.get('genre', 'action'),
+        search_criteria.get('language', 'english'),
+        search_criteria.get('content_type', 'tv')
+    )
+
+def chat_prompt(user_message: str, criteria_first: bool = False) -> str:
+    """LLM prompt for a chat message; `criteria_first` asks for search_criteria before the
+    reply text, so a streamed answer yields the criteria after a few tokens"""
+    response_line = '"response": "Your friendly response",'
+    criteria_lines = """"search_criteria": {
         "genre": "action",
         "language": "english", 
         "content_type": "tv"
-    }},
+    },"""
+    fields = f"{criteria_lines}\n    {response_line}" if criteria_first else f"{response_line}\n    {criteria_lines}"
+    
+    return f"""User request: "{user_message}"
+
+Respond with EXACTLY this JSON format:
+{{
+    {fields}
     "suggested_titles": ["Title1", "Title2", "Title3"]
 }}
 
 Use appropriate genre, language, and content_type based on the request."""
 
-            ai_text = await OllamaService.get_ai_response(ai_prompt, temperature=0.1)
-            
-            if ai_text:
-                fallback_data = SimpleRecommender.analyze_request(user_message)
-                ai_data = OllamaService.parse_json_response(ai_text, fallback_data)
-                print("✅ Using AI response")
-            else:
-                raise Exception("No AI response")
-                
+def start_generic_fetch(criteria: Tuple[str, str, str]) -> asyncio.Task:
+    genre, language, content_type = criteria
+    language_code = LANGUAGE_MAP.get(language, 'en')
+    return asyncio.create_task(get_content_with_date_filtering(language_code, content_type, genre, '2years'))
+
+class GenericFetch:
+    """The generic discover fetch of one chat request.
+
+    Started from the rule-based criteria before the LLM answers; `ensure` keeps
+    it if the model settles on the same criteria and restarts it otherwise."""
+
+    def __init__(self, criteria: Tuple[str, str, str]):
+        self.criteria = criteria
+        self.task = start_generic_fetch(criteria)
+
+    def ensure(self, criteria: Tuple[str, str, str]):
+        if criteria == self.criteria:
+            print("♻️ Reusing speculative generic fetch")
+            return
+        self.task.cancel()
+        self.criteria = criteria
+        self.task = start_generic_fetch(criteria)
+
+    async def result(self) -> list:
+        return await self.task
+
+    def cancel(self):
+        if not self.task.done():
+            self.task.cancel()
+
+async def find_specific_content(suggested_titles: List[str], content_type: str) -> list:
+    """OTT-available results for the suggested titles, in suggestion order.
+
+    Titles we already know resolve locally and only need a record (a details
+    lookup for seed-file titles) and a provider check; the rest are searched
+    together. The lookups, provider checks and the batch search all run
+    concurrently."""
+    print(f"🔎 Searching SPECIFIC titles first: {suggested_titles}")
+    results_by_title = {}
+    
+    matches = {}
+    for title in suggested_titles:
+        match = TitleResolver.resolve(title, content_type)
+        if match is not None:
+            matches[title] = match
+    unresolved_titles = [title for title in suggested_titles if title not in matches]
+    
+    async def check_available(resolved: list, api_content_type: str):
+        candidates = [record for _, record in resolved if record['content_type'] == api_content_type]
+        if not candidates:
+            return
+        available = await StreamingService.get_streaming_providers_batch(candidates, api_content_type)
+        available_ids = {record['id'] for record in available}
+        for title, record in resolved:
+            if record['content_type'] == api_content_type and record['id'] in available_ids:
+                results_by_title[title] = [record]
+    
+    async def search_titles(titles: List[str]):
+        if not titles:
+            return
+        try:
+            searched = await batch_search_with_ott_filtering(titles)
         except Exception as e:
-            print(f"⚠️ AI failed, using smart fallback: {e}")
-            ai_data = SimpleRecommender.analyze_request(user_message)
-        
-        # Extract search criteria
-        search_criteria = ai_data.get('search_criteria', {})
-        genre = search_criteria.get('genre', 'action')
-        language = search_criteria.get('language', 'english')
-        content_type = search_criteria.get('content_type', 'tv')
-        
-        print(f"🎯 Final params - Genre: '{genre}', Language: {language}, Content: {content_type}")
-        
-        # PRIORITIZE SPECIFIC SEARCH RESULTS OVER GENERIC RESULTS
-        suggested_titles = ai_data.get('suggested_titles', [])
-        specific_content = []
-        
-        if suggested_titles:
-            print(f"🔎 Searching SPECIFIC titles first: {suggested_titles}")
-            for title in suggested_titles:
-                try:
-                    title_results = await global_search_with_ott_filtering(title)
-                    specific_content.extend(title_results)
-                    print(f"  - '{title}': found {len(title_results)} results")
-                    
-                    if title_results:
-                        found_titles = [item.get('title', 'Unknown') for item in title_results]
-                        print(f"    Specific titles: {found_titles}")
-                        
-                except Exception as e:
-                    print(f"  - '{title}': error {e}")
-                    continue
-        
-        print(f"📊 SPECIFIC content found: {len(specific_content)} items")
+            print(f"  - batch search error {e}")
+            return
+        for title, title_results in searched.items():
+            results_by_title[title] = title_results
+            print(f"  - '{title}': found {len(title_results)} results")
+            
+            if title_results:
+                found_titles = [item.get('title', 'Unknown') for item in title_results]
+                print(f"    Specific titles: {found_titles}")
+    
+    async def check_resolved():
+        if not matches:
+            return
+        records = await asyncio.gather(
+            *(TitleResolver.entry_record(entry) for entry, _ in matches.values()), return_exceptions=True
+        )
+        resolved, failed_titles = [], []
+        for (title, (entry, similarity)), record in zip(matches.items(), records):
+            if isinstance(record, Exception) or record is None:
+                failed_titles.append(title)
+                continue
+            print(f"🎯 Resolved '{title}' -> '{entry.title}' ({entry.content_type} {entry.id}, similarity {similarity:.2f})")
+            resolved.append((title, record))
+        # Titles whose details lookup failed fall back to a search
+        await asyncio.gather(
+            check_available(resolved, 'movie'), check_available(resolved, 'tv'), search_titles(failed_titles)
+        )
+    
+    await asyncio.gather(check_resolved(), search_titles(unresolved_titles))
+    
+    specific_content = []
+    for title in suggested_titles:
+        specific_content.extend(results_by_title.get(title, []))
+    return specific_content
+
+async def chat_payload(user_message: str, conversation_history: list, ai_data: Dict, generic: GenericFetch) -> Dict:
+    """Recommendations for the final AI (or fallback) analysis, as the /ai-chat response payload"""
+    # Extract search criteria
+    criteria = chat_criteria(ai_data)
+    genre, language, content_type = criteria
+    
+    print(f"🎯 Final params - Genre: '{genre}', Language: {language}, Content: {content_type}")
+    generic.ensure(criteria)
+    
+    # PRIORITIZE SPECIFIC SEARCH RESULTS OVER GENERIC RESULTS
+    suggested_titles = ai_data.get('suggested_titles', [])
+    specific_content = await find_specific_content(suggested_titles, content_type) if suggested_titles else []
+    
+    specific_keys = {(item['content_type'], item['id']) for item in specific_content}
+    print(f"📊 SPECIFIC content found: {len(specific_content)} items")
+    
+    # Only add generic content if we don't have enough specific results
+    generic_content = []
+    if len(specific_content) < 10:  # Only if we need more
+        print(f"🔍 Need more content, searching generic {genre} {content_type}...")
+        generic_results = await generic.result()
         
-        # Only add generic content if we don't have enough specific results
-        generic_content = []
-        if len(specific_content) < 10:  # Only if we need more
-            print(f"🔍 Need more content, searching generic {genre} {content_type}...")
-            language_code = LANGUAGE_MAP.get(language, 'en')
-            generic_results = await get_content_with_date_filtering(language_code, content_type, genre, '2years')
+        # Filter out generic results that aren't related to the search
+        if 'marvel' in user_message.lower() or 'superhero' in user_message.lower():
+            # For Marvel/superhero requests, filter generic content
+            filtered_generic = []
+            marvel_keywords = ['marvel', 'superhero', 'hero', 'comic', 'dc', 'batman', 'superman', 'avengers']
             
-            # Filter out generic results that aren't related to the search
-            if 'marvel' in user_message.lower() or 'superhero' in user_message.lower():
-                # For Marvel/superhero requests, filter generic content
-                filtered_generic = []
-                marvel_keywords = ['marvel', 'superhero', 'hero', 'comic', 'dc', 'batman', 'superman', 'avengers']
+            for item in generic_results:
+                title_lower = item.get('title', '').lower()
+                overview_lower = item.get('overview', '').lower()
                 
-                for item in generic_results:
-                    title_lower = item.get('title', '').lower()
-                    overview_lower = item.get('overview', '').lower()
-                    
-                    if any(keyword in title_lower or keyword in overview_lower for keyword in marvel_keywords):
-                        filtered_generic.append(item)
-                
-                generic_content = filtered_generic[:5]  # Limit generic results
-                print(f"📊 FILTERED generic content: {len(generic_content)} items (Marvel-related only)")
-            else:
-                generic_content = generic_results[:8]  # Normal case
-                print(f"📊 GENERIC content: {len(generic_content)} items")
+                if any(keyword in title_lower or keyword in overview_lower for keyword in marvel_keywords):
+                    filtered_generic.append(item)
+            
+            generic_content = filtered_generic[:5]  # Limit generic results
+            print(f"📊 FILTERED generic content: {len(generic_content)} items (Marvel-related only)")
+        else:
+            generic_content = generic_results[:8]  # Normal case
+            print(f"📊 GENERIC content: {len(generic_content)} items")
+    
+    # Combine with SPECIFIC content first
+    all_content = specific_content + generic_content
+    print(f"📊 Combined: {len(specific_content)} specific + {len(generic_content)} generic = {len(all_content)} total")
+    
+    # Deduplication
+    unique_content = []
+    seen_ids = set()
+    
+    for item in all_content:
+        if item['id'] not in seen_ids:
+            seen_ids.add(item['id'])
+            unique_content.append(item)
+    
+    print(f"📊 After deduplication: {len(unique_content)} items")
+    
+    # Sort with HEAVY preference for specific search results
+    def sort_key(item):
+        base_rating = item.get('rating', 0)
+        title = item.get('title', '').lower()
         
-        # Combine with SPECIFIC content first
-        all_content = specific_content + generic_content
-        print(f"📊 Combined: {len(specific_content)} specific + {len(generic_content)} generic = {len(all_content)} total")
+        # Check if this was from specific search
+        is_specific = (item['content_type'], item['id']) in specific_keys
         
-        # Deduplication
-        unique_content = []
-        seen_ids = set()
+        if is_specific:
+            boosted_rating = base_rating + 5  # HEAVY boost for specific results
+            print(f"⭐⭐⭐ SPECIFIC MATCH '{item.get('title', 'Unknown')}': {base_rating} → {boosted_rating}")
+            return boosted_rating
         
-        for item in all_content:
-            if item['id'] not in seen_ids:
-                seen_ids.add(item['id'])
-                unique_content.append(item)
+        return base_rating
+    
+    unique_content.sort(key=sort_key, reverse=True)
+    
+    # Limit final results
+    final_recommendations = unique_content[:15]
+    
+    print(f"📈 Final breakdown:")
+    specific_count = len([item for item in final_recommendations if (item['content_type'], item['id']) in specific_keys])
+    print(f"  - Specific results prioritized: {specific_count}")
+    print(f"  - Generic results: {len(final_recommendations) - specific_count}")
+    
+    # Log final titles
+    if final_recommendations:
+        final_titles = [f"{item.get('title', 'Unknown')} ({item.get('content_type', 'unknown')})" for item in final_recommendations]
+        print(f"📤 FINAL TITLES: {final_titles}")
+    
+    return {
+        "ai_response": ai_data.get('response', ''),
+        "recommendations": final_recommendations,
+        "query_analysis": {
+            "detected_genre": genre,
+            "detected_language": language,
+            "detected_content_type": content_type,
+            "mood": "prioritized_search",
+            "traits": [f"specific_titles: {suggested_titles}"]
+        },
+        "total_found": len(final_recommendations),
+        "conversation_context": conversation_history + [{
+            "user": user_message,
+            "ai": ai_data.get('response', ''),
+            "timestamp": datetime.now().isoformat()
+        }]
+    }
+
+async def ai_chat_response(request: AIChatRequest):
+    """AI recommendations with proper content prioritization.
+
+    The generic discover fetch starts right away from the rule-based analysis
+    while the LLM is still generating; it is reused if the model settles on the
+    same criteria and replaced otherwise, and it runs alongside the title
+    searches, so latency is about max(LLM, fetch) rather than their sum."""
+    generic = None
+    user_message = request.message.strip()
+    conversation_history = request.conversation_history or []
+    try:
+        print(f"🤖 AI Chat request: '{user_message}'")
         
-        print(f"📊 After deduplication: {len(unique_content)} items")
+        # Speculative generic fetch from the rule-based criteria
+        fallback_data = SimpleRecommender.analyze_request(user_message)
+        generic = GenericFetch(chat_criteria(fallback_data))
         
-        # Sort with HEAVY preference for specific search results
-        def sort_key(item):
-            base_rating = item.get('rating', 0)
-            title = item.get('title', '').lower()
-            
-            # Check if this was from specific search
-            is_specific = any(
-                suggested_title.lower() in title or 
-                any(word in title for word in suggested_title.lower().split())
-                for suggested_title in suggested_titles
-            )
-            
-            if is_specific:
-                boosted_rating = base_rating + 5  # HEAVY boost for specific results
-                print(f"⭐⭐⭐ SPECIFIC MATCH '{item.get('title', 'Unknown')}': {base_rating} → {boosted_rating}")
-                return boosted_rating
+        # Try AI first
+        ai_data = None
+        try:
+            print("🔄 Trying AI response...")
+            ai_text = await OllamaService.get_ai_response(chat_prompt(user_message), temperature=0.1)
             
-            return base_rating
-        
-        unique_content.sort(key=sort_key, reverse=True)
-        
-        # Limit final results
-        final_recommendations = unique_content[:15]
-        
-        print(f"📈 Final breakdown:")
-        print(f"  - Specific results prioritized: {len([item for item in final_recommendations if any(suggested_title.lower() in item.get('title', '').lower() for suggested_title in suggested_titles)])}")
-        print(f"  - Generic results: {len(final_recommendations) - len([item for item in final_recommendations if any(suggested_title.lower() in item.get('title', '').lower() for suggested_title in suggested_titles)])}")
-        
-        # Log final titles
-        if final_recommendations:
-            final_titles = [f"{item.get('title', 'Unknown')} ({item.get('content_type', 'unknown')})" for item in final_recommendations]
-            print(f"📤 FINAL TITLES: {final_titles}")
+            if ai_text:
+                ai_data = OllamaService.parse_json_response(ai_text, fallback_data)
+                print("✅ Using AI response")
+            else:
+                raise Exception("No AI response")
+                
+        except Exception as e:
+            print(f"⚠️ AI failed, using smart fallback: {e}")
+            ai_data = fallback_data
         
-        return {
-            "ai_response": ai_data.get('response', ''),
-            "recommendations": final_recommendations,
-            "query_analysis": {
-                "detected_genre": genre,
-                "detected_language": language,
-                "detected_content_type": content_type,
-                "mood": "prioritized_search",
-                "traits": [f"specific_titles: {suggested_titles}"]
-            },
-            "total_found": len(final_recommendations),
-            "conversation_context": conversation_history + [{
-                "user": user_message,
-                "ai": ai_data.get('response', ''),
-                "timestamp": datetime.now().isoformat()
-            }]
-        }
+        return FastJSONResponse(await chat_payload(user_message, conversation_history, ai_data, generic))
         
     except Exception as e:
         print(f"❌ Complete error: {e}")
         import traceback
         traceback.print_exc()
         
-        return {
+        return FastJSONResponse({
             "ai_response": "I'm having some technical difficulties, but I can still help you find great content!",
             "recommendations": [],
             "query_analysis": {"detected_genre": "action", "detected_language": "english", "detected_content_type": "tv"},
             "total_found": 0,
             "conversation_context": conversation_history
-        }
+        })
+    
+    finally:
+        # Not needed (enough specific results) or the request failed / was cancelled
+        if generic is not None:
+            generic.cancel()
+
+@router.post("/ai-chat/stream")
+async def ai_chat_stream(request: AIChatRequest):
+    """Server-sent events version of /ai-chat that relays the model's reply as it is generated.
+
+    Events: `delta` ({"text"}) for each piece of the reply text, `criteria` as
+    soon as the model's search_criteria object is complete (the generic fetch
+    switches to it right then, while the reply is still streaming), then
+    `result` with the same payload as /ai-chat. Failures end the stream with an
+    `error` event. A client disconnect closes the Ollama stream, which stops
+    the generation."""
+    user_message = request.message.strip()
+    conversation_history = request.conversation_history or []
+    print(f"🤖 AI Chat stream request: '{user_message}'")
+    
+    async def events():
+        fallback_data = SimpleRecommender.analyze_request(user_message)
+        generic = GenericFetch(chat_criteria(fallback_data))
+        parser = ChatStreamParser()
+        criteria_sent = False
+        tokens = OllamaService.stream_ai_response(chat_prompt(user_message, criteria_first=True), temperature=0.1)
+        try:
+            async for chunk in tokens:
+                text = parser.feed(chunk)
+                if text:
+                    yield sse_event("delta", {"text": text})
+                if parser.criteria is not None and not criteria_sent:
+                    criteria_sent = True
+                    generic.ensure(chat_criteria({"search_criteria": parser.criteria}))
+                    yield sse_event("criteria", parser.criteria)
+            
+            if not parser.buffer.strip():
+                print("⚠️ AI failed, using smart fallback: No AI response")
+                ai_data = fallback_data
+                yield sse_event("delta", {"text": ai_data.get('response', '')})
+            elif parser.raw:
+                # Plain-text answer: keep what the client was shown, criteria come from the fallback
+                ai_data = {**fallback_data, "response": parser.buffer.strip()}
+            else:
+                ai_data = OllamaService.parse_json_response(parser.buffer, fallback_data)
+                print("✅ Using AI response")
+            
+            yield sse_event("result", await chat_payload(user_message, conversation_history, ai_data, generic))
+        except Exception as e:
+            print(f"❌ Error in ai_chat_stream: {e}")
+            yield sse_event("error", {"detail": str(e)})
+        finally:
+            await tokens.aclose()
+            generic.cancel()
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,125 +1,338 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional, Union
 from models.request_models import DiscoverRequest
 from services.tmdb_service import TMDBService
 from services.streaming_service import StreamingService
-from config.constants import LANGUAGE_MAP, get_date_range, get_genre_id, DEFAULTS
+from services.result_set_service import ResultSetService
+from services.prewarm_service import PrewarmService
+from services.cancellation_service import CancellationService
+from models.content_record import ContentRecord
+from config.constants import LANGUAGE_MAP, API_CONFIG, MESSAGES, get_date_range, get_genre_id, get_genre_ids, DEFAULTS
 from utils.helpers import extract_filters_from_prompt
+from utils.responses import FastJSONResponse, SSE_HEADERS, sse_event
 
 router = APIRouter()
 
-async def get_content_with_date_filtering(language_code: str, content_type: str, genre: str, release_period: str):
-    """Get content with date range filtering and correct genre IDs"""
+LANGUAGE_NAMES = {code: name for name, code in LANGUAGE_MAP.items()}
+
+# Items returned by /discover (and streamed by /discover/stream)
+DISCOVER_PAGE_SIZE = 25
+
+def _as_list(value: Union[str, List[str]]) -> List[str]:
+    return [value] if isinstance(value, str) else list(value)
+
+def annotate_matches(item: ContentRecord, genres: List[str], language_codes: List[str]):
+    """Record which of the requested genres/languages an item matched"""
+    item_genre_ids = item.get('genre_ids', [])
+    item["matched"] = {
+        "genres": [genre for genre in genres if get_genre_id(genre, item['content_type']) in item_genre_ids],
+        "languages": [LANGUAGE_NAMES.get(code, code) for code in language_codes if code == item.get('original_language')]
+    }
+
+async def get_content_with_date_filtering(language_code: Union[str, List[str]], content_type: str,
+                                          genre: Union[str, List[str]], release_period: str,
+                                          limit: Optional[int] = None, stats: Optional[Dict] = None,
+                                          on_item: Optional[Callable[[ContentRecord], None]] = None,
+                                          leftover: Optional[list] = None):
+    """Get content with date range filtering and correct genre IDs.
+
+    `language_code` and `genre` may be lists: every language gets its own
+    discover queries (all genres OR-ed into one `with_genres`), candidates are
+    deduplicated across them before any provider lookup, and each item gets a
+    `matched` block naming the requested genres/languages it matched.
+
+    With `limit`, provider checks stop once that many OTT-available items of a
+    content type are confirmed; cancelled lookups are counted in
+    `stats['cancelled_lookups']`. `on_item` is called with every item as soon
+    as its OTT availability is confirmed (see iter_content_with_date_filtering).
+    Candidates left unchecked because of `limit` are appended to `leftover`."""
+    PrewarmService.record(language_code, content_type, genre, release_period, limit)
     date_from, date_to = get_date_range(release_period)
+    language_codes = _as_list(language_code)
+    genres = _as_list(genre)
     print(f"Date filtering: {date_from} to {date_to} (period: {release_period})")
     
-    all_content = []
+    # Movies are streamed through the OTT check page by page while they are fetched
+    movie_cap = None if limit is None else min(limit, API_CONFIG['MAX_RESULTS_PER_TYPE'])
+    confirmed_movies = 0
+    seen_movie_ids = set()
     
-    # Handle content type properly with correct genre IDs
-    if content_type == 'both':
-        print("Fetching BOTH movies and TV shows with date filtering...")
+    async def movie_ott_filter(items):
+        nonlocal confirmed_movies
+        items = [item for item in items if item['id'] not in seen_movie_ids]
+        seen_movie_ids.update(item['id'] for item in items)
+        for item in items:
+            annotate_matches(item, genres, language_codes)
         
-        movies_task = TMDBService.fetch_movies(language_code, genre, date_from, date_to)
-        tv_shows_task = TMDBService.fetch_tv_shows(language_code, genre, date_from, date_to)
-        
-        movies, tv_shows = await asyncio.gather(movies_task, tv_shows_task)
-        
-        print(f"Fetched {len(movies)} movies and {len(tv_shows)} TV shows")
-        all_content.extend(movies)
-        all_content.extend(tv_shows)
-        
-    elif content_type == 'movie':
-        print("Fetching ONLY movies with date filtering...")
-        movies = await TMDBService.fetch_movies(language_code, genre, date_from, date_to)
-        all_content.extend(movies)
-        
-    elif content_type == 'tv':
-        print("Fetching ONLY TV shows with date filtering...")
-        tv_shows = await TMDBService.fetch_tv_shows(language_code, genre, date_from, date_to)
-        all_content.extend(tv_shows)
-    
-    print(f"Total content found before OTT filtering: {len(all_content)}")
+        needed = None if movie_cap is None else movie_cap - confirmed_movies
+        if needed is not None and needed <= 0:
+            if leftover is not None:
+                leftover.extend(items)
+            return []
+        available = await StreamingService.get_streaming_providers_batch(
+            items, 'movie', needed=needed, stats=stats, on_confirmed=on_item, leftover=leftover
+        )
+        confirmed_movies += len(available)
+        return available
     
-    # Check OTT availability
-    movies = [item for item in all_content if item['content_type'] == 'movie']
-    tv_shows = [item for item in all_content if item['content_type'] == 'tv']
+    def movie_quota_met():
+        return movie_cap is not None and confirmed_movies >= movie_cap
     
-    ott_content = []
+    async def movies_pipeline():
+        per_language = await asyncio.gather(*(
+            TMDBService.fetch_movies(code, genres, date_from, date_to, ott_filter=movie_ott_filter,
+                                     quota_met=movie_quota_met)
+            for code in language_codes
+        ))
+        movies = [movie for language_movies in per_language for movie in language_movies]
+        print(f"Found {len(movies)} movies with OTT availability")
+        return movies
     
-    if movies:
-        print(f"Checking OTT availability for {len(movies)} movies...")
-        movie_ott = await StreamingService.get_streaming_providers_batch(movies, 'movie')
-        ott_content.extend(movie_ott)
-        print(f"Found {len(movie_ott)} movies with OTT availability")
-    
-    if tv_shows:
+    # TV shows are checked as soon as their candidates are in, while movies may still be paging
+    async def tv_pipeline():
+        per_language = await asyncio.gather(*(
+            TMDBService.fetch_tv_shows(code, genres, date_from, date_to) for code in language_codes
+        ))
+        tv_shows = []
+        seen_show_ids = set()
+        for language_shows in per_language:
+            for show in language_shows:
+                if show['id'] not in seen_show_ids:
+                    seen_show_ids.add(show['id'])
+                    annotate_matches(show, genres, language_codes)
+                    tv_shows.append(show)
+        if len(per_language) > 1:
+            tv_shows.sort(key=lambda show: show.get('popularity', 0), reverse=True)
+        
+        if not tv_shows:
+            return []
         print(f"Checking OTT availability for {len(tv_shows)} TV shows...")
-        tv_ott = await StreamingService.get_streaming_providers_batch(tv_shows, 'tv')
-        ott_content.extend(tv_ott)
+        tv_ott = await StreamingService.get_streaming_providers_batch(
+            tv_shows, 'tv', needed=limit, stats=stats, on_confirmed=on_item, leftover=leftover
+        )
         print(f"Found {len(tv_ott)} TV shows with OTT availability")
+        return tv_ott
+    
+    # Handle content type properly with correct genre IDs
+    pipelines = []
+    if content_type in ('both', 'movie'):
+        pipelines.append(movies_pipeline())
+    if content_type in ('both', 'tv'):
+        pipelines.append(tv_pipeline())
+    print(f"Fetching {content_type} content for {genres} in {language_codes} with date filtering...")
+    
+    ott_content = []
+    for results in await asyncio.gather(*pipelines):
+        ott_content.extend(results)
     
-    # Sort by release date (newest first) and rating
-    ott_content.sort(key=lambda x: (x.get('release_date', ''), x.get('rating', 0)), reverse=True)
+    if leftover:
+        leftover.sort(key=lambda item: item.get('popularity', 0), reverse=True)
+    
+    sort_discover_content(ott_content)
     
     print(f"Final OTT content: {len(ott_content)} items")
     return ott_content
 
+def sort_discover_content(content: list):
+    """Sort by release date (newest first) and rating, in place"""
+    content.sort(key=lambda x: (x.get('release_date', ''), x.get('rating', 0)), reverse=True)
+
+async def iter_content_with_date_filtering(language_code: Union[str, List[str]], content_type: str,
+                                           genre: Union[str, List[str]], release_period: str,
+                                           limit: Optional[int] = None,
+                                           stats: Optional[Dict] = None) -> AsyncIterator[ContentRecord]:
+    """Yield OTT-available items in the order their availability is confirmed.
+
+    Runs get_content_with_date_filtering in a task and relays its `on_item`
+    callbacks; closing the iterator early (e.g. the client went away) cancels
+    the outstanding upstream work. Use sort_discover_content for the final order."""
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    
+    async def produce():
+        try:
+            await get_content_with_date_filtering(
+                language_code, content_type, genre, release_period, limit, stats, on_item=queue.put_nowait
+            )
+        finally:
+            queue.put_nowait(finished)
+    
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                break
+            yield item
+        await task  # surface errors from the pipeline
+    finally:
+        if not task.done():
+            task.cancel()
+
+def resolve_discover_params(request: DiscoverRequest) -> Dict:
+    """Filters for a discover request: explicit parameters if all given, else extracted from the prompt.
+
+    `genres`/`languages` lists take precedence over the single `genre`/`language`;
+    the single-valued keys always hold the first entry."""
+    genres = request.genres or ([request.genre] if request.genre else [])
+    languages = request.languages or ([request.language] if request.language else [])
+    explicit = bool(genres and languages and request.content_type)
+    
+    # Use explicit parameters if provided
+    if explicit:
+        content_type = request.content_type
+        release_period = request.release_period or DEFAULTS['RELEASE_PERIOD']
+        print(f"Using explicit parameters - Genres: {genres}, Languages: {languages}, Content: {content_type}, Period: {release_period}")
+    else:
+        # Fallback to extraction
+        genre, language, content_type = extract_filters_from_prompt(request.prompt)
+        genres, languages = [genre], [language]
+        release_period = DEFAULTS['RELEASE_PERIOD']
+        print(f"Extracted from prompt - Genre: {genre}, Language: {language}, Content: {content_type}")
+    
+    # Drop repeats while keeping the requested order
+    genres = list(dict.fromkeys(genres))
+    languages = list(dict.fromkeys(languages))
+    language_codes = list(dict.fromkeys(LANGUAGE_MAP.get(language, 'hi') for language in languages))
+    
+    params = {
+        "genre": genres[0],
+        "language": languages[0],
+        "genres": genres,
+        "languages": languages,
+        "content_type": content_type,
+        "release_period": release_period,
+        "language_code": language_codes[0],
+        "language_codes": language_codes,
+        "movie_genre_id": get_genre_id(genres[0], 'movie'),
+        "tv_genre_id": get_genre_id(genres[0], 'tv'),
+        "movie_genre_ids": get_genre_ids(genres, 'movie'),
+        "tv_genre_ids": get_genre_ids(genres, 'tv'),
+        "explicit_params": explicit
+    }
+    
+    print(f"Using language codes: {params['language_codes']}")
+    print(f"Movie genre IDs: {params['movie_genre_ids']}, TV genre IDs: {params['tv_genre_ids']}")
+    return params
+
+def discover_detected(params: Dict) -> Dict:
+    return {
+        "genre": params["genre"],
+        "language": params["language"],
+        "genres": params["genres"],
+        "languages": params["languages"],
+        "content_type": params["content_type"],
+        "release_period": params["release_period"]
+    }
+
+def discover_debug(params: Dict, stats: Dict, content: list) -> Dict:
+    return {
+        "language_code": params["language_code"],
+        "language_codes": params["language_codes"],
+        "movie_genre_id": params["movie_genre_id"],
+        "tv_genre_id": params["tv_genre_id"],
+        "movie_genre_ids": params["movie_genre_ids"],
+        "tv_genre_ids": params["tv_genre_ids"],
+        "date_range": get_date_range(params["release_period"]),
+        "explicit_params": params["explicit_params"],
+        "cancelled_lookups": stats["cancelled_lookups"],
+        "content_breakdown": {
+            "movies": len([item for item in content if item['content_type'] == 'movie']),
+            "tv_shows": len([item for item in content if item['content_type'] == 'tv'])
+        }
+    }
+
 @router.post("/discover")
-async def discover_content(request: DiscoverRequest):
+async def discover_content(request: DiscoverRequest, http_request: Request):
     """Complete endpoint with correct genre IDs for movies and TV shows"""
+    limit = DISCOVER_PAGE_SIZE
+    
+    # Later pages are served from the stored result set
+    if request.cursor:
+        page = await ResultSetService.page_from_cursor(request.cursor, limit)
+        if page is None:
+            raise HTTPException(status_code=410, detail=MESSAGES['CURSOR_EXPIRED'])
+        return FastJSONResponse({
+            "content": page["content"],
+            "total": page["confirmed"],
+            "next_cursor": page["next_cursor"],
+            **page["meta"]
+        })
+    
     try:
         print(f"Received request: {request.prompt}")
+        params = resolve_discover_params(request)
         
-        # Use explicit parameters if provided
-        if request.genre and request.language and request.content_type:
-            genre = request.genre
-            language = request.language
-            content_type = request.content_type
-            release_period = request.release_period or DEFAULTS['RELEASE_PERIOD']
-            print(f"Using explicit parameters - Genre: {genre}, Language: {language}, Content: {content_type}, Period: {release_period}")
-        else:
-            # Fallback to extraction
-            genre, language, content_type = extract_filters_from_prompt(request.prompt)
-            release_period = DEFAULTS['RELEASE_PERIOD']
-            print(f"Extracted from prompt - Genre: {genre}, Language: {language}, Content: {content_type}")
+        # Get content with date filtering and correct genre IDs, stopping once the page is full
+        stats = {"cancelled_lookups": 0}
+        leftover = []
+        content = await CancellationService.run(
+            http_request,
+            get_content_with_date_filtering(
+                params["language_codes"], params["content_type"], params["genres"], params["release_period"],
+                limit, stats, leftover=leftover
+            ),
+            "discover", request.session_id
+        )
         
-        # Get language code
-        language_code = LANGUAGE_MAP.get(language, 'hi')
+        print(f"Returning {len(content)} OTT-available items ({len(leftover)} candidates kept for later pages)")
         
-        # Get genre IDs for debugging
-        movie_genre_id = get_genre_id(genre, 'movie')
-        tv_genre_id = get_genre_id(genre, 'tv')
-        
-        print(f"Using language code: {language_code}")
-        print(f"Movie genre ID: {movie_genre_id}, TV genre ID: {tv_genre_id}")
-        
-        # Get content with date filtering and correct genre IDs
-        content = await get_content_with_date_filtering(language_code, content_type, genre, release_period)
-        
-        print(f"Returning {len(content)} OTT-available items")
+        meta = {
+            "detected": discover_detected(params),
+            "debug": discover_debug(params, stats, content)
+        }
+        result_set = ResultSetService.create(content, leftover, sort_discover_content, meta)
+        page = await ResultSetService.page(result_set, 0, limit)
         
-        return {
-            "content": content[:25],
+        return FastJSONResponse({
+            "content": page["content"],
             "total": len(content),
-            "detected": {
-                "genre": genre,
-                "language": language,
-                "content_type": content_type,
-                "release_period": release_period
-            },
-            "debug": {
-                "language_code": language_code,
-                "movie_genre_id": movie_genre_id,
-                "tv_genre_id": tv_genre_id,
-                "date_range": get_date_range(release_period),
-                "explicit_params": bool(request.genre and request.language and request.content_type),
-                "content_breakdown": {
-                    "movies": len([item for item in content if item['content_type'] == 'movie']),
-                    "tv_shows": len([item for item in content if item['content_type'] == 'tv'])
-                }
-            }
-        }
+            "next_cursor": page["next_cursor"],
+            **meta
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in discover_content: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/discover/stream")
+async def discover_content_stream(request: DiscoverRequest):
+    """Server-sent events version of /discover.
+
+    Events: `detected` (the resolved filters, sent immediately), one `item` per
+    content item as soon as its OTT availability is confirmed, then `summary`
+    with the totals, the final display `order` ([content_type, id] pairs, as
+    movie and TV ids can collide; same ordering as /discover) and the debug
+    block. Failures end the stream with an `error` event."""
+    print(f"Received streaming request: {request.prompt}")
+    params = resolve_discover_params(request)
+    
+    async def events():
+        yield sse_event("detected", discover_detected(params))
+        
+        limit = DISCOVER_PAGE_SIZE
+        stats = {"cancelled_lookups": 0}
+        content = []
+        try:
+            async for item in iter_content_with_date_filtering(
+                params["language_codes"], params["content_type"], params["genres"], params["release_period"], limit, stats
+            ):
+                content.append(item)
+                yield sse_event("item", item)
+        except Exception as e:
+            print(f"Error in discover_content_stream: {e}")
+            yield sse_event("error", {"detail": str(e)})
+            return
+        
+        sort_discover_content(content)
+        yield sse_event("summary", {
+            "total": len(content),
+            "order": [[item['content_type'], item['id']] for item in content[:limit]],
+            "debug": discover_debug(params, stats, content)
+        })
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
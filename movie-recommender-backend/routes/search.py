@@ -1,14 +1,29 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 import asyncio
-from models.request_models import SearchRequest
+import time
+from typing import Dict, List, Optional
+from models.request_models import SearchRequest, BatchSearchRequest
 from services.tmdb_service import TMDBService
 from services.streaming_service import StreamingService
-from config.constants import MESSAGES
+from services.result_set_service import ResultSetService
+from services.suggest_service import SuggestService
+from services.cancellation_service import CancellationService
+from config.constants import MESSAGES, SUGGEST_CONFIG, API_CONFIG
+from utils.helpers import gather_bounded
+from utils.responses import FastJSONResponse
 
 router = APIRouter()
 
-async def global_search_with_ott_filtering(query: str):
-    """Perform global search and filter for OTT availability"""
+# Items per /search page
+SEARCH_PAGE_SIZE = 20
+
+async def global_search_with_ott_filtering(query: str, limit: Optional[int] = None, stats: Optional[Dict] = None,
+                                           leftover: Optional[list] = None):
+    """Perform global search and filter for OTT availability.
+
+    Results are checked in TMDB relevance order; with `limit`, provider checks
+    stop once that many OTT-available items of a content type are confirmed,
+    and the unchecked results are appended to `leftover`."""
     print(f"Starting global search for: {query}")
     
     # Search both movies and TV shows in parallel
@@ -31,53 +46,184 @@ async def global_search_with_ott_filtering(query: str):
     
     if movies_to_check:
         print(f"Checking OTT availability for {len(movies_to_check)} searched movies...")
-        movie_ott = await StreamingService.get_streaming_providers_batch(movies_to_check, 'movie')
+        movie_ott = await StreamingService.get_streaming_providers_batch(
+            movies_to_check, 'movie', needed=limit, stats=stats, leftover=leftover
+        )
         ott_content.extend(movie_ott)
         print(f"Found {len(movie_ott)} movies with OTT availability")
     
     if tv_shows_to_check:
         print(f"Checking OTT availability for {len(tv_shows_to_check)} searched TV shows...")
-        tv_ott = await StreamingService.get_streaming_providers_batch(tv_shows_to_check, 'tv')
+        tv_ott = await StreamingService.get_streaming_providers_batch(
+            tv_shows_to_check, 'tv', needed=limit, stats=stats, leftover=leftover
+        )
         ott_content.extend(tv_ott)
         print(f"Found {len(tv_ott)} TV shows with OTT availability")
     
-    # Sort by rating and popularity
-    ott_content.sort(key=lambda x: (x.get('rating', 0), x.get('release_date', '')), reverse=True)
+    sort_search_content(ott_content)
     
     print(f"Global search returning {len(ott_content)} OTT-available items")
     return ott_content
 
+def normalize_query(query: str) -> str:
+    """Whitespace-collapsed, casefolded form used to dedupe batch queries"""
+    return " ".join(query.split()).casefold()
+
+async def batch_search_with_ott_filtering(queries: List[str]) -> Dict[str, list]:
+    """Search many queries at once; results are keyed by the queries as given.
+
+    Queries are deduplicated after normalization, all their TMDB searches run
+    concurrently (at most API_CONFIG['SEARCH_BATCH_CONCURRENCY'] in flight),
+    and the candidates of every query go through one deduplicated provider
+    check per content type. Queries shorter than 2 characters get no results."""
+    unique_queries = list(dict.fromkeys(
+        normalize_query(query) for query in queries if len(normalize_query(query)) >= 2
+    ))
+    print(f"Batch search for {len(unique_queries)} unique queries ({len(queries)} given)")
+    
+    search_results = await gather_bounded(
+        [factory for query in unique_queries for factory in (
+            lambda query=query: TMDBService.search_movies_globally(query),
+            lambda query=query: TMDBService.search_tv_shows_globally(query)
+        )],
+        API_CONFIG['SEARCH_BATCH_CONCURRENCY']
+    )
+    
+    # One record per title, however many queries found it
+    candidates: Dict[tuple, object] = {}
+    keys_by_query: Dict[str, List[tuple]] = {}
+    for index, query in enumerate(unique_queries):
+        query_keys = []
+        for results in search_results[index * 2:index * 2 + 2]:
+            if isinstance(results, Exception):
+                print(f"Batch search error for '{query}': {results}")
+                continue
+            for item in results:
+                key = (item['content_type'], item['id'])
+                candidates.setdefault(key, item)
+                query_keys.append(key)
+        keys_by_query[query] = query_keys
+    
+    available = set()
+    for content_type in ('movie', 'tv'):
+        items = [item for key, item in candidates.items() if key[0] == content_type]
+        if items:
+            print(f"Checking OTT availability for {len(items)} batch-searched {content_type} items...")
+            ott_items = await StreamingService.get_streaming_providers_batch(items, content_type)
+            available.update((content_type, item['id']) for item in ott_items)
+    
+    results_by_query = {}
+    for query in unique_queries:
+        content = [candidates[key] for key in dict.fromkeys(keys_by_query[query]) if key in available]
+        sort_search_content(content)
+        results_by_query[query] = content
+    
+    return {query: results_by_query.get(normalize_query(query), []) for query in queries}
+
+def sort_search_content(content: list):
+    """Sort by rating and release date, in place"""
+    content.sort(key=lambda x: (x.get('rating', 0), x.get('release_date', '')), reverse=True)
+
+@router.get("/search/suggest")
+async def suggest_titles(q: str = "", limit: int = SUGGEST_CONFIG['DEFAULT_LIMIT']):
+    """Typeahead suggestions from the local title index (no upstream calls)"""
+    SuggestService.load_seed()
+    started = time.perf_counter()
+    limit = max(1, min(limit, SUGGEST_CONFIG['MAX_LIMIT']))
+    suggestions = SuggestService.suggest(q, limit)
+    return FastJSONResponse({
+        "query": q,
+        "suggestions": suggestions,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3)
+    })
+
+@router.post("/search/batch")
+async def batch_search(request: BatchSearchRequest, http_request: Request):
+    """Many searches in one request, e.g. for list imports; results keyed by query"""
+    if len(request.queries) > API_CONFIG['MAX_BATCH_QUERIES']:
+        raise HTTPException(status_code=400, detail=MESSAGES['BATCH_TOO_LARGE'])
+    
+    try:
+        results = await CancellationService.run(
+            http_request, batch_search_with_ott_filtering(request.queries), "search_batch"
+        )
+        
+        return FastJSONResponse({
+            "results": {
+                query: {"content": content, "total": len(content)}
+                for query, content in results.items()
+            },
+            "total_queries": len(results),
+            "unique_queries": len({normalize_query(query) for query in request.queries if len(normalize_query(query)) >= 2})
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in batch_search: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/search")
-async def global_search(request: SearchRequest):
+async def global_search(request: SearchRequest, http_request: Request):
     """Global search endpoint - searches across all content regardless of filters"""
+    limit = SEARCH_PAGE_SIZE
+    
+    # Later pages are served from the stored result set
+    if request.cursor:
+        page = await ResultSetService.page_from_cursor(request.cursor, limit)
+        if page is None:
+            raise HTTPException(status_code=410, detail=MESSAGES['CURSOR_EXPIRED'])
+        return FastJSONResponse({
+            "content": page["content"],
+            "total": page["confirmed"],
+            "next_cursor": page["next_cursor"],
+            **page["meta"]
+        })
+    
     try:
         query = request.query.strip()
         
         if len(query) < 2:
-            return {
+            return FastJSONResponse({
                 "content": [],
                 "total": 0,
                 "message": MESSAGES['SEARCH_TOO_SHORT']
-            }
+            })
         
         print(f"Global search request: '{query}'")
         
-        # Perform global search with OTT filtering
-        content = await global_search_with_ott_filtering(query)
+        # Perform global search with OTT filtering, stopping once the page is full
+        stats = {"cancelled_lookups": 0}
+        leftover = []
+        content = await CancellationService.run(
+            http_request, global_search_with_ott_filtering(query, limit, stats, leftover), "search", request.session_id
+        )
         
         print(f"Global search returning {len(content)} results")
         
-        return {
-            "content": content[:20],  # Limit to top 20 results
-            "total": len(content),
+        meta = {
             "query": query,
             "search_type": "global",
             "content_breakdown": {
                 "movies": len([item for item in content if item['content_type'] == 'movie']),
                 "tv_shows": len([item for item in content if item['content_type'] == 'tv'])
+            },
+            "debug": {
+                "cancelled_lookups": stats["cancelled_lookups"]
             }
         }
+        result_set = ResultSetService.create(content, leftover, sort_search_content, meta)
+        page = await ResultSetService.page(result_set, 0, limit)
+        
+        return FastJSONResponse({
+            "content": page["content"],
+            "total": len(content),
+            "next_cursor": page["next_cursor"],
+            **meta
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in global_search: {e}")
         raise HTTPException(status_code=500, detail=str(e))
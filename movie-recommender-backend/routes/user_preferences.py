@@ -3,6 +3,7 @@ from models.user_models import ContentInteraction, RecommendationRequest
 from services.user_preference_service import UserPreferenceService
 from services.recommendation_engine import RecommendationEngine
 from services.tmdb_service import TMDBService
+from utils.responses import FastJSONResponse
 from datetime import datetime
 import asyncio
 
@@ -55,7 +56,7 @@ async def get_user_profile(user_id: str):
             for genre in interaction.get("genres", []):
                 genre_distribution[genre] = genre_distribution.get(genre, 0) + 1
         
-        return {
+        return FastJSONResponse({
             "profile": profile,
             "stats": {
                 "total_interactions": len(interactions),
@@ -66,7 +67,7 @@ async def get_user_profile(user_id: str):
             },
             "recent_activity": interactions[-10:],  # Last 10 interactions
             "liked_content": liked_interactions[-5:]  # Last 5 liked items for display
-        }
+        })
         
     except Exception as e:
         print(f"❌ Error getting user profile: {e}")
@@ -96,13 +97,13 @@ async def get_personalized_recommendations(request: RecommendationRequest):
             sample_reasons = [rec.get("recommendation_reason", "No reason") for rec in recommendations[:3]]
             print(f"🎬 Sample recommendation reasons: {sample_reasons}")
         
-        return {
+        return FastJSONResponse({
             "recommendations": recommendations,
             "algorithm": algorithm_used,
             "personalization_level": personalization_level,
             "user_stats": recommendation_result.get("user_stats", {}),
             "total_found": len(recommendations)
-        }
+        })
         
     except Exception as e:
         print(f"❌ Error getting personalized recommendations: {e}")
@@ -114,10 +115,10 @@ async def get_user_liked_content(user_id: str):
     try:
         interactions = await preference_service.get_user_interactions(user_id, action="liked")
         
-        return {
+        return FastJSONResponse({
             "liked_content": interactions,
             "total_count": len(interactions)
-        }
+        })
         
     except Exception as e:
         print(f"❌ Error getting liked content: {e}")
@@ -129,10 +130,10 @@ async def get_user_watchlist(user_id: str):
     try:
         interactions = await preference_service.get_user_interactions(user_id, action="watchlisted")
         
-        return {
+        return FastJSONResponse({
             "watchlist": interactions,
             "total_count": len(interactions)
-        }
+        })
         
     except Exception as e:
         print(f"❌ Error getting watchlist: {e}")
@@ -0,0 +1,199 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at", "stale_until", "keep_until", "endpoint")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float, keep_until: float, endpoint: str):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.keep_until = keep_until
+        self.endpoint = endpoint
+
+class ResponseCache:
+    """Bounded in-process TTL/LRU cache for upstream JSON responses.
+
+    Each entry goes through three windows:
+      fresh   - served directly
+      stale   - served while a background refresh runs (stale-while-revalidate)
+      error   - only served when the upstream call fails or times out
+
+    An optional backing store (see PersistentCache) gets every set queued for
+    its background writer and is read lazily on a memory miss. Endpoints listed in
+    `negative_ttls` cache "nothing there" answers for that shorter TTL.
+    """
+
+    def __init__(self, max_entries: int, ttls: Dict[str, int], default_ttl: int,
+                 stale_while_revalidate: int, stale_if_error: int,
+                 negative_ttls: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.negative_ttls = negative_ttls or {}
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.backing = None
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "persistent_loads": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "refreshes": 0,
+            "stale_on_error": 0,
+            "negative_sets": 0,
+            "refresh_ahead": 0
+        }
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Normalize endpoint + params into a stable key (api_key is never part of it)"""
+        normalized = []
+        for name, value in sorted((params or {}).items()):
+            if name == "api_key" or value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            normalized.append(f"{name}={str(value).strip().lower()}")
+        return f"{endpoint.rstrip('/')}?{'&'.join(normalized)}"
+
+    @staticmethod
+    def _match(ttls: Dict[str, int], endpoint: str) -> Optional[int]:
+        """TTL of the longest endpoint fragment that matches, or None"""
+        best_match = None
+        for fragment in ttls:
+            if fragment in endpoint and (best_match is None or len(fragment) > len(best_match)):
+                best_match = fragment
+        return ttls[best_match] if best_match else None
+
+    def ttl_for(self, endpoint: str) -> int:
+        """Per-endpoint TTL, resolved by the longest endpoint fragment that matches"""
+        ttl = self._match(self.ttls, endpoint)
+        return self.default_ttl if ttl is None else ttl
+
+    def negative_ttl_for(self, endpoint: str) -> Optional[int]:
+        """TTL for empty answers on this endpoint, or None when they are cached like any other"""
+        return self._match(self.negative_ttls, endpoint)
+
+    def lookup(self, key: str, refresh_ahead: float = 0):
+        """Return (value, state) where state is 'fresh', 'stale' or None on a miss.
+
+        With `refresh_ahead`, fresh entries expiring within that many seconds
+        are reported as 'stale' so the caller refreshes them before they expire."""
+        entry = self._entries.get(key)
+        now = time.time()
+
+        if entry is None:
+            entry = self._load_from_backing(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None, None
+
+        if now <= entry.expires_at:
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            if now > entry.expires_at - refresh_ahead:
+                self._counters["refresh_ahead"] += 1
+                return entry.value, "stale"
+            return entry.value, "fresh"
+
+        if now <= entry.stale_until:
+            self._entries.move_to_end(key)
+            self._counters["stale_hits"] += 1
+            return entry.value, "stale"
+
+        if now > entry.keep_until:
+            del self._entries[key]
+            self._counters["expirations"] += 1
+
+        self._counters["misses"] += 1
+        return None, None
+
+    def _load_from_backing(self, key: str) -> Optional[CacheEntry]:
+        if self.backing is None:
+            return None
+        try:
+            entry = self.backing.get(key)
+        except Exception as e:
+            print(f"⚠️ Persistent cache read failed: {e}")
+            return None
+        if entry is not None:
+            self._counters["persistent_loads"] += 1
+            self._insert(key, entry)
+        return entry
+
+    def is_fresh(self, key: str) -> bool:
+        """Fresh-entry check that does not touch LRU order or counters"""
+        entry = self._entries.get(key)
+        return entry is not None and time.time() <= entry.expires_at
+
+    def get_if_error(self, key: str):
+        """Value to fall back on when the upstream failed, or None"""
+        entry = self._entries.get(key) or self._load_from_backing(key)
+        if entry is None or time.time() > entry.keep_until:
+            return None
+        self._counters["stale_on_error"] += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, endpoint: str, ttl: Optional[int] = None, negative: bool = False):
+        now = time.time()
+        if negative:
+            self._counters["negative_sets"] += 1
+        ttl = self.ttl_for(endpoint) if ttl is None else ttl
+        expires_at = now + ttl
+
+        entry = CacheEntry(
+            value,
+            expires_at,
+            expires_at + self.stale_while_revalidate,
+            expires_at + self.stale_if_error,
+            endpoint
+        )
+        self._insert(key, entry)
+
+        if self.backing is not None:
+            try:
+                self.backing.put(key, entry)
+            except Exception as e:
+                print(f"⚠️ Persistent cache write failed: {e}")
+
+    def _insert(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def snapshot(self, limit: int) -> List[Tuple[str, CacheEntry]]:
+        """The `limit` most recently used entries, least recent first"""
+        items = list(self._entries.items())
+        return items[-limit:] if limit else []
+
+    def warm(self, items: List[Tuple[str, CacheEntry]]):
+        """Load entries (least recent first) without touching the backing store"""
+        now = time.time()
+        for key, entry in items:
+            if entry.keep_until >= now:
+                self._insert(key, entry)
+
+    def record_refresh(self):
+        self._counters["refreshes"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"]
+        served = self._counters["hits"] + self._counters["stale_hits"]
+        return {
+            **self._counters,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "persistent": self.backing is not None,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Awaitable, Dict, Optional, Tuple, TypeVar
+from fastapi import HTTPException
+from starlette.requests import Request
+from config.constants import MESSAGES
+
+T = TypeVar("T")
+
+# Status for a request whose client went away (no one reads it, but it shows up in access logs)
+CLIENT_CLOSED_REQUEST = 499
+
+class CancellationService:
+    """Stops upstream fan-out nobody is waiting for any more.
+
+    `run` executes a route's expensive work as a task and cancels it when the
+    client disconnects, or, with a session id, when a newer request of the same
+    scope and session starts ("latest query wins", e.g. search-as-you-type).
+    Cancellation propagates into the awaited httpx requests and provider
+    batches; SingleFlight cancels shared upstream calls once their last waiter
+    is gone.
+    """
+    _latest: Dict[str, Tuple[asyncio.Task, Dict]] = {}
+    _counters = {"disconnected": 0, "superseded": 0}
+
+    @staticmethod
+    async def _watch_disconnect(request: Request, work: asyncio.Task, state: Dict):
+        while not work.done():
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                if not work.done():
+                    state["reason"] = "disconnected"
+                    CancellationService._counters["disconnected"] += 1
+                    work.cancel()
+                return
+
+    @staticmethod
+    async def run(request: Request, work: Awaitable[T], scope: str, session_id: Optional[str] = None) -> T:
+        """Await `work`; raises HTTPException 499 if the client disconnected, 409 if a newer request superseded it"""
+        task = asyncio.ensure_future(work)
+        state = {"reason": None}
+        session_key = f"{scope}:{session_id}" if session_id else None
+        if session_key:
+            previous = CancellationService._latest.get(session_key)
+            if previous is not None and not previous[0].done():
+                previous[1]["reason"] = "superseded"
+                CancellationService._counters["superseded"] += 1
+                previous[0].cancel()
+            CancellationService._latest[session_key] = (task, state)
+
+        watcher = asyncio.create_task(CancellationService._watch_disconnect(request, task, state))
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if state["reason"] == "disconnected":
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=MESSAGES['CLIENT_DISCONNECTED'])
+            if state["reason"] == "superseded":
+                raise HTTPException(status_code=409, detail=MESSAGES['QUERY_SUPERSEDED'])
+            raise  # the route itself is being cancelled
+        finally:
+            watcher.cancel()
+            if not task.done():
+                task.cancel()
+            latest = CancellationService._latest.get(session_key) if session_key else None
+            if latest is not None and latest[0] is task:
+                del CancellationService._latest[session_key]
+
+    @staticmethod
+    def stats() -> Dict:
+        return {**CancellationService._counters, "active_sessions": len(CancellationService._latest)}
@@ -0,0 +1,119 @@
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, CatalogService falls back to plain Python filtering
+    np = None
+
+def numpy_available() -> bool:
+    return np is not None
+
+def date_ordinal(value: str) -> int:
+    """'YYYY-MM-DD' -> proleptic ordinal, 0 when missing or malformed"""
+    if not value:
+        return 0
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return 0
+
+class CatalogIndex:
+    """Column-oriented view of one content type of the catalog mirror.
+
+    Each filter of the discover pipeline becomes a boolean mask over a numpy
+    column and ranking is a top-k `argpartition`, so a query never loops over
+    rows in Python:
+      genre_ids          -> uint64 bitmask (one bit per distinct genre id)
+      original_language  -> uint16 code of an interned language string
+      release/air date   -> int32 date ordinal
+      popularity, rating -> float32
+    """
+
+    def __init__(self, rows: List[list], content_type: str, column_names: Sequence[str]):
+        if np is None:
+            raise RuntimeError("numpy is required for CatalogIndex")
+
+        columns = {name: index for index, name in enumerate(column_names)}
+        date_column = columns['release_date' if content_type == 'movie' else 'last_air_date']
+        count = len(rows)
+
+        self.rows = rows
+        self.content_type = content_type
+        self.genre_bits: Dict[int, int] = {}
+        self.language_codes: Dict[str, int] = {}
+
+        self.ids = np.fromiter((row[columns['id']] for row in rows), dtype=np.int64, count=count)
+        self.popularity = np.fromiter((row[columns['popularity']] or 0 for row in rows), dtype=np.float32, count=count)
+        self.rating = np.fromiter((row[columns['vote_average']] or 0 for row in rows), dtype=np.float32, count=count)
+        self.vote_count = np.fromiter((row[columns['vote_count']] or 0 for row in rows), dtype=np.int32, count=count)
+        self.ott = np.fromiter((bool(row[columns['ott']]) for row in rows), dtype=np.bool_, count=count)
+        self.dates = np.fromiter((date_ordinal(row[date_column]) for row in rows), dtype=np.int32, count=count)
+        self.languages = np.fromiter(
+            (self._language_code(row[columns['original_language']]) for row in rows), dtype=np.uint16, count=count
+        )
+        self.genres = np.fromiter(
+            (self._genre_mask(row[columns['genre_ids']]) for row in rows), dtype=np.uint64, count=count
+        )
+
+    def _language_code(self, language: str) -> int:
+        return self.language_codes.setdefault(language or '', len(self.language_codes))
+
+    def _genre_mask(self, genre_ids: list) -> int:
+        mask = 0
+        for genre_id in genre_ids or ():
+            bit = self.genre_bits.get(genre_id)
+            if bit is None:
+                if len(self.genre_bits) >= 64:
+                    continue
+                bit = self.genre_bits[genre_id] = len(self.genre_bits)
+            mask |= 1 << bit
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def filter(self, language_code: str, genre_id: Union[int, List[int]], date_from: str, date_to: str,
+               min_votes: int = 0, ott_only: bool = False):
+        """Boolean mask of the rows matching a discover query (a list of genre ids matches any of them)"""
+        language = self.language_codes.get(language_code)
+        genre_mask = 0
+        for single_genre_id in (genre_id if isinstance(genre_id, list) else [genre_id]):
+            bit = self.genre_bits.get(single_genre_id)
+            if bit is not None:
+                genre_mask |= 1 << bit
+        if language is None or not genre_mask:
+            return np.zeros(len(self.rows), dtype=np.bool_)
+
+        mask = self.languages == language
+        mask &= (self.genres & np.uint64(genre_mask)) != 0
+        mask &= self.dates >= date_ordinal(date_from)
+        mask &= self.dates <= date_ordinal(date_to)
+        mask &= self.dates > 0
+        if min_votes:
+            mask &= self.vote_count >= min_votes
+        if ott_only:
+            mask &= self.ott
+        return mask
+
+    def top_k(self, mask, k: Optional[int] = None):
+        """Row indices of the matches, most popular first (ties: higher rating, more votes, lower id)"""
+        candidates = np.flatnonzero(mask)
+        if k is not None and k <= 0:
+            return candidates[:0]
+        if k is not None and k < len(candidates):
+            partition = np.argpartition(-self.popularity[candidates], k - 1)[:k]
+            candidates = candidates[partition]
+
+        order = np.lexsort((
+            self.ids[candidates],
+            -self.vote_count[candidates],
+            -self.rating[candidates],
+            -self.popularity[candidates]
+        ))
+        return candidates[order]
+
+    def query(self, language_code: str, genre_id: Union[int, List[int]], date_from: str, date_to: str,
+              min_votes: int = 0, ott_only: bool = False, limit: Optional[int] = None) -> List[list]:
+        mask = self.filter(language_code, genre_id, date_from, date_to, min_votes, ott_only)
+        return [self.rows[index] for index in self.top_k(mask, limit)]
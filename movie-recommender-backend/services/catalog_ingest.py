@@ -0,0 +1,264 @@
+import asyncio
+import gzip
+import heapq
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from services.http_client import HTTPClientManager
+from services.tmdb_service import TMDBService
+from services.streaming_service import StreamingService
+from services.catalog_service import CatalogService, CATALOG_COLUMNS
+from config.constants import CATALOG_CONFIG, LANGUAGE_MAP
+from utils.helpers import gather_bounded
+
+# (content_type, id) -> TMDB details with watch/providers appended, None when unknown
+DetailsFetcher = Callable[[str, int], Awaitable[Optional[Dict]]]
+
+class CatalogIngestor:
+    """Builds the local catalog mirror from TMDB daily ID exports plus paged discover sweeps"""
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def export_filename(content_type: str, day: datetime) -> str:
+        prefix = 'movie_ids' if content_type == 'movie' else 'tv_series_ids'
+        return f"{prefix}_{day.strftime('%m_%d_%Y')}.json.gz"
+
+    @staticmethod
+    def read_export_file(path: str, limit: int) -> List[Tuple[int, float]]:
+        """Parse a TMDB daily ID export (gzip'd JSON lines) into the `limit` most popular (id, popularity)"""
+        def entries() -> Iterable[Tuple[float, int]]:
+            opener = gzip.open if path.endswith('.gz') else open
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get('adult') or entry.get('video'):
+                        continue
+                    yield entry.get('popularity', 0) or 0, entry['id']
+
+        top = heapq.nlargest(limit, entries())
+        return [(content_id, popularity) for popularity, content_id in top]
+
+    @staticmethod
+    async def download_export(content_type: str, dest_dir: str) -> Optional[str]:
+        """Download the newest daily export (yesterday's, since today's may not be published yet)"""
+        client = HTTPClientManager.get_client('tmdb')
+        day = datetime.now(timezone.utc) - timedelta(days=1)
+        filename = CatalogIngestor.export_filename(content_type, day)
+        dest = os.path.join(dest_dir, filename)
+
+        if os.path.exists(dest):
+            return dest
+
+        try:
+            response = await client.get(f"{CATALOG_CONFIG['EXPORT_BASE_URL']}/{filename}")
+            if response.status_code != 200:
+                print(f"⚠️ Export {filename} returned status {response.status_code}")
+                return None
+            with open(dest, 'wb') as f:
+                f.write(response.content)
+            print(f"📥 Downloaded {filename} ({len(response.content)} bytes)")
+            return dest
+        except Exception as e:
+            print(f"⚠️ Could not download export {filename}: {e}")
+            return None
+
+    @staticmethod
+    def _row_from_result(result: Dict, content_type: str, ott: bool, last_air_date: str = '') -> list:
+        if content_type == 'movie':
+            title, date = result.get('title', ''), result.get('release_date', '')
+        else:
+            title, date = result.get('name', result.get('title', '')), result.get('first_air_date', '')
+
+        genre_ids = result.get('genre_ids')
+        if genre_ids is None:
+            genre_ids = [genre['id'] for genre in result.get('genres', [])]
+
+        record = {
+            "id": result['id'],
+            "title": title,
+            "poster_path": result.get('poster_path'),
+            "vote_average": result.get('vote_average', 0),
+            "vote_count": result.get('vote_count', 0),
+            "popularity": result.get('popularity', 0),
+            "original_language": result.get('original_language', ''),
+            "genre_ids": genre_ids,
+            "release_date": date or '',
+            "last_air_date": last_air_date or result.get('last_air_date', '') or '',
+            "overview": result.get('overview', ''),
+            "ott": ott
+        }
+        return [record[column] for column in CATALOG_COLUMNS]
+
+    @staticmethod
+    async def sweep_discover(content_type: str, language_code: str, pages: int) -> Dict[int, Dict]:
+        """Popular titles for one language, restricted to our OTT platforms when that mode is on"""
+        params = {
+            "with_original_language": language_code,
+            "sort_by": "popularity.desc",
+            **TMDBService._ott_discover_params()
+        }
+        page_results = await gather_bounded(
+            [lambda page=page: TMDBService.get_json(f"/discover/{content_type}", {**params, "page": page})
+             for page in range(1, pages + 1)],
+            CATALOG_CONFIG['CONCURRENCY']
+        )
+
+        results = {}
+        for data in page_results:
+            if isinstance(data, Exception) or data is None:
+                continue
+            for result in data.get('results', []):
+                results.setdefault(result['id'], result)
+        return results
+
+    @staticmethod
+    async def _fetch_details_rows(content_type: str, content_ids: List[int], languages: set,
+                                  known: Dict[int, Dict], fetch_details: DetailsFetcher) -> List[list]:
+        """Detail lookups (with watch/providers appended) for ids whose language or air dates we need"""
+        details_results = await gather_bounded(
+            [lambda content_id=content_id: fetch_details(content_type, content_id)
+             for content_id in content_ids],
+            CATALOG_CONFIG['CONCURRENCY']
+        )
+
+        # Titles from OTT-filtered sweeps are known to be streamable already
+        swept_ott = bool(TMDBService._ott_discover_params())
+
+        rows = []
+        for content_id, details in zip(content_ids, details_results):
+            if isinstance(details, Exception) or not details:
+                continue
+            if details.get('original_language') not in languages:
+                continue
+
+            providers = details.get('watch/providers') or {}
+            ott = (swept_ott and content_id in known) or bool(StreamingService.extract_streaming_platforms(providers))
+            rows.append(CatalogIngestor._row_from_result(
+                known.get(content_id, details), content_type, ott,
+                last_air_date=details.get('last_air_date', '')
+            ))
+        return rows
+
+    @staticmethod
+    async def build(languages: Optional[List[str]] = None, export_files: Optional[Dict[str, str]] = None,
+                    sweep_pages: Optional[int] = None, export_limit: Optional[int] = None,
+                    fetch_details: Optional[DetailsFetcher] = None) -> Dict:
+        """Build a catalog dict (does not save it).
+
+        `export_files` maps 'movie'/'tv' to local export files and `sweep_pages=0`
+        skips the live discover sweeps; with a `fetch_details` stand-in for
+        TMDBService.fetch_details (e.g. reading fixture details) the build runs
+        fully offline."""
+        fetch_details = fetch_details or TMDBService.fetch_details
+        languages = languages or list(LANGUAGE_MAP.values())
+        language_set = set(languages)
+        export_files = export_files or {}
+        sweep_pages = CATALOG_CONFIG['SWEEP_PAGES'] if sweep_pages is None else sweep_pages
+        export_limit = CATALOG_CONFIG['EXPORT_DETAIL_LIMIT'] if export_limit is None else export_limit
+        started = time.time()
+
+        catalog = {
+            "version": 1,
+            "built_at": time.time(),
+            "languages": languages,
+            "columns": list(CATALOG_COLUMNS),
+            "movie": [],
+            "tv": []
+        }
+
+        for content_type in ('movie', 'tv'):
+            swept: Dict[int, Dict] = {}
+            if sweep_pages:
+                sweeps = await asyncio.gather(
+                    *(CatalogIngestor.sweep_discover(content_type, language_code, sweep_pages) for language_code in languages),
+                    return_exceptions=True
+                )
+                for sweep in sweeps:
+                    if isinstance(sweep, Exception):
+                        print(f"⚠️ Discover sweep failed: {sweep}")
+                        continue
+                    for content_id, result in sweep.items():
+                        swept.setdefault(content_id, result)
+            print(f"📚 {content_type}: {len(swept)} titles from discover sweeps")
+
+            rows = []
+            if content_type == 'movie':
+                ott = bool(TMDBService._ott_discover_params())
+                rows.extend(CatalogIngestor._row_from_result(result, 'movie', ott) for result in swept.values())
+                detail_ids = []
+            else:
+                # TV needs last_air_date, which only the details endpoint has
+                detail_ids = list(swept.keys())
+
+            export_path = export_files.get(content_type)
+            if export_path and export_limit:
+                export_ids = [
+                    content_id for content_id, _ in CatalogIngestor.read_export_file(export_path, export_limit)
+                    if content_id not in swept
+                ]
+                print(f"📚 {content_type}: {len(export_ids)} popular export ids not covered by sweeps")
+                detail_ids.extend(export_ids)
+
+            if detail_ids:
+                rows.extend(await CatalogIngestor._fetch_details_rows(
+                    content_type, detail_ids, language_set, swept, fetch_details
+                ))
+
+            catalog[content_type] = rows
+
+        print(f"📚 Catalog build finished in {time.time() - started:.1f}s")
+        return catalog
+
+    @staticmethod
+    async def rebuild(download_exports: bool = True, **build_kwargs) -> Dict:
+        """Build and save the mirror, downloading today's exports unless files were given"""
+        if download_exports and 'export_files' not in build_kwargs:
+            dest_dir = os.path.dirname(CatalogService.catalog_path()) or "."
+            export_files = {}
+            for content_type in ('movie', 'tv'):
+                path = await CatalogIngestor.download_export(content_type, dest_dir)
+                if path:
+                    export_files[content_type] = path
+            build_kwargs['export_files'] = export_files
+
+        catalog = await CatalogIngestor.build(**build_kwargs)
+        CatalogService.save(catalog)
+        return catalog
+
+    @staticmethod
+    async def _refresh_loop():
+        while True:
+            try:
+                catalog = CatalogService.load()
+                if not CatalogService.is_fresh(catalog):
+                    print("📚 Catalog mirror missing or stale, rebuilding...")
+                    await CatalogIngestor.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Catalog refresh failed: {e}")
+            await asyncio.sleep(CATALOG_CONFIG['REFRESH_CHECK_INTERVAL'])
+
+    @staticmethod
+    def start_background_refresh():
+        if CATALOG_CONFIG['ENABLED'] and CATALOG_CONFIG['BACKGROUND_REFRESH'] and CatalogIngestor._refresh_task is None:
+            CatalogIngestor._refresh_task = asyncio.create_task(CatalogIngestor._refresh_loop())
+
+    @staticmethod
+    async def stop_background_refresh():
+        task = CatalogIngestor._refresh_task
+        CatalogIngestor._refresh_task = None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
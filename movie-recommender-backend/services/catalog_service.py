@@ -0,0 +1,163 @@
+import gzip
+import json
+import os
+import time
+from typing import Dict, List, Optional, Union
+from services.user_preference_service import UserPreferenceService
+from services.catalog_index import CatalogIndex, numpy_available
+from services.suggest_service import SuggestService
+from config.constants import CATALOG_CONFIG
+
+# Column order of the rows stored in the mirror file
+CATALOG_COLUMNS = (
+    "id", "title", "poster_path", "vote_average", "vote_count", "popularity",
+    "original_language", "genre_ids", "release_date", "last_air_date", "overview", "ott"
+)
+
+class CatalogService:
+    """Local mirror of the TMDB movie/TV catalog for our LANGUAGE_MAP languages.
+
+    The mirror is a gzip'd JSON file with one header object and a compact row
+    list per content type (see CATALOG_COLUMNS). It is built by
+    services/catalog_ingest.py and read here; TMDBService answers discover
+    requests from it while it is fresh enough.
+    """
+    _catalog: Optional[Dict] = None
+    _loaded_mtime: Optional[float] = None
+    _indexes: Dict[str, CatalogIndex] = {}
+
+    @staticmethod
+    def catalog_path() -> str:
+        if CATALOG_CONFIG['PATH']:
+            return CATALOG_CONFIG['PATH']
+        return os.path.join(UserPreferenceService.resolve_data_dir(), CATALOG_CONFIG['FILENAME'])
+
+    @staticmethod
+    def save(catalog: Dict, path: Optional[str] = None):
+        """Write atomically so readers never see a half-written mirror"""
+        path = path or CatalogService.catalog_path()
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(catalog, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp_path, path)
+        CatalogService._catalog = catalog
+        CatalogService._indexes = {}
+        CatalogService._loaded_mtime = os.path.getmtime(path)
+        SuggestService.add_catalog(catalog)
+        print(f"📚 Saved catalog mirror: {len(catalog['movie'])} movies, {len(catalog['tv'])} TV shows -> {path}")
+
+    @staticmethod
+    def load(path: Optional[str] = None) -> Optional[Dict]:
+        """Load the mirror from disk (re-reading only when the file changed)"""
+        path = path or CatalogService.catalog_path()
+        if not os.path.exists(path):
+            return None
+
+        mtime = os.path.getmtime(path)
+        if CatalogService._catalog is not None and CatalogService._loaded_mtime == mtime:
+            return CatalogService._catalog
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                catalog = json.load(f)
+            if tuple(catalog.get('columns', ())) != CATALOG_COLUMNS:
+                print("⚠️ Catalog mirror has an unexpected column layout, ignoring it")
+                return None
+        except Exception as e:
+            print(f"⚠️ Could not load catalog mirror: {e}")
+            return None
+
+        CatalogService._catalog = catalog
+        CatalogService._loaded_mtime = mtime
+        CatalogService._indexes = {}
+        SuggestService.add_catalog(catalog)
+        print(f"📚 Loaded catalog mirror: {len(catalog['movie'])} movies, {len(catalog['tv'])} TV shows")
+        return catalog
+
+    @staticmethod
+    def is_fresh(catalog: Optional[Dict]) -> bool:
+        if not catalog:
+            return False
+        return time.time() - catalog.get('built_at', 0) <= CATALOG_CONFIG['MAX_AGE_HOURS'] * 3600
+
+    @staticmethod
+    def get_fresh_catalog() -> Optional[Dict]:
+        if not CATALOG_CONFIG['ENABLED']:
+            return None
+        # load() re-reads the file only when it changed, so a mirror rebuilt by build_catalog.py is picked up
+        catalog = CatalogService.load()
+        return catalog if CatalogService.is_fresh(catalog) else None
+
+    @staticmethod
+    def row_to_result(row: list, content_type: str) -> Dict:
+        """Rebuild a TMDB-style discover result from a mirror row"""
+        record = dict(zip(CATALOG_COLUMNS, row))
+        date_field, title_field = ('release_date', 'title') if content_type == 'movie' else ('first_air_date', 'name')
+        return {
+            "id": record["id"],
+            title_field: record["title"],
+            "poster_path": record["poster_path"],
+            "vote_average": record["vote_average"],
+            "vote_count": record["vote_count"],
+            "popularity": record["popularity"],
+            "original_language": record["original_language"],
+            "genre_ids": record["genre_ids"],
+            date_field: record["release_date"],
+            "last_air_date": record["last_air_date"],
+            "overview": record["overview"]
+        }
+
+    @staticmethod
+    def get_index(catalog: Dict, content_type: str) -> Optional[CatalogIndex]:
+        """Columnar index over one content type, built once per loaded mirror (None without numpy)"""
+        if not numpy_available():
+            return None
+        index = CatalogService._indexes.get(content_type)
+        if index is None or index.rows is not catalog[content_type]:
+            index = CatalogIndex(catalog[content_type], content_type, CATALOG_COLUMNS)
+            CatalogService._indexes[content_type] = index
+        return index
+
+    @staticmethod
+    def query(content_type: str, language_code: str, genre_id: Union[int, List[int]], date_from: str, date_to: str,
+              min_votes: int = 0, ott_only: bool = False, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """Discover-style lookup against the mirror, most popular first (a list of genre ids matches any of them).
+
+        Movies are matched on release_date, TV shows on last_air_date. Returns
+        None when the mirror is missing, stale or does not cover the language,
+        so callers fall back to the live API."""
+        catalog = CatalogService.get_fresh_catalog()
+        if catalog is None or language_code not in catalog.get('languages', []):
+            return None
+
+        index = CatalogService.get_index(catalog, content_type)
+        if index is not None:
+            matches = index.query(language_code, genre_id, date_from, date_to, min_votes, ott_only, limit)
+        else:
+            matches = CatalogService._query_rows(
+                catalog[content_type], content_type, language_code, genre_id, date_from, date_to, min_votes, ott_only
+            )[:limit]
+
+        return [CatalogService.row_to_result(row, content_type) for row in matches]
+
+    @staticmethod
+    def _query_rows(rows: List[list], content_type: str, language_code: str, genre_id: Union[int, List[int]], date_from: str,
+                    date_to: str, min_votes: int, ott_only: bool) -> List[list]:
+        """Plain Python version of CatalogIndex.query, used when numpy is not installed"""
+        date_column = 'release_date' if content_type == 'movie' else 'last_air_date'
+        columns = {name: index for index, name in enumerate(CATALOG_COLUMNS)}
+        id_col, lang_col, genre_col = columns['id'], columns['original_language'], columns['genre_ids']
+        date_col, votes_col, ott_col = columns[date_column], columns['vote_count'], columns['ott']
+        popularity_col, rating_col = columns['popularity'], columns['vote_average']
+        genre_ids = genre_id if isinstance(genre_id, list) else [genre_id]
+
+        matches = [
+            row for row in rows
+            if row[lang_col] == language_code
+            and any(genre_id in row[genre_col] for genre_id in genre_ids)
+            and row[date_col] and date_from <= row[date_col] <= date_to
+            and row[votes_col] >= min_votes
+            and (row[ott_col] or not ott_only)
+        ]
+        matches.sort(key=lambda row: (-row[popularity_col], -row[rating_col], -row[votes_col], row[id_col]))
+        return matches
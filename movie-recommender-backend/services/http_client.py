@@ -0,0 +1,63 @@
+import httpx
+from typing import Dict
+from config.constants import HTTP_CLIENT_CONFIG
+
+class HTTPClientManager:
+    """Application-scoped httpx clients, one pooled client per upstream"""
+    _clients: Dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _http2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @classmethod
+    def _create_client(cls, upstream: str) -> httpx.AsyncClient:
+        """Build a pooled client using the per-upstream limits from HTTP_CLIENT_CONFIG"""
+        config = HTTP_CLIENT_CONFIG[upstream]
+
+        http2 = config['HTTP2']
+        if http2 and not cls._http2_available():
+            print(f"⚠️ HTTP/2 requested for {upstream} but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=config['MAX_CONNECTIONS'],
+            max_keepalive_connections=config['MAX_KEEPALIVE_CONNECTIONS'],
+            keepalive_expiry=config['KEEPALIVE_EXPIRY']
+        )
+
+        print(f"🔌 Opening {upstream} client pool (max {config['MAX_CONNECTIONS']} connections, http2={http2})")
+        return httpx.AsyncClient(timeout=config['TIMEOUT'], limits=limits, http2=http2)
+
+    @classmethod
+    async def startup(cls):
+        """Open a client for every configured upstream (called from the app lifespan)"""
+        for upstream in HTTP_CLIENT_CONFIG:
+            cls.get_client(upstream)
+
+    @classmethod
+    async def shutdown(cls):
+        """Close all pooled clients and release their connections"""
+        clients = list(cls._clients.items())
+        cls._clients.clear()
+
+        for upstream, client in clients:
+            try:
+                await client.aclose()
+                print(f"🔌 Closed {upstream} client pool")
+            except Exception as e:
+                print(f"⚠️ Error closing {upstream} client: {e}")
+
+    @classmethod
+    def get_client(cls, upstream: str) -> httpx.AsyncClient:
+        """Get the shared client for an upstream, creating it lazily if the lifespan hook has not run
+        (e.g. serverless cold starts or scripts importing the services directly)"""
+        client = cls._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = cls._create_client(upstream)
+            cls._clients[upstream] = client
+        return client
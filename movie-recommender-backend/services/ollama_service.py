@@ -1,40 +1,164 @@
 import httpx
 import json
 import re
+from typing import AsyncIterator, Optional
 from config.constants import OLLAMA_API_URL
+from services.http_client import HTTPClientManager
+
+class ChatStreamParser:
+    """Incremental reader for the chat JSON the model streams.
+
+    `feed(chunk)` returns the newly generated part of the "response" string,
+    already JSON-decoded, so it can be shown while the model is still writing;
+    `criteria` is set (normalized) as soon as the "search_criteria" object is
+    complete. Output that does not look like JSON is passed through as is.
+    """
+    _ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '"': '"', '\\': '\\', '/': '/'}
+
+    def __init__(self):
+        self.buffer = ''
+        self.criteria: Optional[dict] = None
+        self._response_pos: Optional[int] = None
+        self._response_done = False
+        self.raw = False
+
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk
+        if self.criteria is None:
+            self._read_criteria()
+
+        if self.raw:
+            return chunk
+        if '{' not in self.buffer and len(self.buffer.strip()) >= 40:
+            self.raw = True
+            return self.buffer
+        return self._read_response()
+
+    def _read_response(self) -> str:
+        if self._response_done:
+            return ''
+        if self._response_pos is None:
+            match = re.search(r'"response"\s*:\s*"', self.buffer)
+            if match is None:
+                return ''
+            self._response_pos = match.end()
+
+        text = []
+        buffer, pos = self.buffer, self._response_pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self._response_done = True
+                pos += 1
+                break
+            if char != '\\':
+                text.append(char)
+                pos += 1
+                continue
+
+            # Escape sequences may be split across chunks: wait for the rest
+            if pos + 1 >= len(buffer):
+                break
+            escape = buffer[pos + 1]
+            if escape == 'u':
+                if pos + 6 > len(buffer):
+                    break
+                try:
+                    code = int(buffer[pos + 2:pos + 6], 16)
+                except ValueError:
+                    pos += 6
+                    continue
+                length = 6
+                if 0xD800 <= code <= 0xDBFF:
+                    # High surrogate (emoji etc.): wait for the low half and combine the pair
+                    following = buffer[pos + 6:pos + 12]
+                    if len(following) < 6 and '\\u'.startswith(following[:2]):
+                        break
+                    if following.startswith('\\u'):
+                        try:
+                            low = int(following[2:], 16)
+                        except ValueError:
+                            low = 0
+                        if 0xDC00 <= low <= 0xDFFF:
+                            code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                            length = 12
+                # A lone surrogate cannot be encoded; show the replacement character instead
+                text.append('\ufffd' if 0xD800 <= code <= 0xDFFF else chr(code))
+                pos += length
+            else:
+                text.append(self._ESCAPES.get(escape, escape))
+                pos += 2
+
+        self._response_pos = pos
+        return ''.join(text)
+
+    def _read_criteria(self):
+        match = re.search(r'"search_criteria"\s*:\s*\{', self.buffer)
+        if match is None:
+            return
+
+        start = match.end() - 1
+        depth, in_string, escaped = 0, False, False
+        for pos in range(start, len(self.buffer)):
+            char = self.buffer[pos]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    try:
+                        search_criteria = json.loads(self.buffer[start:pos + 1])
+                    except json.JSONDecodeError:
+                        return
+                    normalized = OllamaService._normalize_ai_response({"search_criteria": search_criteria})
+                    self.criteria = normalized["search_criteria"]
+                    return
 
 class OllamaService:
+    @staticmethod
+    def _generate_payload(prompt: str, temperature: float, stream: bool) -> dict:
+        return {
+            "model": "llama3.1:latest",
+            "prompt": prompt,
+            "stream": stream,
+            "temperature": temperature,
+            "options": {
+                "num_predict": 300,
+                "top_p": 0.9,
+                "top_k": 40
+            }
+        }
+
     @staticmethod
     async def get_ai_response(prompt: str, temperature: float = 0.7) -> str:
         """Get response from Ollama LLM with optimized settings"""
         try:
             print(f"🔗 Connecting to Ollama at: {OLLAMA_API_URL}")
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(OLLAMA_API_URL, json={
-                    "model": "llama3.1:latest",
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": temperature,
-                    "options": {
-                        "num_predict": 300,
-                        "top_p": 0.9,
-                        "top_k": 40
-                    }
-                })
-                
-                print(f"📡 Ollama response status: {response.status_code}")
+            client = HTTPClientManager.get_client('ollama')
+            response = await client.post(OLLAMA_API_URL, json=OllamaService._generate_payload(prompt, temperature, False))
+            
+            print(f"📡 Ollama response status: {response.status_code}")
+            
+            if response.status_code == 200:
+                result = response.json()
+                ai_text = result.get("response", "")
+                print(f"✅ Ollama response received: {len(ai_text)} characters")
+                return ai_text
+            else:
+                print(f"❌ Ollama error status: {response.status_code}")
+                print(f"❌ Ollama error body: {response.text}")
+                return ""
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_text = result.get("response", "")
-                    print(f"✅ Ollama response received: {len(ai_text)} characters")
-                    return ai_text
-                else:
-                    print(f"❌ Ollama error status: {response.status_code}")
-                    print(f"❌ Ollama error body: {response.text}")
-                    return ""
-                    
         except httpx.ConnectError as e:
             print(f"❌ Cannot connect to Ollama: {e}")
             return ""
@@ -45,6 +169,42 @@ class OllamaService:
             print(f"❌ Error calling Ollama: {e}")
             return ""
     
+    @staticmethod
+    async def stream_ai_response(prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        """Yield generated text chunks as Ollama produces them (stream mode, one JSON object per line).
+
+        Errors end the stream early, like get_ai_response returning "". Closing
+        the iterator closes the upstream request, which stops the generation."""
+        try:
+            print(f"🔗 Streaming from Ollama at: {OLLAMA_API_URL}")
+            
+            client = HTTPClientManager.get_client('ollama')
+            async with client.stream(
+                "POST", OLLAMA_API_URL, json=OllamaService._generate_payload(prompt, temperature, True)
+            ) as response:
+                if response.status_code != 200:
+                    print(f"❌ Ollama error status: {response.status_code}")
+                    return
+                
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+                
+        except httpx.ConnectError as e:
+            print(f"❌ Cannot connect to Ollama: {e}")
+        except httpx.TimeoutException as e:
+            print(f"⏱️ Ollama request timed out: {e}")
+        except httpx.HTTPError as e:
+            print(f"❌ Error streaming from Ollama: {e}")
+    
     @staticmethod
     def parse_json_response(ai_text: str, fallback_data: dict) -> dict:
         """Parse JSON from AI response with fallback and data normalization"""
@@ -0,0 +1,182 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from services.cache_service import CacheEntry
+
+class PersistentCache:
+    """Single-file SQLite tier behind the in-memory ResponseCache.
+
+    Entries keep their expiry timestamps so a restarted process (or a fresh
+    serverless instance) can serve them with the same fresh/stale/error
+    semantics. The row count is capped; the least recently used rows go first.
+
+    Nothing here commits on the event loop: writes and last-access updates
+    are queued and applied in batches by a writer thread (every
+    `flush_interval` seconds, or sooner once `batch_size` writes are queued)
+    on its own connection, while lookups only read (WAL lets reads run
+    alongside the writer). Queued entries are visible to `get` right away.
+    """
+
+    def __init__(self, path: str, max_entries: int, evict_every: int = 100,
+                 flush_interval: float = 1.0, batch_size: int = 200):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._writes_since_evict = 0
+        self._pending: Dict[str, CacheEntry] = {}
+        self._flushing: Dict[str, CacheEntry] = {}
+        self._touched: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._writer_conn = self._connect()
+        self._writer_conn.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_cache (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                stale_until REAL NOT NULL,
+                keep_until REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._writer_conn.execute("CREATE INDEX IF NOT EXISTS idx_tmdb_cache_last_access ON tmdb_cache(last_access)")
+        self._writer_conn.execute("CREATE INDEX IF NOT EXISTS idx_tmdb_cache_keep_until ON tmdb_cache(keep_until)")
+        self._writer_conn.commit()
+        # Reads happen on the caller's thread, on a separate connection
+        self._conn = self._connect()
+
+        self._writer = threading.Thread(target=self._run_writer, name="tmdb-cache-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _row_to_entry(row) -> CacheEntry:
+        endpoint, value, expires_at, stale_until, keep_until = row
+        return CacheEntry(json.loads(value), expires_at, stale_until, keep_until, endpoint)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Lazy read-through; the access time is recorded for the next batch instead of committed here"""
+        now = time.time()
+        with self._pending_lock:
+            entry = self._pending.get(key) or self._flushing.get(key)
+            if entry is not None:
+                return entry if entry.keep_until >= now else None
+
+        row = self._conn.execute(
+            "SELECT endpoint, value, expires_at, stale_until, keep_until FROM tmdb_cache WHERE key = ?",
+            (key,)
+        ).fetchone()
+        # Rows past their error window are left for the next eviction pass
+        if row is None or row[4] < now:
+            return None
+
+        with self._pending_lock:
+            self._touched[key] = now
+        return self._row_to_entry(row)
+
+    def put_many(self, items: List[Tuple[str, CacheEntry]]):
+        """Queue entries for the writer thread"""
+        if not items:
+            return
+        with self._pending_lock:
+            self._pending.update(items)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def put(self, key: str, entry: CacheEntry):
+        self.put_many([(key, entry)])
+
+    def _run_writer(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write queued entries and access times in one transaction (writer thread, or close)"""
+        with self._pending_lock:
+            self._flushing, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+            flushing = self._flushing
+        if not flushing and not touched:
+            return
+
+        try:
+            now = time.time()
+            rows = [
+                (key, entry.endpoint, json.dumps(entry.value, separators=(",", ":")),
+                 entry.expires_at, entry.stale_until, entry.keep_until, now)
+                for key, entry in flushing.items()
+            ]
+            self._writer_conn.executemany(
+                "INSERT OR REPLACE INTO tmdb_cache "
+                "(key, endpoint, value, expires_at, stale_until, keep_until, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._writer_conn.executemany(
+                "UPDATE tmdb_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items() if key not in flushing]
+            )
+            self._writes_since_evict += len(rows)
+            if self._writes_since_evict >= self.evict_every:
+                self._evict()
+            self._writer_conn.commit()
+        except Exception as e:
+            print(f"⚠️ Persistent cache write failed: {e}")
+        finally:
+            with self._pending_lock:
+                self._flushing = {}
+
+    def _evict(self):
+        """Drop expired rows, then the least recently used ones above the cap"""
+        self._writes_since_evict = 0
+        self._writer_conn.execute("DELETE FROM tmdb_cache WHERE keep_until < ?", (time.time(),))
+        count = self._writer_conn.execute("SELECT COUNT(*) FROM tmdb_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._writer_conn.execute(
+                "DELETE FROM tmdb_cache WHERE key IN "
+                "(SELECT key FROM tmdb_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+            print(f"🗑️ Evicted {overflow} entries from persistent TMDB cache")
+
+    def load_hot(self, limit: int) -> List[Tuple[str, CacheEntry]]:
+        """Most recently used, still-servable rows, oldest first (so LRU order is preserved on insert)"""
+        rows = self._conn.execute(
+            "SELECT key, endpoint, value, expires_at, stale_until, keep_until FROM tmdb_cache "
+            "WHERE keep_until >= ? ORDER BY last_access DESC LIMIT ?",
+            (time.time(), limit)
+        ).fetchall()
+
+        return [(row[0], self._row_to_entry(row[1:])) for row in reversed(rows)]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tmdb_cache").fetchone()[0]
+
+    def close(self):
+        """Stop the writer, then write what is still queued"""
+        self._stopping.set()
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        self._evict()
+        self._writer_conn.commit()
+        self._writer_conn.close()
+        self._conn.close()
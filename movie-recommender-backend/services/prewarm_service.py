@@ -0,0 +1,170 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from services.tmdb_service import TMDBService, PrewarmBudget
+from config.constants import PREWARM_CONFIG, CACHE_CONFIG
+
+# (language codes, content type, genres, release period)
+DiscoverKey = Tuple[Tuple[str, ...], str, Tuple[str, ...], str]
+
+class KeyStats:
+    __slots__ = ("score", "updated_at", "limit", "last_prewarmed")
+
+    def __init__(self, now: float):
+        self.score = 0.0
+        self.updated_at = now
+        self.limit: Optional[int] = 0
+        self.last_prewarmed: Optional[float] = None
+
+class PrewarmService:
+    """Keeps the upstream cache warm for the most requested discover filters.
+
+    Every get_content_with_date_filtering call bumps an exponentially decaying
+    request counter for its filter tuple (half-life PREWARM_CONFIG['HALF_LIFE']).
+    A background loop re-runs the top keys every INTERVAL seconds under a
+    PrewarmBudget: cached TMDB entries expiring within REFRESH_AHEAD seconds are
+    refreshed early, entries that are still fresh cost nothing, and the cycle
+    stops once UPSTREAM_BUDGET requests were spent. SEED_KEYS are always kept warm.
+    """
+    _keys: Dict[DiscoverKey, KeyStats] = {}
+    _seeds: List[DiscoverKey] = []
+    _task: Optional[asyncio.Task] = None
+    _counters = {"recorded": 0, "cycles": 0, "runs": 0, "failures": 0, "budget_exhausted": 0, "upstream_requests": 0}
+
+    @staticmethod
+    def make_key(language_code: Union[str, Sequence[str]], content_type: str,
+                 genre: Union[str, Sequence[str]], release_period: str) -> DiscoverKey:
+        language_codes = (language_code,) if isinstance(language_code, str) else tuple(language_code)
+        genres = (genre,) if isinstance(genre, str) else tuple(genre)
+        return language_codes, content_type, genres, release_period
+
+    @staticmethod
+    def _decayed(stats: KeyStats, now: float) -> float:
+        return stats.score * 0.5 ** ((now - stats.updated_at) / PREWARM_CONFIG['HALF_LIFE'])
+
+    @staticmethod
+    def record(language_code: Union[str, Sequence[str]], content_type: str, genre: Union[str, Sequence[str]],
+               release_period: str, limit: Optional[int] = None):
+        """Count one request for a discover key (prewarm runs themselves are not counted)"""
+        if not PREWARM_CONFIG['ENABLED'] or TMDBService.prewarm_budget.get() is not None:
+            return
+
+        now = time.time()
+        key = PrewarmService.make_key(language_code, content_type, genre, release_period)
+        stats = PrewarmService._keys.get(key)
+        if stats is None:
+            stats = PrewarmService._keys[key] = KeyStats(now)
+        stats.score = PrewarmService._decayed(stats, now) + 1
+        stats.updated_at = now
+
+        # Prewarm with the widest limit any caller asked for (None = no early exit)
+        if limit is None or stats.limit is None:
+            stats.limit = None
+        else:
+            stats.limit = max(stats.limit, limit)
+        PrewarmService._counters["recorded"] += 1
+
+        if len(PrewarmService._keys) > PREWARM_CONFIG['MAX_KEYS']:
+            coldest = min(PrewarmService._keys, key=lambda k: PrewarmService._decayed(PrewarmService._keys[k], now))
+            del PrewarmService._keys[coldest]
+
+    @staticmethod
+    def hot_keys(now: Optional[float] = None) -> List[Tuple[DiscoverKey, float]]:
+        """Keys to prewarm with their decayed scores, hottest first (seed keys always included)"""
+        now = now or time.time()
+        scores = {
+            key: PrewarmService._decayed(stats, now)
+            for key, stats in PrewarmService._keys.items()
+        }
+        hot = sorted(
+            ((key, score) for key, score in scores.items() if score >= PREWARM_CONFIG['MIN_SCORE']),
+            key=lambda entry: entry[1], reverse=True
+        )[:PREWARM_CONFIG['TOP_N']]
+
+        hot_set = {key for key, _ in hot}
+        hot.extend((key, scores.get(key, 0.0)) for key in PrewarmService._seeds if key not in hot_set)
+        return hot
+
+    @staticmethod
+    async def run_cycle() -> Dict:
+        """Re-run the hot keys once within the upstream budget"""
+        # Imported here: routes.discovery records its requests into this service
+        from routes.discovery import get_content_with_date_filtering
+
+        budget = PrewarmBudget(PREWARM_CONFIG['REFRESH_AHEAD'], PREWARM_CONFIG['UPSTREAM_BUDGET'])
+        token = TMDBService.prewarm_budget.set(budget)
+        runs = 0
+        try:
+            for key, _ in PrewarmService.hot_keys():
+                if budget.remaining <= 0:
+                    PrewarmService._counters["budget_exhausted"] += 1
+                    break
+                language_codes, content_type, genres, release_period = key
+                stats = PrewarmService._keys.get(key)
+                try:
+                    await get_content_with_date_filtering(
+                        list(language_codes), content_type, list(genres), release_period,
+                        limit=stats.limit if stats else None
+                    )
+                    runs += 1
+                    if stats:
+                        stats.last_prewarmed = time.time()
+                except Exception as e:
+                    PrewarmService._counters["failures"] += 1
+                    print(f"⚠️ Prewarm failed for {key}: {e}")
+        finally:
+            TMDBService.prewarm_budget.reset(token)
+
+        PrewarmService._counters["cycles"] += 1
+        PrewarmService._counters["runs"] += runs
+        PrewarmService._counters["upstream_requests"] += budget.used
+        if budget.used:
+            print(f"🔥 Prewarmed {runs} discover keys with {budget.used} upstream requests")
+        return {"runs": runs, "upstream_requests": budget.used}
+
+    @staticmethod
+    async def _loop():
+        while True:
+            await asyncio.sleep(PREWARM_CONFIG['INTERVAL'])
+            try:
+                await PrewarmService.run_cycle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Prewarm cycle failed: {e}")
+
+    @staticmethod
+    def start():
+        if not (PREWARM_CONFIG['ENABLED'] and CACHE_CONFIG['ENABLED']) or PrewarmService._task is not None:
+            return
+        PrewarmService._seeds = [PrewarmService.make_key(*seed) for seed in PREWARM_CONFIG['SEED_KEYS']]
+        PrewarmService._task = asyncio.create_task(PrewarmService._loop())
+
+    @staticmethod
+    async def stop():
+        task = PrewarmService._task
+        PrewarmService._task = None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    def stats() -> Dict:
+        now = time.time()
+        return {
+            **PrewarmService._counters,
+            "tracked_keys": len(PrewarmService._keys),
+            "hot_keys": [
+                {
+                    "language_codes": list(key[0]),
+                    "content_type": key[1],
+                    "genres": list(key[2]),
+                    "release_period": key[3],
+                    "score": round(score, 2)
+                }
+                for key, score in PrewarmService.hot_keys(now)
+            ]
+        }
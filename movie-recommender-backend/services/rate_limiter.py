@@ -0,0 +1,132 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+class AdaptiveRateLimiter:
+    """Process-wide token bucket with AIMD-style adaptive concurrency.
+
+    Requests need a token (steady `rate` per second, bursts up to `burst`) and a
+    concurrency slot. Successful responses grow the concurrency limit additively;
+    throttling (429) or timeouts shrink it multiplicatively. A Retry-After from the
+    upstream pauses all new requests until it has passed. Cancelled requests
+    (the caller stopped waiting) only give their slot back.
+    """
+
+    def __init__(self, rate: float, burst: int, min_concurrency: int, max_concurrency: int,
+                 initial_concurrency: int, increase_step: float, decrease_factor: float):
+        self.rate = rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+
+        self.concurrency_limit = float(initial_concurrency)
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._counters = {
+            "requests": 0,
+            "throttled": 0,
+            "retried": 0,
+            "failed": 0
+        }
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    async def acquire(self):
+        condition = self._get_condition()
+
+        async with condition:
+            while self._in_flight >= int(self.concurrency_limit):
+                await condition.wait()
+            self._in_flight += 1
+
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._counters["requests"] += 1
+                    return
+
+                wait_for_token = (1 - self._tokens) / self.rate if self._tokens < 1 else 0
+                await asyncio.sleep(max(wait_for_token, self._blocked_until - now, 0.001))
+        except BaseException:
+            await self._release_slot()
+            raise
+
+    async def _release_slot(self):
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+    async def release(self, outcome: str, retry_after: Optional[float] = None):
+        """outcome is 'success', 'throttled', 'error' or 'cancelled' (no signal about the upstream)"""
+        if outcome == "cancelled":
+            pass
+        elif outcome == "success":
+            # Additive increase, spread over roughly one window of requests
+            self.concurrency_limit = min(
+                self.max_concurrency,
+                self.concurrency_limit + self.increase_step / max(self.concurrency_limit, 1)
+            )
+        else:
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+            if outcome == "throttled":
+                self._counters["throttled"] += 1
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+        await self._release_slot()
+
+    def record_retry(self):
+        self._counters["retried"] += 1
+
+    def record_failure(self):
+        self._counters["failed"] += 1
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either delay-seconds or an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def backoff_delay(attempt: int, base: float, cap: float) -> float:
+        """Exponential backoff with equal jitter"""
+        delay = min(cap, base * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def stats(self) -> Dict:
+        return {
+            **self._counters,
+            "concurrency_limit": round(self.concurrency_limit, 2),
+            "in_flight": self._in_flight,
+            "tokens": round(self._tokens, 2),
+            "paused_for": round(max(0.0, self._blocked_until - time.monotonic()), 2)
+        }
@@ -6,9 +6,16 @@ from datetime import datetime, timedelta
 from services.user_preference_service import UserPreferenceService
 from services.tmdb_service import TMDBService
 from routes.discovery import get_content_with_date_filtering
-from config.constants import LANGUAGE_MAP
+from config.constants import LANGUAGE_MAP, MOVIE_GENRE_MAP, TV_GENRE_MAP
 import asyncio
 
+# Reverse genre lookup so TMDB genre_ids can be matched against preferred genre names
+GENRE_NAMES_BY_ID = defaultdict(list)
+for _genre_map in (MOVIE_GENRE_MAP, TV_GENRE_MAP):
+    for _name, _genre_id in _genre_map.items():
+        if _name not in GENRE_NAMES_BY_ID[_genre_id]:
+            GENRE_NAMES_BY_ID[_genre_id].append(_name)
+
 class RecommendationEngine:
     def __init__(self):
         self.user_service = UserPreferenceService()
@@ -138,30 +145,34 @@ class RecommendationEngine:
             preferred_genres = context["profile"].get("preferred_genres", [])[:3]
             preferred_languages = context["profile"].get("preferred_languages", [])[:2]
             
-            recommendations = []
+            if not preferred_genres or not preferred_languages:
+                return []
+            
+            # One merged discover run covers every genre/language combination
+            language_codes = [LANGUAGE_MAP.get(language, 'en') for language in preferred_languages]
+            content = await get_content_with_date_filtering(
+                language_codes, "both", preferred_genres, "2years"
+            )
             
-            # Get content based on user's preferred genres and languages
-            for genre in preferred_genres:
-                for language in preferred_languages:
-                    language_code = LANGUAGE_MAP.get(language, 'en')
-                    
-                    # Get content for this genre/language combination
-                    genre_content = await get_content_with_date_filtering(
-                        language_code, "both", genre, "2years"
-                    )
-                    
-                    # Filter out already seen content
-                    seen_content_ids = [item["content_id"] for item in recent_liked]
-                    unseen_content = [
-                        item for item in genre_content 
-                        if item["id"] not in seen_content_ids
-                    ]
-                    
-                    # Add recommendation reason
-                    for item in unseen_content[:3]:  # Top 3 per genre/language
-                        item["recommendation_reason"] = f"You like {genre} content in {language}"
-                        item["content_score"] = item.get("rating", 0) * item.get("popularity", 1)
-                        recommendations.append(item)
+            # Filter out already seen content
+            seen_content_ids = {item["content_id"] for item in recent_liked}
+            
+            # Top 3 per genre/language combination, attributed to the first one each item matched
+            recommendations = []
+            per_combination: Dict[tuple, int] = {}
+            for item in content:
+                if item["id"] in seen_content_ids:
+                    continue
+                matched = item.get("matched") or {}
+                genre = (matched.get("genres") or preferred_genres)[0]
+                language = (matched.get("languages") or preferred_languages)[0]
+                if per_combination.get((genre, language), 0) >= 3:
+                    continue
+                per_combination[(genre, language)] = per_combination.get((genre, language), 0) + 1
+                
+                item["recommendation_reason"] = f"You like {genre} content in {language}"
+                item["content_score"] = item.get("rating", 0) * item.get("popularity", 1)
+                recommendations.append(item)
             
             # Sort by content score and return top results
             recommendations.sort(key=lambda x: x.get("content_score", 0), reverse=True)
@@ -208,8 +219,10 @@ class RecommendationEngine:
         """Calculate how well content matches user preferences"""
         score = content.get("rating", 0)  # Base score from TMDB rating
         
-        # Boost for preferred genres
+        # Boost for preferred genres (TMDB items carry genre_ids, stored interactions carry names)
         content_genres = [g.lower() for g in content.get("genres", [])]
+        for genre_id in content.get("genre_ids", []):
+            content_genres.extend(GENRE_NAMES_BY_ID.get(genre_id, ()))
         preferred_genres = [g.lower() for g in context["profile"].get("preferred_genres", [])]
         
         genre_matches = len(set(content_genres) & set(preferred_genres))
@@ -0,0 +1,192 @@
+import asyncio
+import base64
+import secrets
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from services.streaming_service import StreamingService
+from config.constants import RESULT_SET_CONFIG
+
+class ResultSet:
+    """One ranked result list behind a cursor.
+
+    `items` are confirmed OTT-available and frozen in display order (pages
+    already served never change); `pending` are candidates whose provider
+    check was skipped by the early-exit pipeline, in priority order. They are
+    confirmed on demand and appended, ranked among themselves, with `sort`.
+    """
+    __slots__ = ("id", "items", "pending", "sort", "meta", "expires_at", "lock", "prefetch_task")
+
+    def __init__(self, set_id: str, items: list, pending: list, sort: Callable[[list], None], meta: Dict):
+        self.id = set_id
+        self.items = items
+        self.pending = pending
+        self.sort = sort
+        self.meta = meta
+        self.expires_at = time.time() + RESULT_SET_CONFIG['TTL']
+        self.lock = asyncio.Lock()
+        self.prefetch_task: Optional[asyncio.Task] = None
+
+    def size(self) -> int:
+        return len(self.items) + len(self.pending)
+
+class ResultSetService:
+    """Short-lived, LRU-capped store of result sets for cursor pagination.
+
+    Cursors are opaque (base64 of set id + offset). Memory is bounded by
+    RESULT_SET_CONFIG['MAX_SETS'] and by the number of items held across all
+    sets; the least recently used sets are evicted first.
+    """
+    _sets: "OrderedDict[str, ResultSet]" = OrderedDict()
+    _item_count = 0
+    _counters = {"created": 0, "pages_served": 0, "expired": 0, "evicted": 0, "prefetches": 0}
+
+    @staticmethod
+    def encode_cursor(set_id: str, offset: int) -> str:
+        return base64.urlsafe_b64encode(f"{set_id}:{offset}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        """Raises ValueError for anything that is not one of our cursors"""
+        padded = cursor + "=" * (-len(cursor) % 4)
+        set_id, offset = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        return set_id, int(offset)
+
+    @staticmethod
+    def create(items: list, pending: list, sort: Callable[[list], None], meta: Optional[Dict] = None) -> ResultSet:
+        """Store a new result set (`items` must already be sorted for display)"""
+        result_set = ResultSet(secrets.token_urlsafe(9), items, pending, sort, meta or {})
+        ResultSetService._sets[result_set.id] = result_set
+        ResultSetService._item_count += result_set.size()
+        ResultSetService._counters["created"] += 1
+        ResultSetService._evict()
+        return result_set
+
+    @staticmethod
+    def get(set_id: str) -> Optional[ResultSet]:
+        result_set = ResultSetService._sets.get(set_id)
+        if result_set is None:
+            return None
+        if time.time() > result_set.expires_at:
+            ResultSetService._remove(set_id)
+            ResultSetService._counters["expired"] += 1
+            return None
+        result_set.expires_at = time.time() + RESULT_SET_CONFIG['TTL']
+        ResultSetService._sets.move_to_end(set_id)
+        return result_set
+
+    @staticmethod
+    def _remove(set_id: str):
+        result_set = ResultSetService._sets.pop(set_id, None)
+        if result_set is None:
+            return
+        ResultSetService._item_count -= result_set.size()
+        if result_set.prefetch_task and not result_set.prefetch_task.done():
+            result_set.prefetch_task.cancel()
+
+    @staticmethod
+    def _evict():
+        now = time.time()
+        for set_id in [set_id for set_id, result_set in ResultSetService._sets.items() if now > result_set.expires_at]:
+            ResultSetService._remove(set_id)
+            ResultSetService._counters["expired"] += 1
+
+        # Always keep the most recent set, even if it alone is over the item budget
+        while len(ResultSetService._sets) > 1 and (
+            len(ResultSetService._sets) > RESULT_SET_CONFIG['MAX_SETS']
+            or ResultSetService._item_count > RESULT_SET_CONFIG['MAX_ITEMS']
+        ):
+            ResultSetService._remove(next(iter(ResultSetService._sets)))
+            ResultSetService._counters["evicted"] += 1
+
+    @staticmethod
+    async def _confirm_pending(result_set: ResultSet, upto: int):
+        """Run provider checks on pending candidates until `upto` items are confirmed (or none are left)"""
+        async with result_set.lock:
+            needed = upto - len(result_set.items)
+            while needed > 0 and result_set.pending:
+                size_before = result_set.size()
+                batch, result_set.pending = result_set.pending[:needed * 2], result_set.pending[needed * 2:]
+                confirmed, leftover = [], []
+                for content_type in ('movie', 'tv'):
+                    candidates = [item for item in batch if item['content_type'] == content_type]
+                    if len(confirmed) >= needed:
+                        leftover.extend(candidates)
+                        continue
+                    confirmed.extend(await StreamingService.get_streaming_providers_batch(
+                        candidates, content_type, needed=needed - len(confirmed), leftover=leftover
+                    ))
+
+                # Unchecked candidates go back to the front of the queue
+                result_set.pending = leftover + result_set.pending
+                result_set.sort(confirmed)
+                result_set.items.extend(confirmed)
+                if result_set.id in ResultSetService._sets:
+                    ResultSetService._item_count += result_set.size() - size_before
+                needed -= len(confirmed)
+
+    @staticmethod
+    def _prefetch(result_set: ResultSet, upto: int):
+        """Confirm candidates for the next page in the background"""
+        if not RESULT_SET_CONFIG['PREFETCH'] or not result_set.pending or len(result_set.items) >= upto:
+            return
+        if result_set.prefetch_task and not result_set.prefetch_task.done():
+            return
+
+        async def prefetch():
+            try:
+                await ResultSetService._confirm_pending(result_set, upto)
+                ResultSetService._counters["prefetches"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Result set prefetch failed: {e}")
+
+        result_set.prefetch_task = asyncio.create_task(prefetch())
+
+    @staticmethod
+    async def page(result_set: ResultSet, offset: int, page_size: int) -> Dict:
+        """Items [offset, offset + page_size) plus the cursor for the next page (None at the end).
+
+        Pending candidates are confirmed first when the page reaches past the
+        confirmed items, and the page after this one is prefetched."""
+        end = offset + page_size
+        if end > len(result_set.items) and result_set.pending:
+            await ResultSetService._confirm_pending(result_set, end)
+
+        items: List = result_set.items[offset:end]
+        has_more = end < len(result_set.items) or bool(result_set.pending)
+        ResultSetService._counters["pages_served"] += 1
+        ResultSetService._prefetch(result_set, end + page_size)
+
+        return {
+            "content": items,
+            "next_cursor": ResultSetService.encode_cursor(result_set.id, end) if has_more else None,
+            "confirmed": len(result_set.items),
+            "pending": len(result_set.pending)
+        }
+
+    @staticmethod
+    async def page_from_cursor(cursor: str, page_size: int) -> Optional[Dict]:
+        """The page a cursor points at, with the set's stored `meta`; None if the cursor is invalid or expired"""
+        try:
+            set_id, offset = ResultSetService.decode_cursor(cursor)
+        except ValueError:
+            return None
+
+        result_set = ResultSetService.get(set_id)
+        if result_set is None or offset < 0:
+            return None
+
+        page = await ResultSetService.page(result_set, offset, page_size)
+        return {**page, "meta": result_set.meta}
+
+    @staticmethod
+    def stats() -> Dict:
+        return {
+            **ResultSetService._counters,
+            "sets": len(ResultSetService._sets),
+            "items": ResultSetService._item_count,
+            "max_sets": RESULT_SET_CONFIG['MAX_SETS'],
+            "max_items": RESULT_SET_CONFIG['MAX_ITEMS']
+        }
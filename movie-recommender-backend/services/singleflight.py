@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one in-flight task.
+
+    The first caller for a key starts the call as its own task; everyone else
+    awaits the same task. Waiters are shielded, so one cancelled waiter does not
+    cancel the shared call for the rest, and a failure is raised to every waiter.
+    Once every waiter has been cancelled (e.g. all their clients went away) the
+    shared call is cancelled too.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self._counters = {
+            "calls": 0,
+            "coalesced": 0,
+            "abandoned": 0
+        }
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._on_done(key, done))
+            self._counters["calls"] += 1
+        else:
+            self._counters["coalesced"] += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._inflight.get(key) is task and not task.done():
+                self._waiters[key] -= 1
+                if self._waiters[key] <= 0:
+                    # Nobody is left to use the result
+                    del self._inflight[key]
+                    del self._waiters[key]
+                    self._counters["abandoned"] += 1
+                    task.cancel()
+            raise
+        else:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def stats(self) -> Dict:
+        return {
+            **self._counters,
+            "in_flight": len(self._inflight)
+        }
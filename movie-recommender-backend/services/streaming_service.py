@@ -1,83 +1,148 @@
-import httpx
 import asyncio
-from config.constants import TMDB_API_KEY, TMDB_API_URL, INDIAN_OTT_PLATFORMS, API_CONFIG
+from typing import Callable, Optional
+from services.tmdb_service import TMDBService
+from models.content_record import ContentRecord
+from config.constants import INDIAN_OTT_PLATFORMS, API_CONFIG, OTT_DISCOVER_CONFIG
+from utils.helpers import gather_bounded
 
 class StreamingService:
+    _warm_tasks = set()
+
+    @staticmethod
+    def extract_streaming_platforms(data: dict, region: str = 'IN') -> list:
+        """Turn a TMDB /watch/providers payload into our platform list for one region"""
+        providers_data = data.get('results', {})
+        region_providers = providers_data.get(region, {})
+
+        streaming_platforms = []
+
+        # Check flatrate (streaming subscription) providers
+        if 'flatrate' in region_providers:
+            for provider in region_providers['flatrate']:
+                provider_id = provider['provider_id']
+                provider_name = provider['provider_name']
+
+                if provider_id in INDIAN_OTT_PLATFORMS:
+                    ott_info = INDIAN_OTT_PLATFORMS[provider_id]
+                    streaming_platforms.append({
+                        "name": ott_info["name"],
+                        "logo": provider.get('logo_path', ''),
+                        "color": ott_info["color"]
+                    })
+                else:
+                    streaming_platforms.append({
+                        "name": provider_name,
+                        "logo": provider.get('logo_path', ''),
+                        "color": "#6B7280"
+                    })
+
+        # Include rent options as well for more content
+        if 'rent' in region_providers:
+            for provider in region_providers['rent']:
+                streaming_platforms.append({
+                    "name": f"{provider['provider_name']} (Rent)",
+                    "logo": provider.get('logo_path', ''),
+                    "color": "#F59E0B"
+                })
+
+        return streaming_platforms
+
     @staticmethod
-    async def get_streaming_providers_batch(content_items: list, api_content_type: str):
-        """Get streaming providers for multiple items in parallel"""
+    def _with_streaming(content_item: ContentRecord, streaming_platforms: list) -> ContentRecord:
+        """Attach the platform list in place (items are built per request, so no copy is needed)"""
+        content_item["streaming"] = {
+            "available_on": streaming_platforms[:API_CONFIG['MAX_STREAMING_PLATFORMS']],
+            "rent": [],
+            "buy": []
+        }
+        return content_item
+
+    @staticmethod
+    def _warm_providers(endpoints: list):
+        """Fetch provider payloads into the cache in the background"""
+        if not endpoints:
+            return
+
+        async def warm():
+            await gather_bounded(
+                [lambda endpoint=endpoint: TMDBService.get_json(endpoint) for endpoint in endpoints],
+                API_CONFIG['TV_DETAILS_CONCURRENCY']
+            )
+
+        task = asyncio.create_task(warm())
+        StreamingService._warm_tasks.add(task)
+        task.add_done_callback(StreamingService._warm_tasks.discard)
+
+    @staticmethod
+    async def get_streaming_providers_batch(content_items: list, api_content_type: str,
+                                            region: str = OTT_DISCOVER_CONFIG['WATCH_REGION'],
+                                            needed: Optional[int] = None, stats: Optional[dict] = None,
+                                            on_confirmed: Optional[Callable[[ContentRecord], None]] = None,
+                                            leftover: Optional[list] = None):
+        """Get streaming providers for multiple items with one batched cache lookup.
+
+        Provider payloads are cached per (content type, id) with every region in
+        them, so `region` only changes how they are read; only cache misses go
+        upstream. Items flagged `ott_prefiltered` (from discover queries that
+        already filter on watch providers) are kept even without provider
+        details; when LAZY_PROVIDER_DETAILS is on their misses are fetched in the
+        background instead of on the request path.
+
+        `content_items` are expected in priority order. With `needed`, lookups
+        still outstanding once that many OTT-available items are confirmed are
+        cancelled (counted in `stats['cancelled_lookups']`), so a lower-priority
+        item that answered quickly can win over a slower higher-priority one.
+        The kept items come back in priority order; `on_confirmed` is called with
+        each one as soon as it is confirmed, for callers that stream results.
+        Items left unchecked because of `needed` are appended to `leftover`."""
         if not content_items:
             return []
-            
-        async with httpx.AsyncClient(timeout=API_CONFIG['TIMEOUT']) as client:
-            # Create all requests
-            tasks = []
-            for item in content_items:
-                task = client.get(
-                    f"{TMDB_API_URL}/{api_content_type}/{item['id']}/watch/providers",
-                    params={"api_key": TMDB_API_KEY}
-                )
-                tasks.append(task)
-            
-            # Execute all requests in parallel
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            ott_content = []
-            
-            for i, response in enumerate(responses):
-                if isinstance(response, Exception):
-                    print(f"Error for item {content_items[i]['id']}: {response}")
-                    continue
-                    
-                try:
-                    if response.status_code == 200:
-                        data = response.json()
-                        providers_data = data.get('results', {})
-                        india_providers = providers_data.get('IN', {})
-                        
-                        streaming_platforms = []
-                        
-                        # Check flatrate (streaming subscription) providers
-                        if 'flatrate' in india_providers:
-                            for provider in india_providers['flatrate']:
-                                provider_id = provider['provider_id']
-                                provider_name = provider['provider_name']
-                                
-                                if provider_id in INDIAN_OTT_PLATFORMS:
-                                    ott_info = INDIAN_OTT_PLATFORMS[provider_id]
-                                    streaming_platforms.append({
-                                        "name": ott_info["name"],
-                                        "logo": provider.get('logo_path', ''),
-                                        "color": ott_info["color"]
-                                    })
-                                else:
-                                    streaming_platforms.append({
-                                        "name": provider_name,
-                                        "logo": provider.get('logo_path', ''),
-                                        "color": "#6B7280"
-                                    })
-                        
-                        # Include rent options as well for more content
-                        if 'rent' in india_providers:
-                            for provider in india_providers['rent']:
-                                streaming_platforms.append({
-                                    "name": f"{provider['provider_name']} (Rent)",
-                                    "logo": provider.get('logo_path', ''),
-                                    "color": "#F59E0B"
-                                })
-                        
-                        # Only add content that has some streaming availability
-                        if streaming_platforms:
-                            content_item = content_items[i].copy()
-                            content_item["streaming"] = {
-                                "available_on": streaming_platforms[:API_CONFIG['MAX_STREAMING_PLATFORMS']],
-                                "rent": [],
-                                "buy": []
-                            }
-                            ott_content.append(content_item)
-                            
-                except Exception as e:
-                    print(f"Error processing streaming data for item {content_items[i]['id']}: {e}")
-                    continue
-        
-        return ott_content
+
+        lazy_details = OTT_DISCOVER_CONFIG['LAZY_PROVIDER_DETAILS']
+        content_ids = [item['id'] for item in content_items]
+        lazy_ids = [item['id'] for item in content_items if lazy_details and item.get('ott_prefiltered')]
+
+        kept = {}
+        checked = set()
+        missing_details = []
+
+        def keep(i: int, streaming_platforms: list):
+            kept[i] = StreamingService._with_streaming(content_items[i], streaming_platforms)
+            if on_confirmed is not None:
+                on_confirmed(kept[i])
+
+        def accept(i: int, data) -> bool:
+            checked.add(i)
+            prefiltered = content_items[i].get('ott_prefiltered', False)
+
+            if isinstance(data, Exception):
+                print(f"Error for item {content_items[i]['id']}: {data}")
+                if prefiltered:
+                    keep(i, [])
+                return prefiltered
+
+            try:
+                streaming_platforms = StreamingService.extract_streaming_platforms(data, region) if data is not None else []
+
+                if data is None and prefiltered and lazy_details:
+                    missing_details.append(f"/{api_content_type}/{content_ids[i]}/watch/providers")
+
+                # Only add content that has some streaming availability
+                if streaming_platforms or prefiltered:
+                    keep(i, streaming_platforms)
+                    return True
+
+            except Exception as e:
+                print(f"Error processing streaming data for item {content_items[i]['id']}: {e}")
+            return False
+
+        await TMDBService.get_watch_providers_batch(
+            api_content_type, content_ids, cache_only_ids=lazy_ids, accept=accept, needed=needed, stats=stats
+        )
+
+        StreamingService._warm_providers(missing_details)
+
+        if leftover is not None:
+            leftover.extend(item for i, item in enumerate(content_items) if i not in checked)
+
+        return [kept[i] for i in sorted(kept)]
@@ -0,0 +1,332 @@
+import bisect
+import json
+import os
+import re
+import unicodedata
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from config.constants import SUGGEST_CONFIG, IMAGE_CONFIG
+
+_SPACES = re.compile(r"\s+")
+
+def normalize_title(text: str) -> str:
+    """Casefolded, accent-free form used for matching.
+
+    NFKD splits accented letters (and compatibility forms such as ligatures
+    or full-width letters) into a base character plus combining marks; the
+    marks that attach to a letter are dropped, so 'Amélie', 'AMELIE' and
+    'amelie' all match, as do Devanagari titles written with or without
+    nukta. Vowel signs are kept and punctuation becomes a word break."""
+    decomposed = unicodedata.normalize('NFKD', text or '').casefold()
+    chars = []
+    for char in decomposed:
+        if unicodedata.combining(char):
+            continue
+        chars.append(char if char.isalnum() or unicodedata.category(char)[0] == 'M' else ' ')
+    return _SPACES.sub(' ', ''.join(chars)).strip()
+
+IndexKey = Tuple[str, str, int]   # (normalized text from a word start, content_type, id)
+
+class SortedKeyList:
+    """Sorted key list stored as sorted chunks of at most 2 * chunk_size keys.
+
+    Inserting a key is a bisect over the chunk maxima plus an insort into one
+    short chunk, so indexing a page of titles costs microseconds however large
+    the index is; bulk loads larger than the index so far are merged with one
+    sort and re-chunked."""
+
+    def __init__(self, chunk_size: int = 512):
+        self.chunk_size = chunk_size
+        self._chunks: List[List[IndexKey]] = []
+        self._maxes: List[IndexKey] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _rebuild(self, keys: List[IndexKey]):
+        self._chunks = [keys[start:start + self.chunk_size] for start in range(0, len(keys), self.chunk_size)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(keys)
+
+    def add(self, key: IndexKey):
+        if not self._chunks:
+            self._rebuild([key])
+            return
+
+        position = bisect.bisect_left(self._maxes, key)
+        if position == len(self._chunks):
+            position -= 1
+            self._chunks[position].append(key)
+            self._maxes[position] = key
+        else:
+            bisect.insort(self._chunks[position], key)
+        self._len += 1
+
+        chunk = self._chunks[position]
+        if len(chunk) > 2 * self.chunk_size:
+            self._chunks.insert(position + 1, chunk[self.chunk_size:])
+            del chunk[self.chunk_size:]
+            self._maxes.insert(position, chunk[-1])
+
+    def update(self, keys: List[IndexKey]):
+        if len(keys) > max(self._len, self.chunk_size):
+            merged = [key for chunk in self._chunks for key in chunk]
+            merged.extend(keys)
+            merged.sort()
+            self._rebuild(merged)
+        else:
+            for key in keys:
+                self.add(key)
+
+    def iter_from(self, start: Tuple) -> Iterator[IndexKey]:
+        """Keys >= start, in order"""
+        position = bisect.bisect_left(self._maxes, start)
+        if position == len(self._chunks):
+            return
+        chunk = self._chunks[position]
+        yield from chunk[bisect.bisect_left(chunk, start):]
+        for chunk in self._chunks[position + 1:]:
+            yield from chunk
+
+class TitleEntry:
+    """One known title. `source` is the TMDB result it came from, or a catalog
+    mirror row (with its `columns` mapping); None for seed-file titles."""
+    __slots__ = ("id", "title", "content_type", "year", "popularity", "poster_path", "names", "source", "columns")
+
+    def __init__(self, content_id: int, title: str, content_type: str):
+        self.id = content_id
+        self.title = title
+        self.content_type = content_type
+        self.year = ''
+        self.popularity = 0.0
+        self.poster_path: Optional[str] = None
+        self.names: set = set()
+        self.source = None
+        self.columns: Optional[Dict[str, int]] = None
+
+    def tmdb_result(self) -> Optional[Dict]:
+        """The source as a TMDB-shaped result (what ContentRecord.from_tmdb takes), or None"""
+        if self.columns is None:
+            return self.source
+        row, columns = self.source, self.columns
+        title_key, date_key = ('title', 'release_date') if self.content_type == 'movie' else ('name', 'first_air_date')
+        return {
+            "id": self.id,
+            title_key: row[columns['title']],
+            "poster_path": row[columns['poster_path']],
+            "vote_average": row[columns['vote_average']],
+            "vote_count": row[columns['vote_count']],
+            "popularity": row[columns['popularity']],
+            "original_language": row[columns['original_language']],
+            "genre_ids": row[columns['genre_ids']],
+            date_key: row[columns['release_date']],
+            "overview": row[columns['overview']]
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "content_type": self.content_type,
+            "year": self.year,
+            "poster": f"{IMAGE_CONFIG['TMDB_BASE_URL']}{self.poster_path}" if self.poster_path else None
+        }
+
+class SuggestService:
+    """In-memory title prefix index behind /search/suggest.
+
+    Every normalized title is stored once per word start ("dilwale dulhania",
+    "dulhania") in a SortedKeyList of (text, content_type, id) tuples, so a
+    prefix lookup is a bisect plus a short scan and adding titles stays cheap
+    on the request path. Titles are added as they are
+    seen: every TMDB payload the service caches, the catalog mirror, and an
+    optional seed file (SUGGEST_CONFIG['SEED_PATH'], JSON lines of
+    {"id", "title", "content_type", "year", "popularity"}).
+    """
+    _keys = SortedKeyList()
+    _entries: Dict[Tuple[str, int], TitleEntry] = {}
+    # Append-only (normalized name, content_type, id) feed, consumed incrementally by TitleResolver
+    name_log: List[Tuple[str, str, int]] = []
+    _seed_loaded = False
+
+    @staticmethod
+    def _word_starts(name: str) -> List[str]:
+        words = name.split(' ')
+        return [' '.join(words[index:]) for index in range(len(words))]
+
+    @staticmethod
+    def _insert_keys(new_keys: List[IndexKey]):
+        SuggestService._keys.update(new_keys)
+
+    @staticmethod
+    def add(content_id: int, title: str, content_type: str, year: str = '', popularity: float = 0,
+            poster_path: Optional[str] = None, aliases: Sequence[str] = (),
+            pending: Optional[list] = None, source: Optional[Dict] = None) -> bool:
+        """Index one title (plus aliases such as the original-language title); False if nothing was added.
+
+        With `pending`, new index keys are appended there for the caller to insert in one go."""
+        if not SUGGEST_CONFIG['ENABLED'] or not title or content_id is None:
+            return False
+
+        entry_key = (content_type, content_id)
+        entry = SuggestService._entries.get(entry_key)
+        if entry is None:
+            if len(SuggestService._entries) >= SUGGEST_CONFIG['MAX_TITLES']:
+                return False
+            entry = SuggestService._entries[entry_key] = TitleEntry(content_id, title, content_type)
+
+        entry.year = year or entry.year
+        entry.popularity = max(entry.popularity, popularity or 0)
+        entry.poster_path = poster_path or entry.poster_path
+        if source is not None:
+            entry.source, entry.columns = source, None
+
+        new_keys = []
+        for name in (title, *aliases):
+            normalized = normalize_title(name)
+            if not normalized or normalized in entry.names:
+                continue
+            entry.names.add(normalized)
+            SuggestService.name_log.append((normalized, content_type, content_id))
+            new_keys.extend((text, content_type, content_id) for text in SuggestService._word_starts(normalized))
+
+        if pending is not None:
+            pending.extend(new_keys)
+        else:
+            SuggestService._insert_keys(new_keys)
+        return bool(new_keys)
+
+    @staticmethod
+    def add_results(results: Iterable[Dict], content_type: str):
+        """Index TMDB discover/search/details results"""
+        pending = []
+        for result in results:
+            if not isinstance(result, dict) or 'id' not in result:
+                continue
+            if content_type == 'movie':
+                title, original, date = result.get('title'), result.get('original_title'), result.get('release_date')
+            else:
+                title, original, date = result.get('name'), result.get('original_name'), result.get('first_air_date')
+            SuggestService.add(
+                result['id'], title, content_type,
+                year=(date or '')[:4],
+                popularity=result.get('popularity', 0),
+                poster_path=result.get('poster_path'),
+                aliases=(original,) if original and original != title else (),
+                pending=pending,
+                source=result
+            )
+        SuggestService._insert_keys(pending)
+
+    @staticmethod
+    def add_payload(endpoint: str, data) -> None:
+        """Index the titles in a TMDB response, whatever endpoint it came from"""
+        if not SUGGEST_CONFIG['ENABLED'] or not isinstance(data, dict):
+            return
+        if '/watch/providers' in endpoint:
+            return
+
+        parts = endpoint.strip('/').split('/')
+        content_type = next((part for part in parts if part in ('movie', 'tv')), None)
+        if content_type is None:
+            return
+
+        if isinstance(data.get('results'), list):
+            SuggestService.add_results(data['results'], content_type)
+        elif 'id' in data:
+            SuggestService.add_results([data], content_type)
+
+    @staticmethod
+    def add_catalog(catalog: Dict):
+        """Bulk-index the catalog mirror (one sort instead of an insort per title)"""
+        if not SUGGEST_CONFIG['ENABLED'] or not catalog:
+            return
+        columns = {name: index for index, name in enumerate(catalog.get('columns', ()))}
+        new_keys = []
+        for content_type in ('movie', 'tv'):
+            for row in catalog.get(content_type, ()):
+                content_id, title = row[columns['id']], row[columns['title']]
+                entry_key = (content_type, content_id)
+                if not title or entry_key in SuggestService._entries:
+                    continue
+                if len(SuggestService._entries) >= SUGGEST_CONFIG['MAX_TITLES']:
+                    break
+                normalized = normalize_title(title)
+                if not normalized:
+                    continue
+
+                entry = SuggestService._entries[entry_key] = TitleEntry(content_id, title, content_type)
+                entry.year = (row[columns['release_date']] or '')[:4]
+                entry.popularity = row[columns['popularity']] or 0
+                entry.poster_path = row[columns['poster_path']]
+                entry.source, entry.columns = row, columns
+                entry.names.add(normalized)
+                SuggestService.name_log.append((normalized, content_type, content_id))
+                new_keys.extend((text, content_type, content_id) for text in SuggestService._word_starts(normalized))
+
+        if new_keys:
+            SuggestService._insert_keys(new_keys)
+            print(f"🔤 Indexed {len(new_keys)} title keys from the catalog mirror")
+
+    @staticmethod
+    def load_seed(path: Optional[str] = None):
+        """Load the optional seed file once"""
+        path = path or SUGGEST_CONFIG['SEED_PATH']
+        if SuggestService._seed_loaded or not path:
+            return
+        SuggestService._seed_loaded = True
+        if not os.path.exists(path):
+            print(f"⚠️ Title seed file not found: {path}")
+            return
+
+        count = 0
+        pending = []
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    seed = json.loads(line)
+                    count += SuggestService.add(
+                        seed['id'], seed['title'], seed.get('content_type', 'movie'),
+                        year=str(seed.get('year', '')), popularity=seed.get('popularity', 0),
+                        poster_path=seed.get('poster_path'), aliases=seed.get('aliases', ()),
+                        pending=pending
+                    )
+            SuggestService._insert_keys(pending)
+            print(f"🔤 Loaded {count} seed titles from {path}")
+        except Exception as e:
+            print(f"⚠️ Could not load title seed file: {e}")
+
+    @staticmethod
+    def suggest(query: str, limit: int = 8) -> List[Dict]:
+        """Titles with a word starting with `query`, full-title prefix matches first, then by popularity"""
+        prefix = normalize_title(query)
+        if not prefix:
+            return []
+
+        entries = SuggestService._entries
+        # entry -> whether the match is at the start of one of its titles
+        matches: Dict[Tuple[str, int], bool] = {}
+        scanned = islice(SuggestService._keys.iter_from((prefix,)), SUGGEST_CONFIG['SCAN_LIMIT'])
+        for text, content_type, content_id in scanned:
+            if not text.startswith(prefix):
+                break
+            entry_key = (content_type, content_id)
+            if not matches.get(entry_key):
+                matches[entry_key] = text in entries[entry_key].names
+
+        ranked = sorted(
+            matches, key=lambda entry_key: (matches[entry_key], entries[entry_key].popularity), reverse=True
+        )[:limit]
+        return [entries[entry_key].to_dict() for entry_key in ranked]
+
+    @staticmethod
+    def get_entry(content_type: str, content_id: int) -> Optional[TitleEntry]:
+        return SuggestService._entries.get((content_type, content_id))
+
+    @staticmethod
+    def stats() -> Dict:
+        return {"titles": len(SuggestService._entries), "keys": len(SuggestService._keys)}
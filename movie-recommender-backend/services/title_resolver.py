@@ -0,0 +1,166 @@
+import asyncio
+import re
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+from services.suggest_service import SuggestService, TitleEntry, normalize_title
+from services.tmdb_service import TMDBService
+from models.content_record import ContentRecord
+from config.constants import RESOLVER_CONFIG
+
+_DIGITS = re.compile(r"\d+")
+
+def resolver_key(title: str) -> str:
+    """Spelling-tolerant matching key: normalized, without spaces, with common
+    transliteration variants folded ('ee' -> 'i', 'oo' -> 'u', doubled letters
+    -> one), so 'K.G.F: Chapter 2' ~ 'KGF Chapter 2' and 'Zindagi Naa Milegi
+    Dobaara' ~ 'Zindagi Na Milegi Dobara'."""
+    key = normalize_title(title).replace(' ', '')
+    key = key.replace('ee', 'i').replace('oo', 'u')
+    return re.sub(r"(.)\1+", r"\1", key)
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+class TitleResolver:
+    """Maps free-text titles (e.g. the AI's suggested_titles) to known TMDB titles without searching.
+
+    A character-trigram inverted index over every name in
+    SuggestService.name_log (cached TMDB payloads, the catalog mirror and the
+    seed file). New names are indexed in chunks of CATCH_UP_CHUNK: a
+    background task (start/stop, from the app lifespan) works through bulk
+    loads such as the catalog mirror, and each lookup indexes at most one
+    chunk, so neither blocks the event loop for long. Candidates sharing
+    the most trigrams with the query are scored by Jaccard similarity; the best
+    one at or above RESOLVER_CONFIG['THRESHOLD'] wins, provided any numbers in
+    the query (sequels, years) appear in its title or release year too.
+    """
+    _postings: Dict[str, array] = {}
+    _names: List[Tuple[str, str, int]] = []   # (resolver key, content_type, id) per indexed name
+    _counters = {"resolved": 0, "misses": 0}
+    _task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def pending() -> int:
+        return len(SuggestService.name_log) - len(TitleResolver._names)
+
+    @staticmethod
+    def _catch_up(limit: Optional[int] = None):
+        """Index up to `limit` names not seen yet (all of them without a limit)"""
+        name_log = SuggestService.name_log
+        postings = TitleResolver._postings
+        end = len(name_log) if limit is None else min(len(name_log), len(TitleResolver._names) + limit)
+        for position in range(len(TitleResolver._names), end):
+            normalized, content_type, content_id = name_log[position]
+            key = resolver_key(normalized)
+            TitleResolver._names.append((key, content_type, content_id))
+            for trigram in trigrams(key):
+                posting = postings.get(trigram)
+                if posting is None:
+                    posting = postings[trigram] = array('I')
+                posting.append(position)
+
+    @staticmethod
+    def resolve(title: str, content_type: Optional[str] = None) -> Optional[Tuple[TitleEntry, float]]:
+        """Best known title for `title` with its similarity, or None. `content_type` breaks ties."""
+        if not RESOLVER_CONFIG['ENABLED']:
+            return None
+        TitleResolver._catch_up(RESOLVER_CONFIG['CATCH_UP_CHUNK'])
+
+        key = resolver_key(title)
+        if len(key) < 2:
+            return None
+        query_trigrams = trigrams(key)
+        query_digits = set(_DIGITS.findall(normalize_title(title)))
+
+        # Very common trigrams add little but cost a lot to count; skip them unless nothing else is left
+        postings = [TitleResolver._postings[trigram] for trigram in query_trigrams if trigram in TitleResolver._postings]
+        selective = [posting for posting in postings if len(posting) <= RESOLVER_CONFIG['MAX_POSTING']]
+        shared = Counter()
+        for posting in selective or postings:
+            shared.update(posting)
+
+        best = None
+        for position, _ in shared.most_common(RESOLVER_CONFIG['CANDIDATES']):
+            name_key, candidate_type, content_id = TitleResolver._names[position]
+            candidate_trigrams = trigrams(name_key)
+            similarity = len(query_trigrams & candidate_trigrams) / len(query_trigrams | candidate_trigrams)
+            if similarity < RESOLVER_CONFIG['THRESHOLD']:
+                continue
+
+            entry = SuggestService.get_entry(candidate_type, content_id)
+            if entry is None:
+                continue
+            if query_digits:
+                known_digits = {digit for name in entry.names for digit in _DIGITS.findall(name)}
+                known_digits.add(entry.year)
+                if not query_digits <= known_digits:
+                    continue
+
+            rank = (similarity, candidate_type == content_type, entry.popularity)
+            if best is None or rank > best[0]:
+                best = (rank, entry)
+
+        if best is None:
+            TitleResolver._counters["misses"] += 1
+            return None
+        TitleResolver._counters["resolved"] += 1
+        return best[1], best[0][0]
+
+    @staticmethod
+    async def entry_record(entry: TitleEntry) -> Optional[ContentRecord]:
+        """ContentRecord for a resolved entry; titles only known by id (seed file) are looked up by id"""
+        result = entry.tmdb_result()
+        if result is None:
+            result = await TMDBService.fetch_details(entry.content_type, entry.id)
+            if not result:
+                return None
+        return ContentRecord.from_tmdb(result, entry.content_type)
+
+    @staticmethod
+    async def resolve_record(title: str, content_type: Optional[str] = None) -> Optional[ContentRecord]:
+        """Resolve a title to a ContentRecord, or None"""
+        match = TitleResolver.resolve(title, content_type)
+        if match is None:
+            return None
+
+        entry, similarity = match
+        record = await TitleResolver.entry_record(entry)
+        if record is not None:
+            print(f"🎯 Resolved '{title}' -> '{entry.title}' ({entry.content_type} {entry.id}, similarity {similarity:.2f})")
+        return record
+
+    @staticmethod
+    async def _loop():
+        while True:
+            if RESOLVER_CONFIG['ENABLED'] and TitleResolver.pending():
+                TitleResolver._catch_up(RESOLVER_CONFIG['CATCH_UP_CHUNK'])
+                await asyncio.sleep(0)  # let requests run between chunks
+            else:
+                await asyncio.sleep(RESOLVER_CONFIG['CATCH_UP_INTERVAL'])
+
+    @staticmethod
+    def start():
+        if RESOLVER_CONFIG['ENABLED'] and TitleResolver._task is None:
+            TitleResolver._task = asyncio.create_task(TitleResolver._loop())
+
+    @staticmethod
+    async def stop():
+        task = TitleResolver._task
+        TitleResolver._task = None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    def stats() -> Dict:
+        return {
+            **TitleResolver._counters,
+            "names": len(TitleResolver._names),
+            "pending": TitleResolver.pending(),
+            "trigrams": len(TitleResolver._postings)
+        }
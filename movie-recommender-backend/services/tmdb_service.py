@@ -1,232 +1,695 @@
 import httpx
 import asyncio
+import os
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from services.http_client import HTTPClientManager
+from services.cache_service import ResponseCache
+from services.persistent_cache import PersistentCache
+from services.singleflight import SingleFlight
+from services.rate_limiter import AdaptiveRateLimiter
+from services.user_preference_service import UserPreferenceService
+from services.catalog_service import CatalogService
+from services.suggest_service import SuggestService
+from models.content_record import ContentRecord
 from config.constants import (
-    TMDB_API_KEY, TMDB_API_URL, API_CONFIG, 
-    IMAGE_CONFIG, get_genre_id, get_date_range
+    TMDB_API_KEY, TMDB_API_URL, API_CONFIG, CACHE_CONFIG, PERSISTENT_CACHE_CONFIG, RATE_LIMIT_CONFIG,
+    HTTP_CLIENT_CONFIG, OTT_DISCOVER_CONFIG,
+    IMAGE_CONFIG, get_genre_ids, join_genre_ids
 )
+from utils.helpers import gather_bounded
+
+class PrewarmBudget:
+    """Upstream allowance of one prewarm cycle (see PrewarmService).
+
+    While bound to TMDBService.prewarm_budget, cache entries expiring within
+    `refresh_ahead` seconds are refreshed early, and every upstream request
+    (cache miss or refresh) takes one unit; once none are left, misses come
+    back as None and nothing more is refreshed."""
+    __slots__ = ("refresh_ahead", "remaining", "used")
+
+    def __init__(self, refresh_ahead: float, limit: int):
+        self.refresh_ahead = refresh_ahead
+        self.remaining = limit
+        self.used = 0
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.used += 1
+        return True
 
 class TMDBService:
+    cache = ResponseCache(
+        max_entries=CACHE_CONFIG['MAX_ENTRIES'],
+        ttls=CACHE_CONFIG['TTL'],
+        default_ttl=CACHE_CONFIG['DEFAULT_TTL'],
+        stale_while_revalidate=CACHE_CONFIG['STALE_WHILE_REVALIDATE'],
+        stale_if_error=CACHE_CONFIG['STALE_IF_ERROR'],
+        negative_ttls=CACHE_CONFIG['NEGATIVE_TTL']
+    )
+    inflight = SingleFlight("tmdb")
+    rate_limiter = AdaptiveRateLimiter(
+        rate=RATE_LIMIT_CONFIG['RATE'],
+        burst=RATE_LIMIT_CONFIG['BURST'],
+        min_concurrency=RATE_LIMIT_CONFIG['MIN_CONCURRENCY'],
+        max_concurrency=RATE_LIMIT_CONFIG['MAX_CONCURRENCY'],
+        initial_concurrency=RATE_LIMIT_CONFIG['INITIAL_CONCURRENCY'],
+        increase_step=RATE_LIMIT_CONFIG['INCREASE_STEP'],
+        decrease_factor=RATE_LIMIT_CONFIG['DECREASE_FACTOR']
+    )
+    _refresh_tasks: Dict[str, asyncio.Task] = {}
+    _persistent_checked = False
+    # Set only inside a prewarm cycle; inherited by the tasks it spawns
+    prewarm_budget: ContextVar[Optional[PrewarmBudget]] = ContextVar("tmdb_prewarm_budget", default=None)
+
     @staticmethod
-    async def fetch_movies(language_code: str, genre: str, date_from: str, date_to: str):
-        """Fetch movies with date filtering and correct genre ID"""
-        movies = []
-        movie_genre_id = get_genre_id(genre, 'movie')
+    def _attach_persistent_cache():
+        """Open the on-disk tier once; lazy so serverless instances without a lifespan still get it"""
+        if TMDBService._persistent_checked:
+            return
+        TMDBService._persistent_checked = True
+        
+        if not (CACHE_CONFIG['ENABLED'] and PERSISTENT_CACHE_CONFIG['ENABLED']):
+            return
+        
+        try:
+            path = os.path.join(UserPreferenceService.resolve_data_dir(), PERSISTENT_CACHE_CONFIG['FILENAME'])
+            TMDBService.cache.backing = PersistentCache(
+                path, PERSISTENT_CACHE_CONFIG['MAX_ENTRIES'], flush_interval=PERSISTENT_CACHE_CONFIG['FLUSH_INTERVAL']
+            )
+            print(f"💾 Persistent TMDB cache at {path}")
+        except Exception as e:
+            print(f"⚠️ Persistent TMDB cache unavailable, using memory only: {e}")
+
+    @staticmethod
+    async def startup_cache():
+        """Attach the persistent tier and reload the hot entries snapshot"""
+        TMDBService._attach_persistent_cache()
+        backing = TMDBService.cache.backing
+        if backing is None:
+            return
+        
+        try:
+            hot_entries = backing.load_hot(PERSISTENT_CACHE_CONFIG['SNAPSHOT_SIZE'])
+            TMDBService.cache.warm(hot_entries)
+            for _, entry in hot_entries:
+                SuggestService.add_payload(entry.endpoint, entry.value)
+            print(f"💾 Reloaded {len(hot_entries)} hot TMDB cache entries")
+        except Exception as e:
+            print(f"⚠️ Could not reload TMDB cache snapshot: {e}")
+
+    @staticmethod
+    async def shutdown_cache():
+        """Flush the hot in-memory entries to disk and close the persistent tier"""
+        for task in list(TMDBService._refresh_tasks.values()):
+            task.cancel()
+        
+        backing = TMDBService.cache.backing
+        if backing is None:
+            return
         
-        async with httpx.AsyncClient(timeout=API_CONFIG['TIMEOUT']) as client:
+        try:
+            hot_entries = TMDBService.cache.snapshot(PERSISTENT_CACHE_CONFIG['SNAPSHOT_SIZE'])
+            backing.put_many(hot_entries)
+            backing.close()
+            print(f"💾 Flushed {len(hot_entries)} hot TMDB cache entries")
+        except Exception as e:
+            print(f"⚠️ Could not flush TMDB cache snapshot: {e}")
+        finally:
+            TMDBService.cache.backing = None
+            TMDBService._persistent_checked = False
+
+    @staticmethod
+    async def _fetch_json(endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Rate-limited GET against TMDB with jittered retries.
+
+        429s, 5xx responses and transport errors are retried with exponential
+        backoff (honouring Retry-After) until RATE_LIMIT_CONFIG['REQUEST_DEADLINE'];
+        each attempt's timeout is capped by what is left of that deadline.
+        Returns parsed JSON, None for other non-200 responses, and raises once
+        retries are exhausted so callers never mistake throttling for "no data"."""
+        client = HTTPClientManager.get_client('tmdb')
+        limiter = TMDBService.rate_limiter
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + RATE_LIMIT_CONFIG['REQUEST_DEADLINE']
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            retry_after = None
+            
+            await limiter.acquire()
+            attempt_timeout = max(
+                min(deadline - loop.time(), HTTP_CLIENT_CONFIG['tmdb']['TIMEOUT']),
+                RATE_LIMIT_CONFIG['MIN_ATTEMPT_TIME']
+            )
             try:
-                print(f"Fetching movies from {date_from} to {date_to} with genre ID {movie_genre_id}")
-                
-                # Popular movies within date range
-                popular_response = await client.get(f"{TMDB_API_URL}/discover/movie", params={
+                response = await client.get(f"{TMDB_API_URL}{endpoint}", params={
                     "api_key": TMDB_API_KEY,
-                    "with_genres": movie_genre_id,
-                    "with_original_language": language_code,
-                    "primary_release_date.gte": date_from,
-                    "primary_release_date.lte": date_to,
+                    **(params or {})
+                }, timeout=attempt_timeout)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                await limiter.release("error")
+                error = e
+            except asyncio.CancelledError:
+                # Cancelled on purpose (early exit, disconnect, superseded query): TMDB did nothing wrong
+                await limiter.release("cancelled")
+                raise
+            except BaseException:
+                await limiter.release("error")
+                raise
+            else:
+                if response.status_code == 429:
+                    retry_after = AdaptiveRateLimiter.parse_retry_after(response.headers.get("Retry-After"))
+                    await limiter.release("throttled", retry_after)
+                    error = httpx.HTTPStatusError("TMDB rate limit (429)", request=response.request, response=response)
+                elif response.status_code >= 500:
+                    await limiter.release("error")
+                    error = httpx.HTTPStatusError(f"TMDB server error ({response.status_code})", request=response.request, response=response)
+                else:
+                    await limiter.release("success")
+                    if response.status_code == 200:
+                        return response.json()
+                    
+                    print(f"TMDB {endpoint} returned status {response.status_code}")
+                    return None
+            
+            delay = AdaptiveRateLimiter.backoff_delay(
+                attempt, RATE_LIMIT_CONFIG['BACKOFF_BASE'], RATE_LIMIT_CONFIG['BACKOFF_MAX']
+            )
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            
+            remaining = deadline - loop.time() - delay
+            if attempt > RATE_LIMIT_CONFIG['MAX_RETRIES'] or remaining < RATE_LIMIT_CONFIG['MIN_ATTEMPT_TIME']:
+                limiter.record_failure()
+                print(f"TMDB {endpoint} failed after {attempt} attempts: {error}")
+                raise error
+            
+            limiter.record_retry()
+            print(f"TMDB {endpoint} attempt {attempt} failed ({error}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _fetch_and_store(key: str, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        data = await TMDBService._fetch_json(endpoint, params)
+        if data is not None and CACHE_CONFIG['ENABLED']:
+            TMDBService._store(key, data, endpoint)
+        return data
+
+    @staticmethod
+    def _store(key: str, data: Dict, endpoint: str):
+        """Cache a payload; empty `results` on endpoints with a negative TTL are cached for that shorter time"""
+        cache = TMDBService.cache
+        SuggestService.add_payload(endpoint, data)
+        negative_ttl = cache.negative_ttl_for(endpoint)
+        if negative_ttl is not None and not data.get('results'):
+            cache.set(key, data, endpoint, ttl=negative_ttl, negative=True)
+        else:
+            cache.set(key, data, endpoint)
+
+    @staticmethod
+    async def _fetch_json_coalesced(key: str, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Share one upstream request (and cache write) between all concurrent callers of the same key"""
+        return await TMDBService.inflight.do(key, lambda: TMDBService._fetch_and_store(key, endpoint, params))
+
+    @staticmethod
+    async def _refresh(key: str, endpoint: str, params: Optional[Dict]):
+        """Background revalidation of a stale cache entry"""
+        try:
+            data = await TMDBService._fetch_json_coalesced(key, endpoint, params)
+            if data is not None:
+                TMDBService.cache.record_refresh()
+        except Exception as e:
+            print(f"Background refresh failed for {key}: {e}")
+        finally:
+            TMDBService._refresh_tasks.pop(key, None)
+
+    @staticmethod
+    async def get_json(endpoint: str, params: Optional[Dict] = None, cache_only: bool = False) -> Optional[Dict]:
+        """Cached TMDB GET.
+
+        Fresh entries are returned directly; stale entries are returned while a
+        background refresh runs; if TMDB errors or times out, any retained entry
+        is served instead of failing. Returns None for non-200 responses, and
+        for cache misses when `cache_only` is set."""
+        key = ResponseCache.make_key(endpoint, params)
+        
+        if not CACHE_CONFIG['ENABLED']:
+            if cache_only:
+                return None
+            return await TMDBService._fetch_json_coalesced(key, endpoint, params)
+        
+        TMDBService._attach_persistent_cache()
+        value, hit = TMDBService._lookup_cached(key, endpoint, params)
+        if hit:
+            return value
+        
+        if cache_only:
+            return None
+        
+        return await TMDBService._fetch_uncached(key, endpoint, params)
+
+    @staticmethod
+    def _lookup_cached(key: str, endpoint: str, params: Optional[Dict] = None):
+        """Cache lookup for get_json: returns (value, hit) and schedules a refresh for stale entries"""
+        budget = TMDBService.prewarm_budget.get()
+        value, state = TMDBService.cache.lookup(key, refresh_ahead=budget.refresh_ahead if budget else 0)
+        
+        if state == "stale" and key not in TMDBService._refresh_tasks and (budget is None or budget.take()):
+            TMDBService._refresh_tasks[key] = asyncio.create_task(TMDBService._refresh(key, endpoint, params))
+        
+        return value, state is not None
+
+    @staticmethod
+    async def _fetch_uncached(key: str, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Upstream fetch after a cache miss, falling back to a retained entry if TMDB fails"""
+        cache = TMDBService.cache
+        budget = TMDBService.prewarm_budget.get()
+        if budget is not None and not budget.take():
+            return None
+        
+        try:
+            data = await TMDBService._fetch_json_coalesced(key, endpoint, params)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            fallback = cache.get_if_error(key)
+            if fallback is not None:
+                print(f"TMDB error for {endpoint} ({e}), serving stale cache entry")
+                return fallback
+            raise
+        
+        if data is None:
+            fallback = cache.get_if_error(key)
+            if fallback is not None:
+                print(f"TMDB error for {endpoint}, serving stale cache entry")
+            return fallback
+        
+        return data
+
+    @staticmethod
+    async def fetch_details(content_type: str, content_id: int) -> Optional[Dict]:
+        """Fetch /{movie|tv}/{id} with API_CONFIG['DETAILS_APPEND'] appended in the same call.
+
+        The appended watch/providers block is written into the cache under the
+        /watch/providers endpoint, so StreamingService reuses it instead of
+        making a second request for the same id."""
+        append = API_CONFIG['DETAILS_APPEND']
+        params = {"append_to_response": ",".join(append)} if append else None
+        details = await TMDBService.get_json(f"/{content_type}/{content_id}", params)
+        
+        if details and CACHE_CONFIG['ENABLED'] and isinstance(details.get('watch/providers'), dict):
+            providers_endpoint = f"/{content_type}/{content_id}/watch/providers"
+            providers_key = ResponseCache.make_key(providers_endpoint)
+            if not TMDBService.cache.is_fresh(providers_key):
+                TMDBService._store(providers_key, {"id": content_id, **details['watch/providers']}, providers_endpoint)
+        
+        return details
+
+    @staticmethod
+    async def get_watch_providers_batch(content_type: str, content_ids: List[int],
+                                        cache_only_ids: Iterable[int] = (),
+                                        accept: Optional[Callable[[int, object], bool]] = None,
+                                        needed: Optional[int] = None,
+                                        stats: Optional[Dict] = None) -> List[Optional[Dict]]:
+        """Full multi-region /watch/providers payloads for many ids, aligned with `content_ids`.
+
+        Every id is checked against the cache first; only the misses go upstream
+        (bounded by API_CONFIG['PROVIDER_CONCURRENCY']), except ids in
+        `cache_only_ids`, which come back as None on a miss. Failed lookups come
+        back as the exception, like asyncio.gather(return_exceptions=True).
+
+        With `accept(index, payload) -> bool` and `needed`, results are handed
+        to `accept` as they arrive (cache hits first, in order, then upstream
+        fetches as they complete) and outstanding fetches are cancelled once
+        `needed` of them were accepted; those entries stay None, and at most
+        `needed` results are accepted. The number of cancelled (or skipped)
+        lookups is added to `stats['cancelled_lookups']`."""
+        endpoints = [f"/{content_type}/{content_id}/watch/providers" for content_id in content_ids]
+        results: List[Optional[Dict]] = [None] * len(content_ids)
+        accepted = 0
+        
+        def take(index: int, data) -> bool:
+            """Record one result; True once enough have been accepted"""
+            nonlocal accepted
+            results[index] = data
+            if accept is not None and accept(index, data):
+                accepted += 1
+            return needed is not None and accepted >= needed
+        
+        if CACHE_CONFIG['ENABLED']:
+            TMDBService._attach_persistent_cache()
+        
+        cache_only_ids = set(cache_only_ids)
+        misses = []
+        hits = 0
+        skipped = 0
+        for index, endpoint in enumerate(endpoints):
+            if needed is not None and accepted >= needed:
+                skipped = len(endpoints) - index
+                break
+            key = ResponseCache.make_key(endpoint)
+            if CACHE_CONFIG['ENABLED']:
+                value, hit = TMDBService._lookup_cached(key, endpoint)
+                if hit:
+                    hits += 1
+                    take(index, value)
+                    continue
+            if content_ids[index] in cache_only_ids:
+                take(index, None)
+            else:
+                misses.append((index, key, endpoint))
+        
+        cancelled = 0
+        if misses and needed is not None and accepted >= needed:
+            cancelled = len(misses)
+        elif misses:
+            semaphore = asyncio.Semaphore(max(1, API_CONFIG['PROVIDER_CONCURRENCY']))
+            
+            async def fetch(index: int, key: str, endpoint: str):
+                async with semaphore:
+                    try:
+                        return index, await TMDBService._fetch_uncached(key, endpoint)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        return index, e
+            
+            # Created in priority order, so the semaphore starts the best candidates first
+            tasks = [asyncio.create_task(fetch(index, key, endpoint)) for index, key, endpoint in misses]
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    if take(*await next_result):
+                        break
+            finally:
+                cancelled = sum(1 for task in tasks if not task.done() and task.cancel())
+        
+        if stats is not None:
+            stats['cancelled_lookups'] = stats.get('cancelled_lookups', 0) + cancelled + skipped
+        
+        print(f"Watch providers for {len(content_ids)} {content_type} items: {hits} from cache, "
+              f"{len(misses) - cancelled} fetched, {cancelled + skipped} cancelled")
+        return results
+
+    @staticmethod
+    def _ott_discover_params() -> Dict:
+        """Extra discover params that restrict candidates to our Indian OTT platforms"""
+        if not OTT_DISCOVER_CONFIG['ENABLED']:
+            return {}
+        return {
+            "watch_region": OTT_DISCOVER_CONFIG['WATCH_REGION'],
+            "with_watch_monetization_types": OTT_DISCOVER_CONFIG['MONETIZATION_TYPES'],
+            "with_watch_providers": OTT_DISCOVER_CONFIG['WITH_WATCH_PROVIDERS']
+        }
+
+    @staticmethod
+    async def _fetch_discover_pages(endpoint: str, params: Dict, on_page: Callable[[list], Awaitable[int]],
+                                    needed: int, max_pages: int, done: Optional[Callable[[], bool]] = None) -> int:
+        """Fetch discover pages until `needed` results have been accepted.
+
+        Page 1 is fetched first to learn total_pages; pages 2..N (capped at
+        max_pages) are then requested concurrently. Each page is handed to
+        `on_page` as soon as it arrives, in arrival order, and returns how many
+        results it accepted. Outstanding pages are cancelled once enough results
+        have been accepted, or as soon as `done()` returns True. Returns the
+        total accepted."""
+        first_page = await TMDBService.get_json(endpoint, {**params, "page": 1})
+        if first_page is None:
+            return 0
+        
+        accepted = await on_page(first_page.get('results', []))
+        total_pages = min(first_page.get('total_pages', 1) or 1, max_pages)
+        
+        if accepted >= needed or total_pages <= 1 or (done and done()):
+            return accepted
+        
+        page_tasks = [
+            asyncio.create_task(TMDBService.get_json(endpoint, {**params, "page": page}))
+            for page in range(2, total_pages + 1)
+        ]
+        
+        try:
+            for next_page in asyncio.as_completed(page_tasks):
+                try:
+                    page_data = await next_page
+                except Exception as e:
+                    print(f"Error fetching {endpoint} page: {e}")
+                    continue
+                
+                if page_data is not None:
+                    accepted += await on_page(page_data.get('results', []))
+                
+                if accepted >= needed or (done and done()):
+                    break
+        finally:
+            cancelled = sum(1 for task in page_tasks if not task.done() and task.cancel())
+            if cancelled:
+                print(f"Stopped early, cancelled {cancelled} outstanding {endpoint} pages")
+        
+        return accepted
+
+    @staticmethod
+    async def fetch_movies(language_code: str, genre: Union[str, List[str]], date_from: str, date_to: str,
+                           ott_filter: Optional[Callable[[list], Awaitable[list]]] = None,
+                           quota_met: Optional[Callable[[], bool]] = None):
+        """Fetch movies with date filtering and correct genre ID (`genre` may be a list; any of them matches).
+
+        Popular results are fetched page by page (see _fetch_discover_pages). When
+        `ott_filter` is given, every page is streamed through it as it arrives and
+        only the items it returns are kept, so fetching stops once enough
+        OTT-available movies have been confirmed. `quota_met` reports a quota
+        shared with other fetches (e.g. other languages feeding the same filter);
+        once it returns True, paging stops and the recent fallback is skipped."""
+        movies = []
+        seen_ids = set()
+        movie_genre_ids = get_genre_ids(genre, 'movie')
+        ott_params = TMDBService._ott_discover_params()
+        target = API_CONFIG['MAX_RESULTS_PER_TYPE']
+        shared_quota_met = quota_met or (lambda: False)
+        
+        async def accept_page(page_movies: list) -> int:
+            page_items = []
+            for movie in page_movies:
+                if movie['id'] in seen_ids:
+                    continue
+                seen_ids.add(movie['id'])
+                page_items.append(ContentRecord.from_tmdb(movie, 'movie', ott_prefiltered=bool(ott_params)))
+            
+            if ott_filter and page_items:
+                page_items = await ott_filter(page_items)
+            
+            movies.extend(page_items)
+            return len(page_items)
+        
+        base_params = {
+            "with_genres": join_genre_ids(movie_genre_ids),
+            "with_original_language": language_code,
+            "primary_release_date.gte": date_from,
+            "primary_release_date.lte": date_to,
+            **ott_params
+        }
+        
+        try:
+            print(f"Fetching movies from {date_from} to {date_to} with genre IDs {movie_genre_ids}")
+            
+            # Answer from the local catalog mirror when it is fresh; the mirror only holds the most
+            # popular titles per language, so a thin answer is topped up from the live API
+            mirror_movies = CatalogService.query(
+                'movie', language_code, movie_genre_ids, date_from, date_to,
+                min_votes=API_CONFIG['MIN_VOTE_COUNT']['POPULAR'], ott_only=bool(ott_params),
+                limit=target * API_CONFIG['MAX_DISCOVER_PAGES']
+            )
+            
+            if mirror_movies:
+                print(f"Using {len(mirror_movies)} movies from the catalog mirror")
+                for start in range(0, len(mirror_movies), target):
+                    await accept_page(mirror_movies[start:start + target])
+                    if len(movies) >= target or shared_quota_met():
+                        return movies[:target]
+                print(f"Catalog mirror gave {len(movies)} movies, topping up from the live API")
+            
+            # Popular movies within date range, paged until the quota is filled
+            found = await TMDBService._fetch_discover_pages(
+                "/discover/movie",
+                {
+                    **base_params,
                     "sort_by": "popularity.desc",
-                    "vote_count.gte": API_CONFIG['MIN_VOTE_COUNT']['POPULAR'],
+                    "vote_count.gte": API_CONFIG['MIN_VOTE_COUNT']['POPULAR']
+                },
+                accept_page,
+                needed=target - len(movies),
+                max_pages=API_CONFIG['MAX_DISCOVER_PAGES'],
+                done=shared_quota_met
+            )
+            print(f"Found {found} movies in date range")
+            
+            # If not enough movies, try with recent releases
+            if len(movies) < 10 and not shared_quota_met():
+                recent_data = await TMDBService.get_json("/discover/movie", {
+                    **base_params,
+                    "sort_by": "release_date.desc",
+                    "vote_count.gte": API_CONFIG['MIN_VOTE_COUNT']['RECENT'],
                     "page": 1
                 })
                 
-                if popular_response.status_code == 200:
-                    popular_movies = popular_response.json().get('results', [])
-                    print(f"Found {len(popular_movies)} movies in date range")
-                    
-                    for movie in popular_movies:
-                        movies.append({
-                            "id": movie['id'],
-                            "title": movie['title'],
-                            "poster": f"{IMAGE_CONFIG['TMDB_BASE_URL']}{movie['poster_path']}" if movie.get('poster_path') else None,
-                            "rating": movie.get('vote_average', 0),
-                            "year": movie.get('release_date', '')[:4] if movie.get('release_date') else '',
-                            "overview": movie.get('overview', ''),
-                            "content_type": "movie",
-                            "release_date": movie.get('release_date', ''),
-                            "genre_ids": movie.get('genre_ids', []),
-                            "original_language": movie.get('original_language', 'en'),
-                            "popularity": movie.get('popularity', 0),
-                            "vote_count": movie.get('vote_count', 0)
-                        })
-                
-                # If not enough movies, try with recent releases
-                if len(movies) < 10:
-                    recent_response = await client.get(f"{TMDB_API_URL}/discover/movie", params={
-                        "api_key": TMDB_API_KEY,
-                        "with_genres": movie_genre_id,
-                        "with_original_language": language_code,
-                        "primary_release_date.gte": date_from,
-                        "primary_release_date.lte": date_to,
-                        "sort_by": "release_date.desc",
-                        "vote_count.gte": API_CONFIG['MIN_VOTE_COUNT']['RECENT'],
-                        "page": 1
-                    })
-                    
-                    if recent_response.status_code == 200:
-                        recent_movies = recent_response.json().get('results', [])
-                        print(f"Found {len(recent_movies)} additional movies")
-                        
-                        existing_ids = {movie['id'] for movie in movies}
-                        for movie in recent_movies:
-                            if movie['id'] not in existing_ids:
-                                movies.append({
-                                    "id": movie['id'],
-                                    "title": movie['title'],
-                                    "poster": f"{IMAGE_CONFIG['TMDB_BASE_URL']}{movie['poster_path']}" if movie.get('poster_path') else None,
-                                    "rating": movie.get('vote_average', 0),
-                                    "year": movie.get('release_date', '')[:4] if movie.get('release_date') else '',
-                                    "overview": movie.get('overview', ''),
-                                    "content_type": "movie",
-                                    "release_date": movie.get('release_date', '')
-                                })
+                if recent_data is not None:
+                    added = await accept_page(recent_data.get('results', []))
+                    print(f"Found {added} additional movies")
+        
+        except Exception as e:
+            print(f"Error fetching movies: {e}")
+        
+        return movies[:target]
+
+    @staticmethod
+    async def _collect_live_tv_candidates(language_code: str, tv_genre_ids: List[int], date_from: str, date_to: str,
+                                          ott_params: Dict):
+        """Gather TV candidates from the live API plus their details (for last_air_date).
+
+        Returns (shows by id, ids known to be on our OTT platforms, details aligned with the ids)"""
+        tv_shows_dict = {}  # Use dict to avoid duplicates
+        prefiltered_ids = set()  # Shows already known to be on our OTT platforms
+        
+        # Run all three candidate sources concurrently
+        # Approach 1: shows currently on the air
+        # Approach 2: discover with air_date to catch shows with recent episodes
+        # Approach 3: recently aired shows (airing_today)
+        on_air_task = TMDBService.get_json("/tv/on_the_air", {
+            "page": 1
+        })
+        discover_task = TMDBService.get_json("/discover/tv", {
+            "with_genres": join_genre_ids(tv_genre_ids),
+            "with_original_language": language_code,
+            "air_date.gte": date_from,
+            "air_date.lte": date_to,
+            "sort_by": "popularity.desc",
+            "page": 1,
+            **ott_params
+        })
+        airing_today_task = TMDBService.get_json("/tv/airing_today", {
+            "page": 1
+        })
+        
+        on_air_data, discover_data, airing_today_data = await asyncio.gather(
+            on_air_task, discover_task, airing_today_task, return_exceptions=True
+        )
+        
+        # Merge in the original source order so duplicates resolve the same way every time
+        sources = [
+            ("on_the_air", on_air_data, True),
+            ("discover", discover_data, False),
+            ("airing_today", airing_today_data, True)
+        ]
+        
+        for source_name, data, needs_filter in sources:
+            if isinstance(data, Exception):
+                print(f"Error fetching {source_name} shows: {data}")
+                continue
             
+            try:
+                if data is not None:
+                    source_shows = data.get('results', [])
+                    print(f"Found {len(source_shows)} shows from {source_name}")
+                    
+                    for show in source_shows:
+                        if not needs_filter or (
+                            show.get('original_language') == language_code
+                            and any(genre_id in show.get('genre_ids', []) for genre_id in tv_genre_ids)
+                        ):
+                            tv_shows_dict[show['id']] = show
+                            if source_name == "discover" and ott_params:
+                                prefiltered_ids.add(show['id'])
             except Exception as e:
-                print(f"Error fetching movies: {e}")
+                print(f"Error processing {source_name} shows: {e}")
         
-        return movies[:API_CONFIG['MAX_RESULTS_PER_TYPE']]
+        # Now fetch details for each unique show and check last_air_date
+        print(f"Checking {len(tv_shows_dict)} unique shows for last_air_date")
+        
+        show_ids = list(tv_shows_dict.keys())
+        details_results = await gather_bounded(
+            [lambda show_id=show_id: TMDBService.fetch_details('tv', show_id) for show_id in show_ids],
+            API_CONFIG['TV_DETAILS_CONCURRENCY']
+        )
+        
+        return tv_shows_dict, prefiltered_ids, details_results
 
     @staticmethod
-    async def fetch_tv_shows(language_code: str, genre: str, date_from: str, date_to: str):
+    async def fetch_tv_shows(language_code: str, genre: Union[str, List[str]], date_from: str, date_to: str):
         """Fetch TV shows with recent episodes/seasons using hybrid approach"""
         tv_shows = []
-        tv_shows_dict = {}  # Use dict to avoid duplicates
-        tv_genre_id = get_genre_id(genre, 'tv')
+        tv_genre_ids = get_genre_ids(genre, 'tv')
+        ott_params = TMDBService._ott_discover_params()
         
-        async with httpx.AsyncClient(timeout=API_CONFIG['TIMEOUT']) as client:
-            try:
-                print(f"Fetching TV shows from {date_from} to {date_to} with genre ID {tv_genre_id}")
-                
-                # Approach 1: Get shows currently on the air
-                try:
-                    on_air_response = await client.get(f"{TMDB_API_URL}/tv/on_the_air", params={
-                        "api_key": TMDB_API_KEY,
-                        "page": 1
-                    })
-                    
-                    if on_air_response.status_code == 200:
-                        on_air_shows = on_air_response.json().get('results', [])
-                        print(f"Found {len(on_air_shows)} shows currently on the air")
-                        
-                        for show in on_air_shows:
-                            if show.get('original_language') == language_code and tv_genre_id in show.get('genre_ids', []):
-                                tv_shows_dict[show['id']] = show
-                except Exception as e:
-                    print(f"Error fetching on_the_air shows: {e}")
+        try:
+            print(f"Fetching TV shows from {date_from} to {date_to} with genre IDs {tv_genre_ids}")
+            
+            # Answer from the local catalog mirror when it is fresh, else go to the live API
+            mirror_shows = CatalogService.query(
+                'tv', language_code, tv_genre_ids, date_from, date_to, ott_only=bool(ott_params),
+                limit=API_CONFIG['MAX_RESULTS_PER_TYPE'] * API_CONFIG['MAX_DISCOVER_PAGES']
+            )
+            
+            if mirror_shows:
+                print(f"Using {len(mirror_shows)} TV shows from the catalog mirror")
+                tv_shows_dict = {show['id']: show for show in mirror_shows}
+                prefiltered_ids = set(tv_shows_dict) if ott_params else set()
+                details_results = [{"last_air_date": show['last_air_date']} for show in mirror_shows]
+            else:
+                tv_shows_dict, prefiltered_ids, details_results = await TMDBService._collect_live_tv_candidates(
+                    language_code, tv_genre_ids, date_from, date_to, ott_params
+                )
+            
+            show_ids = list(tv_shows_dict.keys())
+            
+            for show_id, details in zip(show_ids, details_results):
+                show = tv_shows_dict[show_id]
                 
-                # Approach 2: Use discover with air_date to catch shows with recent episodes
-                try:
-                    discover_response = await client.get(f"{TMDB_API_URL}/discover/tv", params={
-                        "api_key": TMDB_API_KEY,
-                        "with_genres": tv_genre_id,
-                        "with_original_language": language_code,
-                        "air_date.gte": date_from,
-                        "air_date.lte": date_to,
-                        "sort_by": "popularity.desc",
-                        "page": 1
-                    })
-                    
-                    if discover_response.status_code == 200:
-                        discover_shows = discover_response.json().get('results', [])
-                        print(f"Found {len(discover_shows)} shows from discover with air_date filter")
-                        
-                        for show in discover_shows:
-                            tv_shows_dict[show['id']] = show
-                except Exception as e:
-                    print(f"Error fetching discover shows: {e}")
+                if isinstance(details, Exception):
+                    print(f"Error fetching details for show {show_id}: {details}")
+                    continue
                 
-                # Approach 3: Get recently aired shows (airing_today)
-                try:
-                    airing_today_response = await client.get(f"{TMDB_API_URL}/tv/airing_today", params={
-                        "api_key": TMDB_API_KEY,
-                        "page": 1
-                    })
+                if details:
+                    last_air_date = details.get('last_air_date', '')
                     
-                    if airing_today_response.status_code == 200:
-                        airing_today_shows = airing_today_response.json().get('results', [])
-                        print(f"Found {len(airing_today_shows)} shows airing today")
-                        
-                        for show in airing_today_shows:
-                            if show.get('original_language') == language_code and tv_genre_id in show.get('genre_ids', []):
-                                tv_shows_dict[show['id']] = show
-                except Exception as e:
-                    print(f"Error fetching airing_today shows: {e}")
-                
-                # Now fetch details for each unique show and check last_air_date
-                print(f"Checking {len(tv_shows_dict)} unique shows for last_air_date")
-                
-                for show_id, show in tv_shows_dict.items():
-                    try:
-                        details_response = await client.get(f"{TMDB_API_URL}/tv/{show_id}", params={
-                            "api_key": TMDB_API_KEY
-                        })
-                        
-                        if details_response.status_code == 200:
-                            details = details_response.json()
-                            last_air_date = details.get('last_air_date', '')
-                            
-                            # Check if last air date is within our date range
-                            if last_air_date and last_air_date >= date_from and last_air_date <= date_to:
-                                tv_shows.append({
-                                    "id": show['id'],
-                                    "title": show.get('name', show.get('title', 'Unknown')),
-                                    "poster": f"{IMAGE_CONFIG['TMDB_BASE_URL']}{show['poster_path']}" if show.get('poster_path') else None,
-                                    "rating": show.get('vote_average', 0),
-                                    "year": show.get('first_air_date', '')[:4] if show.get('first_air_date') else '',
-                                    "overview": show.get('overview', ''),
-                                    "content_type": "tv",
-                                    "release_date": show.get('first_air_date', ''),
-                                    "last_air_date": last_air_date,
-                                    "genre_ids": show.get('genre_ids', []),
-                                    "original_language": show.get('original_language', 'en'),
-                                    "popularity": show.get('popularity', 0),
-                                    "vote_count": show.get('vote_count', 0)
-                                })
-                                print(f"✓ Added: {show.get('name')} (last aired: {last_air_date})")
-                            else:
-                                print(f"✗ Skipped: {show.get('name')} (last aired: {last_air_date}, outside range {date_from} to {date_to})")
-                    except Exception as e:
-                        print(f"Error fetching details for show {show_id}: {e}")
-                        continue
+                    # Check if last air date is within our date range
+                    if last_air_date and last_air_date >= date_from and last_air_date <= date_to:
+                        tv_shows.append(ContentRecord.from_tmdb(
+                            show, 'tv', ott_prefiltered=show_id in prefiltered_ids, last_air_date=last_air_date
+                        ))
+                        print(f"✓ Added: {show.get('name')} (last aired: {last_air_date})")
+                    else:
+                        print(f"✗ Skipped: {show.get('name')} (last aired: {last_air_date}, outside range {date_from} to {date_to})")
+            
+            # If still not enough shows, add new shows from discover (by first_air_date)
+            if len(tv_shows) < 10:
+                print(f"Only found {len(tv_shows)} shows with recent episodes, supplementing with new shows")
+                new_shows_data = await TMDBService.get_json("/discover/tv", {
+                    "with_genres": join_genre_ids(tv_genre_ids),
+                    "with_original_language": language_code,
+                    "first_air_date.gte": date_from,
+                    "first_air_date.lte": date_to,
+                    "sort_by": "popularity.desc",
+                    "vote_count.gte": API_CONFIG['MIN_VOTE_COUNT']['RECENT'],
+                    "page": 1,
+                    **ott_params
+                })
                 
-                # If still not enough shows, add new shows from discover (by first_air_date)
-                if len(tv_shows) < 10:
-                    print(f"Only found {len(tv_shows)} shows with recent episodes, supplementing with new shows")
-                    new_shows_response = await client.get(f"{TMDB_API_URL}/discover/tv", params={
-                        "api_key": TMDB_API_KEY,
-                        "with_genres": tv_genre_id,
-                        "with_original_language": language_code,
-                        "first_air_date.gte": date_from,
-                        "first_air_date.lte": date_to,
-                        "sort_by": "popularity.desc",
-                        "vote_count.gte": API_CONFIG['MIN_VOTE_COUNT']['RECENT'],
-                        "page": 1
-                    })
+                if new_shows_data is not None:
+                    new_shows = new_shows_data.get('results', [])
+                    existing_ids = {show.id for show in tv_shows}
                     
-                    if new_shows_response.status_code == 200:
-                        new_shows = new_shows_response.json().get('results', [])
-                        existing_ids = {show['id'] for show in tv_shows}
-                        
-                        for show in new_shows:
-                            if show['id'] not in existing_ids:
-                                tv_shows.append({
-                                    "id": show['id'],
-                                    "title": show.get('name', show.get('title', 'Unknown')),
-                                    "poster": f"{IMAGE_CONFIG['TMDB_BASE_URL']}{show['poster_path']}" if show.get('poster_path') else None,
-                                    "rating": show.get('vote_average', 0),
-                                    "year": show.get('first_air_date', '')[:4] if show.get('first_air_date') else '',
-                                    "overview": show.get('overview', ''),
-                                    "content_type": "tv",
-                                    "release_date": show.get('first_air_date', ''),
-                                    "genre_ids": show.get('genre_ids', []),
-                                    "original_language": show.get('original_language', 'en'),
-                                    "popularity": show.get('popularity', 0),
-                                    "vote_count": show.get('vote_count', 0)
-                                })
-            
-            except Exception as e:
-                print(f"Error fetching TV shows: {e}")
+                    for show in new_shows:
+                        if show['id'] not in existing_ids:
+                            tv_shows.append(ContentRecord.from_tmdb(show, 'tv', ott_prefiltered=bool(ott_params)))
+        
+        except Exception as e:
+            print(f"Error fetching TV shows: {e}")
         
         # Sort by popularity and return top results
-        tv_shows.sort(key=lambda x: x.get('popularity', 0), reverse=True)
+        tv_shows.sort(key=lambda x: x.popularity, reverse=True)
         print(f"Returning {len(tv_shows[:API_CONFIG['MAX_RESULTS_PER_TYPE']])} TV shows")
         return tv_shows[:API_CONFIG['MAX_RESULTS_PER_TYPE']]
 
@@ -235,38 +698,27 @@ class TMDBService:
         """Search movies globally using TMDB search API"""
         movies = []
         
-        async with httpx.AsyncClient(timeout=API_CONFIG['TIMEOUT']) as client:
-            try:
-                print(f"Global search for movies: {query}")
-                
-                search_response = await client.get(f"{TMDB_API_URL}/search/movie", params={
-                    "api_key": TMDB_API_KEY,
-                    "query": query,
-                    "page": 1,
-                    "include_adult": False
-                })
-                
-                if search_response.status_code == 200:
-                    search_results = search_response.json().get('results', [])
-                    print(f"Found {len(search_results)} movies in global search")
-                    
-                    for movie in search_results[:API_CONFIG['MAX_SEARCH_RESULTS']]:
-                        if IMAGE_CONFIG['REQUIRE_POSTER'] and not movie.get('poster_path'):
-                            continue
-                            
-                        movies.append({
-                            "id": movie['id'],
-                            "title": movie['title'],
-                            "poster": f"{IMAGE_CONFIG['TMDB_BASE_URL']}{movie['poster_path']}" if movie.get('poster_path') else None,
-                            "rating": movie.get('vote_average', 0),
-                            "year": movie.get('release_date', '')[:4] if movie.get('release_date') else '',
-                            "overview": movie.get('overview', ''),
-                            "content_type": "movie",
-                            "release_date": movie.get('release_date', '')
-                        })
+        try:
+            print(f"Global search for movies: {query}")
             
-            except Exception as e:
-                print(f"Error in global movie search: {e}")
+            search_data = await TMDBService.get_json("/search/movie", {
+                "query": query,
+                "page": 1,
+                "include_adult": False
+            })
+            
+            if search_data is not None:
+                search_results = search_data.get('results', [])
+                print(f"Found {len(search_results)} movies in global search")
+                
+                for movie in search_results[:API_CONFIG['MAX_SEARCH_RESULTS']]:
+                    if IMAGE_CONFIG['REQUIRE_POSTER'] and not movie.get('poster_path'):
+                        continue
+                        
+                    movies.append(ContentRecord.from_tmdb(movie, 'movie'))
+        
+        except Exception as e:
+            print(f"Error in global movie search: {e}")
         
         return movies
 
@@ -275,37 +727,26 @@ class TMDBService:
         """Search TV shows globally using TMDB search API"""
         tv_shows = []
         
-        async with httpx.AsyncClient(timeout=API_CONFIG['TIMEOUT']) as client:
-            try:
-                print(f"Global search for TV shows: {query}")
-                
-                search_response = await client.get(f"{TMDB_API_URL}/search/tv", params={
-                    "api_key": TMDB_API_KEY,
-                    "query": query,
-                    "page": 1,
-                    "include_adult": False
-                })
-                
-                if search_response.status_code == 200:
-                    search_results = search_response.json().get('results', [])
-                    print(f"Found {len(search_results)} TV shows in global search")
-                    
-                    for show in search_results[:API_CONFIG['MAX_SEARCH_RESULTS']]:
-                        if IMAGE_CONFIG['REQUIRE_POSTER'] and not show.get('poster_path'):
-                            continue
-                            
-                        tv_shows.append({
-                            "id": show['id'],
-                            "title": show.get('name', show.get('title', 'Unknown')),
-                            "poster": f"{IMAGE_CONFIG['TMDB_BASE_URL']}{show['poster_path']}" if show.get('poster_path') else None,
-                            "rating": show.get('vote_average', 0),
-                            "year": show.get('first_air_date', '')[:4] if show.get('first_air_date') else '',
-                            "overview": show.get('overview', ''),
-                            "content_type": "tv",
-                            "release_date": show.get('first_air_date', '')
-                        })
+        try:
+            print(f"Global search for TV shows: {query}")
             
-            except Exception as e:
-                print(f"Error in global TV search: {e}")
+            search_data = await TMDBService.get_json("/search/tv", {
+                "query": query,
+                "page": 1,
+                "include_adult": False
+            })
+            
+            if search_data is not None:
+                search_results = search_data.get('results', [])
+                print(f"Found {len(search_results)} TV shows in global search")
+                
+                for show in search_results[:API_CONFIG['MAX_SEARCH_RESULTS']]:
+                    if IMAGE_CONFIG['REQUIRE_POSTER'] and not show.get('poster_path'):
+                        continue
+                        
+                    tv_shows.append(ContentRecord.from_tmdb(show, 'tv'))
+        
+        except Exception as e:
+            print(f"Error in global TV search: {e}")
         
         return tv_shows
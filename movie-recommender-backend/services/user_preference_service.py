@@ -7,23 +7,28 @@ from models.user_models import UserPreference, UserProfile, ContentInteraction
 
 class UserPreferenceService:
     def __init__(self):
+        self.data_dir = self.resolve_data_dir()
+        self.preferences_file = "user_preferences.json"
+        self.profiles_file = "user_profiles.json"
+        self._ensure_data_directory()
+        
+    @staticmethod
+    def resolve_data_dir() -> str:
+        """Pick a writable data directory, shared by the other on-disk stores"""
         # Check if we are in a read-only environment (like Vercel)
-        self.data_dir = "user_data"
+        data_dir = "user_data"
         try:
-            os.makedirs(self.data_dir, exist_ok=True)
+            os.makedirs(data_dir, exist_ok=True)
             # Try writing a test file to verify write permissions
-            test_file = os.path.join(self.data_dir, ".test_write")
+            test_file = os.path.join(data_dir, ".test_write")
             with open(test_file, 'w') as f:
                 f.write("test")
             os.remove(test_file)
         except (OSError, PermissionError):
             # Fallback to /tmp for Vercel/Serverless environments
             print("⚠️ Read-only filesystem detected. Using /tmp for user data.")
-            self.data_dir = "/tmp/user_data"
-            
-        self.preferences_file = "user_preferences.json"
-        self.profiles_file = "user_profiles.json"
-        self._ensure_data_directory()
+            data_dir = "/tmp/user_data"
+        return data_dir
         
     def _ensure_data_directory(self):
         """Create data directory if it doesn't exist"""
@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+
+import httpx
+import pytest
+
+# Keep the suite off the local data dir (no on-disk TMDB cache or catalog mirror) and free of background tasks
+os.environ.setdefault('TMDB_PERSISTENT_CACHE_ENABLED', 'False')
+os.environ.setdefault('PREWARM_ENABLED', 'False')
+os.environ.setdefault('CATALOG_BACKGROUND_REFRESH', 'False')
+os.environ.setdefault('CATALOG_MIRROR_PATH', os.path.join(tempfile.mkdtemp(prefix='catalog-test-'), 'catalog.json.gz'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.http_client import HTTPClientManager  # noqa: E402
+from services.rate_limiter import AdaptiveRateLimiter  # noqa: E402
+from services.tmdb_service import TMDBService  # noqa: E402
+from config.constants import RATE_LIMIT_CONFIG  # noqa: E402
+
+@pytest.fixture
+def mock_upstream():
+    """Route an upstream's pooled client through an httpx.MockTransport handler"""
+    def install(upstream, handler):
+        HTTPClientManager._clients[upstream] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    yield install
+    for upstream in ('tmdb', 'ollama'):
+        HTTPClientManager._clients.pop(upstream, None)
+
+@pytest.fixture(autouse=True)
+def fresh_tmdb_state():
+    """Each test gets an empty response cache and a fresh limiter (its Condition binds to one event loop)"""
+    TMDBService.cache.clear()
+    TMDBService.rate_limiter = AdaptiveRateLimiter(
+        rate=RATE_LIMIT_CONFIG['RATE'],
+        burst=RATE_LIMIT_CONFIG['BURST'],
+        min_concurrency=RATE_LIMIT_CONFIG['MIN_CONCURRENCY'],
+        max_concurrency=RATE_LIMIT_CONFIG['MAX_CONCURRENCY'],
+        initial_concurrency=RATE_LIMIT_CONFIG['INITIAL_CONCURRENCY'],
+        increase_step=RATE_LIMIT_CONFIG['INCREASE_STEP'],
+        decrease_factor=RATE_LIMIT_CONFIG['DECREASE_FACTOR']
+    )
+    yield
+    TMDBService.cache.clear()
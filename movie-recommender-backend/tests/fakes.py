@@ -0,0 +1,66 @@
+"""Canned TMDB and Ollama upstreams for httpx.MockTransport, plus an SSE reader"""
+import json
+
+import httpx
+
+PROVIDERS = {"IN": {"flatrate": [{"provider_id": 8, "provider_name": "Netflix", "logo_path": "/n.jpg"}]}}
+
+def tmdb_results(base_id: int, content_type: str, count: int = 10, language: str = 'en') -> list:
+    results = []
+    for index in range(count):
+        result = {
+            "id": base_id + index, "poster_path": "/p.jpg", "overview": "o", "genre_ids": [35, 28, 18, 10759],
+            "original_language": language, "popularity": 100 - index, "vote_average": 7.0, "vote_count": 100
+        }
+        if content_type == 'movie':
+            result.update(title=f"Movie {base_id + index}", release_date="2026-06-01")
+        else:
+            result.update(name=f"Show {base_id + index}", first_air_date="2026-06-01")
+        results.append(result)
+    return results
+
+def tmdb_handler(requests: list):
+    """TMDB stand-in: every list endpoint returns one page of titles, every title streams on Netflix"""
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        path = request.url.path.removeprefix('/3')
+        language = request.url.params.get('with_original_language', 'en')
+        parts = path.strip('/').split('/')
+        if path.endswith('/watch/providers'):
+            return httpx.Response(200, json={"id": int(parts[1]), "results": PROVIDERS})
+        if path == '/discover/movie' or path == '/search/movie':
+            return httpx.Response(200, json={"page": 1, "total_pages": 1, "results": tmdb_results(1000, 'movie', language=language)})
+        if path in ('/discover/tv', '/search/tv', '/tv/on_the_air', '/tv/airing_today'):
+            # Same ids as the movies on purpose: movie and TV ids are separate namespaces
+            return httpx.Response(200, json={"page": 1, "total_pages": 1, "results": tmdb_results(1000, 'tv', language=language)})
+        if len(parts) == 2:
+            content_id = int(parts[1])
+            return httpx.Response(200, json={
+                "id": content_id, "name": f"Show {content_id}", "title": f"Movie {content_id}",
+                "original_language": "en", "first_air_date": "2026-06-01", "last_air_date": "2026-09-01",
+                "release_date": "2026-06-01", "genres": [{"id": 35}], "watch/providers": {"results": PROVIDERS}
+            })
+        return httpx.Response(404, json={})
+    return handle
+
+def ollama_handler(text: str, chunk_size: int = 4):
+    """Ollama /api/generate stand-in streaming `text` as NDJSON chunks (or one response without stream)"""
+    def handle(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if not body.get("stream"):
+            return httpx.Response(200, json={"response": text, "done": True})
+        lines = [json.dumps({"response": text[index:index + chunk_size], "done": False})
+                 for index in range(0, len(text), chunk_size)]
+        lines.append(json.dumps({"response": "", "done": True}))
+        return httpx.Response(200, content="\n".join(lines) + "\n", headers={"Content-Type": "application/x-ndjson"})
+    return handle
+
+def read_events(response: httpx.Response) -> list:
+    """(event, data) pairs of a server-sent events response"""
+    events, event = [], None
+    for line in response.iter_lines():
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((event, json.loads(line[len("data: "):])))
+    return events
@@ -0,0 +1,75 @@
+from fastapi.testclient import TestClient
+
+from services.ollama_service import ChatStreamParser
+from tests.fakes import ollama_handler, read_events, tmdb_handler
+
+EMOJI_REPLY = '{"search_criteria": {"genre": "Comedy", "language": "english", "content_type": "movie"}, ' \
+              '"response": "Feel-good \\"comedies\\" \\ud83d\\ude00\\nenjoy \\u2014 tonight", ' \
+              '"suggested_titles": ["Movie 1001"]}'
+EMOJI_TEXT = 'Feel-good "comedies" \U0001F600\nenjoy — tonight'
+
+def feed_in_chunks(text: str, size: int):
+    parser = ChatStreamParser()
+    decoded = ''.join(parser.feed(text[index:index + size]) for index in range(0, len(text), size))
+    return parser, decoded
+
+def test_parser_decodes_every_chunking():
+    for size in range(1, 15):
+        parser, decoded = feed_in_chunks(EMOJI_REPLY, size)
+        assert decoded == EMOJI_TEXT, size
+        assert parser.criteria == {"genre": "comedy", "language": "english", "content_type": "movie"}
+
+def test_parser_sets_criteria_before_reply_is_complete():
+    parser = ChatStreamParser()
+    end_of_criteria = EMOJI_REPLY.index('}') + 1
+    parser.feed(EMOJI_REPLY[:end_of_criteria - 1])
+    assert parser.criteria is None
+    parser.feed(EMOJI_REPLY[end_of_criteria - 1:end_of_criteria])
+    assert parser.criteria["genre"] == "comedy"
+
+def test_parser_replaces_lone_surrogates():
+    _, decoded = feed_in_chunks('{"response": "a \\ud83d b \\ude00 c"}', 3)
+    assert decoded == 'a � b � c'
+
+def test_parser_passes_plain_text_through():
+    text = "Sure! Here are a few comedies you might enjoy this weekend."
+    parser, decoded = feed_in_chunks(text, 5)
+    assert parser.raw and decoded == text
+
+def stream_chat(mock_upstream, reply: str, tmdb_requests: list) -> list:
+    from main import app
+
+    mock_upstream('tmdb', tmdb_handler(tmdb_requests))
+    mock_upstream('ollama', ollama_handler(reply))
+    client = TestClient(app)
+    with client.stream("POST", "/ai-chat/stream", json={"message": "something dark in hindi"}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return read_events(response)
+
+def test_ai_chat_stream_relays_tokens_and_switches_fetch(mock_upstream):
+    tmdb_requests = []
+    events = stream_chat(mock_upstream, EMOJI_REPLY, tmdb_requests)
+    names = [name for name, _ in events]
+
+    assert "".join(data["text"] for name, data in events if name == "delta") == EMOJI_TEXT
+    assert names.count("criteria") == 1 and names.index("criteria") < names.index("delta")
+    assert names[-1] == "result" and "error" not in names
+
+    result = events[-1][1]
+    assert result["ai_response"] == EMOJI_TEXT
+    assert result["query_analysis"]["detected_genre"] == "comedy"
+    assert result["recommendations"] and result["total_found"] == len(result["recommendations"])
+
+    # The speculative fetch (rule-based: hindi thriller) was replaced by the model's criteria
+    discover_genres = [request.url.params.get('with_genres') for request in tmdb_requests
+                       if request.url.path.endswith('/discover/movie')]
+    assert '35' in discover_genres
+
+def test_ai_chat_stream_falls_back_without_ollama(mock_upstream):
+    events = stream_chat(mock_upstream, "", [])
+    names = [name for name, _ in events]
+
+    assert names[0] == "delta" and events[0][1]["text"]
+    assert names[-1] == "result"
+    assert events[-1][1]["ai_response"] == events[0][1]["text"]
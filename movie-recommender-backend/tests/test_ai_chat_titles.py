@@ -0,0 +1,30 @@
+import asyncio
+
+import httpx
+
+from routes.ai_chat import find_specific_content
+from services.suggest_service import SuggestService
+from tests.fakes import tmdb_handler
+
+def test_seed_titles_are_looked_up_concurrently_with_the_search(mock_upstream):
+    seed_titles = [f"Seed Only Feature {word}" for word in ("Alpha", "Bravo", "Charlie", "Delta")]
+    for index, title in enumerate(seed_titles):
+        SuggestService.add(400000 + index, title, 'movie')
+
+    requests = []
+    handle = tmdb_handler(requests)
+    started = {}
+
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        started.setdefault(request.url.path, asyncio.get_running_loop().time())
+        await asyncio.sleep(0.1)
+        return handle(request)
+
+    mock_upstream('tmdb', slow_handler)
+    content = asyncio.run(find_specific_content(seed_titles + ["Completely Unknown Picture"], 'movie'))
+
+    details_starts = [started[f"/3/movie/{400000 + index}"] for index in range(len(seed_titles))]
+    search_start = started["/3/search/movie"]
+    # All details lookups and the search began before the first lookup could finish
+    assert max(details_starts + [search_start]) - min(details_starts) < 0.05
+    assert [item['id'] for item in content[:len(seed_titles)]] == [400000 + index for index in range(len(seed_titles))]
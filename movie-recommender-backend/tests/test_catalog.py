@@ -0,0 +1,124 @@
+import asyncio
+import json
+import gzip
+import os
+import time
+
+import pytest
+
+from services import catalog_service
+from services.catalog_index import CatalogIndex
+from services.catalog_ingest import CatalogIngestor
+from services.catalog_service import CatalogService, CATALOG_COLUMNS
+from services.tmdb_service import TMDBService
+from tests.fakes import tmdb_handler
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def build_offline(fetched: list, export_limit: int = 100) -> dict:
+    with open(os.path.join(FIXTURES, 'details.json'), encoding='utf-8') as f:
+        details = json.load(f)
+
+    async def fetch_details(content_type, content_id):
+        fetched.append((content_type, content_id))
+        return details.get(f"{content_type}/{content_id}")
+
+    return asyncio.run(CatalogIngestor.build(
+        languages=['hi', 'en'],
+        export_files={
+            'movie': os.path.join(FIXTURES, 'movie_ids.json'),
+            'tv': os.path.join(FIXTURES, 'tv_series_ids.json')
+        },
+        sweep_pages=0,
+        export_limit=export_limit,
+        fetch_details=fetch_details
+    ))
+
+def ids(results) -> list:
+    return [result['id'] for result in results]
+
+@pytest.fixture
+def mirror():
+    """Save an offline-built catalog as the mirror file"""
+    catalog = build_offline([])
+    CatalogService.save(catalog)
+    yield catalog
+    os.remove(CatalogService.catalog_path())
+    CatalogService._catalog, CatalogService._indexes, CatalogService._loaded_mtime = None, {}, None
+
+def write_mirror_file(catalog: dict, mtime: float):
+    """Rewrite the mirror file the way another process (build_catalog.py) would"""
+    path = CatalogService.catalog_path()
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(catalog, f)
+    os.utime(path, (mtime, mtime))
+
+def test_build_offline_from_export_fixtures(mock_upstream):
+    requests = []
+    mock_upstream('tmdb', tmdb_handler(requests))
+    fetched = []
+    catalog = build_offline(fetched)
+
+    assert requests == []
+    # Adult and video entries are dropped before any lookup
+    assert sorted(fetched) == [('movie', 101), ('movie', 102), ('movie', 103), ('movie', 104), ('movie', 105),
+                               ('movie', 106), ('tv', 201), ('tv', 202), ('tv', 203)]
+    assert catalog['columns'] == list(CATALOG_COLUMNS)
+
+    columns = {name: index for index, name in enumerate(CATALOG_COLUMNS)}
+    movies = {row[columns['id']]: row for row in catalog['movie']}
+    assert sorted(movies) == [101, 102, 103, 105, 106]  # 'fr' is outside the build
+    assert movies[101][columns['genre_ids']] == [35, 18]
+    assert movies[101][columns['ott']] and not movies[102][columns['ott']]
+    shows = {row[columns['id']]: row for row in catalog['tv']}
+    assert sorted(shows) == [201, 202]
+    assert shows[201][columns['last_air_date']] == '2026-09-01'
+
+def test_build_offline_respects_export_limit():
+    fetched = []
+    build_offline(fetched, export_limit=2)
+    assert sorted(fetched) == [('movie', 101), ('movie', 102), ('tv', 201), ('tv', 202)]
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_query_matches_discover_filters(mirror, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(catalog_service, 'numpy_available', lambda: False)
+
+    assert ids(CatalogService.query('movie', 'hi', [35], '2026-01-01', '2026-12-31')) == [101, 102, 106]
+    assert ids(CatalogService.query('movie', 'hi', [35], '2026-01-01', '2026-12-31', ott_only=True)) == [101, 106]
+    assert ids(CatalogService.query('movie', 'hi', [35, 28], '2026-01-01', '2026-12-31', min_votes=100)) == [101, 102]
+    assert ids(CatalogService.query('movie', 'hi', 35, '2026-01-01', '2026-12-31', limit=1)) == [101]
+    assert ids(CatalogService.query('tv', 'hi', [18], '2026-01-01', '2026-12-31')) == [201]
+    assert CatalogService.query('movie', 'ta', [35], '2026-01-01', '2026-12-31') is None
+
+def test_catalog_index_agrees_with_python_fallback(mirror):
+    pytest.importorskip("numpy")
+    for content_type in ('movie', 'tv'):
+        index = CatalogIndex(mirror[content_type], content_type, CATALOG_COLUMNS)
+        for language, genres, min_votes, ott_only in [('hi', [35], 0, False), ('hi', [35, 28], 20, True),
+                                                      ('en', [28], 0, False), ('hi', [18], 0, True)]:
+            expected = CatalogService._query_rows(
+                mirror[content_type], content_type, language, genres, '2020-01-01', '2026-12-31', min_votes, ott_only
+            )
+            assert index.query(language, genres, '2020-01-01', '2026-12-31', min_votes, ott_only) == expected
+
+def test_thin_mirror_answer_is_topped_up_from_live_api(mirror, mock_upstream):
+    requests = []
+    mock_upstream('tmdb', tmdb_handler(requests))
+    movies = asyncio.run(TMDBService.fetch_movies('hi', 'comedy', '2026-01-01', '2026-12-31'))
+
+    assert [movie.id for movie in movies[:2]] == [101, 106]
+    assert len(movies) == 12
+    assert any(request.url.path.endswith('/discover/movie') for request in requests)
+
+def test_rebuilt_mirror_file_is_picked_up(mirror):
+    stale = {**mirror, "built_at": time.time() - 100 * 3600}
+    write_mirror_file(stale, time.time() - 60)
+    assert CatalogService.get_fresh_catalog() is None
+
+    columns = {name: index for index, name in enumerate(CATALOG_COLUMNS)}
+    rebuilt = {**mirror, "built_at": time.time(), "movie": [row for row in mirror['movie'] if row[columns['id']] != 101]}
+    write_mirror_file(rebuilt, time.time())
+    assert ids(CatalogService.query('movie', 'hi', [35], '2026-01-01', '2026-12-31')) == [102, 106]
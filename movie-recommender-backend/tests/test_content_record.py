@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from config.constants import IMAGE_CONFIG
+from models.content_record import ContentRecord
+from utils.responses import dumps
+
+def test_internal_flag_is_readable_but_not_serialized():
+    record = ContentRecord.from_tmdb({"id": 7, "title": "Seven", "release_date": "2026-01-02"}, 'movie',
+                                     ott_prefiltered=True)
+
+    assert record.get('ott_prefiltered') is True
+    record['ott_prefiltered'] = False
+    assert record.ott_prefiltered is False and record._extras is None
+
+    assert 'ott_prefiltered' not in record.keys()
+    assert 'ott_prefiltered' not in dict(record)
+    assert 'ott_prefiltered' not in json.loads(dumps([record]))[0]
+
+def test_poster_write_updates_poster_path_instead_of_extras():
+    record = ContentRecord.from_tmdb({"id": 7, "title": "Seven", "poster_path": "/old.jpg"}, 'movie')
+
+    record['poster'] = f"{IMAGE_CONFIG['TMDB_BASE_URL']}/new.jpg"
+    assert record.poster_path == "/new.jpg" and record._extras is None
+    assert record.keys().count('poster') == 1
+    assert json.loads(dumps([record]))[0]['poster'] == f"{IMAGE_CONFIG['TMDB_BASE_URL']}/new.jpg"
+
+    record['poster'] = None
+    assert record.poster_path is None and record['poster'] is None
+
+    with pytest.raises(ValueError):
+        record['poster'] = "https://example.com/elsewhere.jpg"
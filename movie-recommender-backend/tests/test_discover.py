@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from tests.fakes import tmdb_handler, tmdb_results
+
+DISCOVER_REQUEST = {"prompt": "comedy", "genre": "comedy", "language": "english", "content_type": "both",
+                    "release_period": "2years"}
+
+def test_cold_discover_returns_platform_badges(mock_upstream):
+    from main import app
+
+    requests = []
+    mock_upstream('tmdb', tmdb_handler(requests))
+    content = TestClient(app).post("/discover", json=DISCOVER_REQUEST).json()["content"]
+
+    assert content
+    assert all(item["streaming"]["available_on"] for item in content)
+    assert all("ott_prefiltered" not in item for item in content)
+
+def test_met_movie_quota_stops_other_languages_paging(mock_upstream):
+    from routes.discovery import get_content_with_date_filtering
+
+    requests = []
+    canned = tmdb_handler(requests)
+
+    def handler(request):
+        response = canned(request)
+        if request.url.path.endswith('/discover/movie'):
+            # Distinct titles per language and plenty of pages left, so only the shared quota can stop the paging
+            language = request.url.params['with_original_language']
+            results = tmdb_results(1000 if language == 'en' else 2000, 'movie', language=language)
+            return httpx.Response(200, json={"page": 1, "total_pages": 5, "results": results})
+        return response
+
+    mock_upstream('tmdb', handler)
+    content = asyncio.run(get_content_with_date_filtering(['en', 'hi'], 'movie', 'comedy', '2years', limit=5))
+
+    assert len(content) >= 5
+    discover = [request.url.params for request in requests if request.url.path.endswith('/discover/movie')]
+    assert {params['with_original_language'] for params in discover} == {'en', 'hi'}
+    assert all(params['page'] == '1' for params in discover)
+    assert all(params['sort_by'] != 'release_date.desc' for params in discover)
@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+
+from tests.fakes import read_events, tmdb_handler
+
+def test_discover_stream_order_is_unambiguous_for_both(mock_upstream):
+    from main import app
+
+    mock_upstream('tmdb', tmdb_handler([]))
+    client = TestClient(app)
+    request = {"prompt": "comedy", "genre": "comedy", "language": "english", "content_type": "both",
+               "release_period": "2years"}
+    with client.stream("POST", "/discover/stream", json=request) as response:
+        events = read_events(response)
+
+    items = [data for name, data in events if name == "item"]
+    summary = events[-1]
+    assert summary[0] == "summary"
+
+    order = [tuple(pair) for pair in summary[1]["order"]]
+    assert {content_type for content_type, _ in order} == {"movie", "tv"}
+    # Movie and TV share ids here; the pairs still identify each item exactly once
+    assert len(set(order)) == len(order)
+    assert set(order) <= {(item["content_type"], item["id"]) for item in items}
+    assert len({content_id for _, content_id in order}) < len(order)
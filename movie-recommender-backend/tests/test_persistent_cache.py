@@ -0,0 +1,79 @@
+import sqlite3
+import time
+
+from services.cache_service import CacheEntry
+from services.persistent_cache import PersistentCache
+
+def make_entry(value, ttl: float = 60) -> CacheEntry:
+    now = time.time()
+    return CacheEntry(value, now + ttl, now + 2 * ttl, now + 3 * ttl, '/movie/1')
+
+def rows(path: str) -> dict:
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT key, last_access FROM tmdb_cache").fetchall())
+    finally:
+        conn.close()
+
+def test_writes_are_queued_and_flushed_in_the_background(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentCache(path, max_entries=100, flush_interval=60)
+    try:
+        cache.put('a', make_entry({"id": 1}))
+        assert rows(path) == {}
+        # Queued entries are already readable
+        assert cache.get('a').value == {"id": 1}
+
+        cache.flush()
+        assert set(rows(path)) == {'a'}
+    finally:
+        cache.close()
+
+def test_reads_do_not_commit_and_access_times_are_batched(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentCache(path, max_entries=100, flush_interval=60)
+    try:
+        cache.put('a', make_entry({"id": 1}))
+        cache.flush()
+        written_at = rows(path)['a']
+
+        time.sleep(0.01)
+        changes = cache._conn.total_changes
+        assert cache.get('a').value == {"id": 1}
+        assert cache._conn.total_changes == changes
+        assert rows(path)['a'] == written_at
+
+        cache.flush()
+        assert rows(path)['a'] > written_at
+    finally:
+        cache.close()
+
+def test_batch_size_wakes_the_writer_and_close_flushes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentCache(path, max_entries=100, flush_interval=60, batch_size=5)
+    cache.put_many([(f"k{index}", make_entry(index)) for index in range(5)])
+    for _ in range(100):
+        if len(rows(path)) == 5:
+            break
+        time.sleep(0.01)
+    assert len(rows(path)) == 5
+
+    cache.put('late', make_entry('late'))
+    cache.close()
+    assert 'late' in rows(path)
+
+def test_expired_rows_are_evicted_through_the_keep_until_index(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentCache(path, max_entries=100, evict_every=1, flush_interval=60)
+    try:
+        cache.put('old', make_entry('old', ttl=-10))
+        cache.put('new', make_entry('new'))
+        cache.flush()
+        assert set(rows(path)) == {'new'}
+
+        plan = cache._conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM tmdb_cache WHERE keep_until < ?", (time.time(),)
+        ).fetchall()
+        assert any('idx_tmdb_cache_keep_until' in str(step) for step in plan)
+    finally:
+        cache.close()
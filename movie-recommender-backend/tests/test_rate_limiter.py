@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.tmdb_service import TMDBService
+from config.constants import RATE_LIMIT_CONFIG
+
+async def start_and_cancel(started: list, first_id: int, count: int):
+    """Start `count` get_json calls, wait until all reached the transport, then cancel them"""
+    tasks = [asyncio.create_task(TMDBService.get_json(f"/movie/{first_id + index}")) for index in range(count)]
+    for _ in range(200):
+        if len(started) >= count:
+            break
+        await asyncio.sleep(0.01)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+def test_cancelled_requests_keep_concurrency_limit(mock_upstream):
+    started = []
+
+    async def handler(request):
+        started.append(request.url.path)
+        await asyncio.sleep(60)
+
+    mock_upstream('tmdb', handler)
+    limiter = TMDBService.rate_limiter
+
+    async def scenario():
+        await start_and_cancel(started, 0, 10)
+        assert limiter.concurrency_limit == RATE_LIMIT_CONFIG['INITIAL_CONCURRENCY']
+        assert limiter.stats()["in_flight"] == 0
+
+        # The next round is not throttled down to MIN_CONCURRENCY
+        started.clear()
+        await start_and_cancel(started, 100, 10)
+        assert len(started) == 10
+
+    asyncio.run(scenario())
+
+def test_errors_still_shrink_concurrency():
+    limiter = TMDBService.rate_limiter
+
+    async def scenario():
+        await limiter.acquire()
+        await limiter.release("error")
+
+    asyncio.run(scenario())
+    assert limiter.concurrency_limit == max(
+        RATE_LIMIT_CONFIG['MIN_CONCURRENCY'],
+        RATE_LIMIT_CONFIG['INITIAL_CONCURRENCY'] * RATE_LIMIT_CONFIG['DECREASE_FACTOR']
+    )
+
+def test_attempt_timeout_is_bounded_by_request_deadline(mock_upstream, monkeypatch):
+    monkeypatch.setitem(RATE_LIMIT_CONFIG, 'REQUEST_DEADLINE', 0.3)
+    monkeypatch.setitem(RATE_LIMIT_CONFIG, 'MIN_ATTEMPT_TIME', 0.1)
+    monkeypatch.setitem(RATE_LIMIT_CONFIG, 'MAX_RETRIES', 10)
+    timeouts = []
+
+    async def handler(request):
+        # Behave like an upstream that never answers: the attempt lasts exactly its read timeout
+        timeouts.append(request.extensions["timeout"]["read"])
+        await asyncio.sleep(min(timeouts[-1], 1.0))
+        raise httpx.ReadTimeout("read timed out", request=request)
+
+    mock_upstream('tmdb', handler)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(httpx.ReadTimeout):
+            await TMDBService.get_json("/movie/1")
+        return loop.time() - started
+
+    elapsed = asyncio.run(scenario())
+    assert timeouts and all(timeout <= 0.3 for timeout in timeouts)
+    # The first attempt used up the deadline, so no retry was started
+    assert len(timeouts) == 1
+    assert elapsed < 0.6
@@ -0,0 +1,31 @@
+import random
+
+from services.suggest_service import SortedKeyList, SuggestService
+
+def test_sorted_key_list_matches_sorted():
+    rng = random.Random(7)
+    keys = SortedKeyList(chunk_size=4)
+    expected = []
+    for batch_size in [1, 3, 40, 2, 200, 5, 1, 30]:
+        batch = [(''.join(rng.choices('abcde', k=3)), rng.choice(('movie', 'tv')), rng.randint(1, 50))
+                 for _ in range(batch_size)]
+        keys.update(batch)
+        expected.extend(batch)
+
+    expected.sort()
+    assert len(keys) == len(expected)
+    assert list(keys.iter_from(('',))) == expected
+    assert all(len(chunk) <= 8 for chunk in keys._chunks)
+    for prefix in ('a', 'bc', 'cde', 'e', 'z'):
+        assert list(keys.iter_from((prefix,))) == [key for key in expected if key >= (prefix,)]
+
+def test_suggest_after_incremental_adds():
+    SuggestService.add_results([{"id": 9001, "title": "Dilwale Dulhania Le Jayenge", "popularity": 50}], 'movie')
+    SuggestService.add_payload('/discover/tv', {"results": [
+        {"id": 9002 + index, "name": f"Dulhan Series {index}", "popularity": index} for index in range(20)
+    ]})
+
+    titles = [item['title'] for item in SuggestService.suggest('dulha', limit=3)]
+    # Matches at the start of a title rank first, then by popularity
+    assert titles == ["Dulhan Series 19", "Dulhan Series 18", "Dulhan Series 17"]
+    assert SuggestService.suggest('dilwale')[0]['id'] == 9001
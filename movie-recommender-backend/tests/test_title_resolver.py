@@ -0,0 +1,37 @@
+import asyncio
+
+from services.suggest_service import SuggestService
+from services.title_resolver import TitleResolver
+from config.constants import RESOLVER_CONFIG
+
+def add_titles(first_id: int, count: int):
+    SuggestService.add_results(
+        [{"id": first_id + index, "title": f"Catalog Title {first_id + index}"} for index in range(count)], 'movie'
+    )
+
+def test_lookup_indexes_at_most_one_chunk():
+    TitleResolver._catch_up()
+    add_titles(200000, RESOLVER_CONFIG['CATCH_UP_CHUNK'] * 3)
+    pending = TitleResolver.pending()
+
+    TitleResolver.resolve("Catalog Title 200001")
+    assert TitleResolver.pending() == pending - RESOLVER_CONFIG['CATCH_UP_CHUNK']
+
+def test_background_catch_up_indexes_bulk_loads():
+    SuggestService.add_results([{"id": 300000, "title": "Zindagi Na Milegi Dobara", "release_date": "2011-07-15"}], 'movie')
+    add_titles(300001, RESOLVER_CONFIG['CATCH_UP_CHUNK'] * 3)
+
+    async def scenario():
+        TitleResolver.start()
+        try:
+            for _ in range(100):
+                if not TitleResolver.pending():
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await TitleResolver.stop()
+
+    asyncio.run(scenario())
+    assert TitleResolver.pending() == 0
+    entry, similarity = TitleResolver.resolve("Zindagi Naa Milegi Dobaara")
+    assert entry.id == 300000 and similarity >= RESOLVER_CONFIG['THRESHOLD']
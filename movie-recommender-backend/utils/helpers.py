@@ -1,3 +1,5 @@
+import asyncio
+from typing import Awaitable, Callable, List
 from config.constants import MOVIE_GENRE_MAP, CONTENT_TYPE_KEYWORDS, DEFAULTS
 
 def extract_filters_from_prompt(prompt: str):
@@ -43,3 +45,16 @@ def extract_filters_from_prompt(prompt: str):
         print("Detected: BOTH (default - no specific keywords)")
     
     return detected_genre, detected_language, detected_content_type
+
+async def gather_bounded(factories: List[Callable[[], Awaitable]], limit: int) -> list:
+    """Run coroutine factories with at most `limit` in flight.
+
+    Results come back in the same order as `factories`; exceptions are returned
+    in place (like asyncio.gather with return_exceptions=True)."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(factory):
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(run(factory) for factory in factories), return_exceptions=True)
@@ -0,0 +1,42 @@
+import json
+from datetime import date, datetime
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json is used without it
+    orjson = None
+
+def _default(obj: Any):
+    """Encode the types our payloads contain that JSON does not know about"""
+    if hasattr(obj, "to_dict"):  # ContentRecord
+        return obj.to_dict()
+    if hasattr(obj, "model_dump"):  # pydantic models
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes with orjson when available.
+
+    Routes return it directly with plain dicts/lists/ContentRecords, which
+    skips FastAPI's jsonable_encoder pass over the whole payload."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+# Keep proxies (nginx, Vercel) from buffering event streams
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def sse_event(event: str, data: Any) -> bytes:
+    """One server-sent event with a JSON payload"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + dumps(data) + b"\n\n"